@@ -1,34 +1,200 @@
+import argparse
 import os
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-import pandas as pd
+from src.utils.profiler import RunProfiler
 
-from src.pipelines.create_output import create_output
-from src.pipelines.run_optimization import run_optimization
-from src.pipelines.run_postprocess import run_postprocess
-from src.pipelines.run_preprocess import run_preprocess
+# pandas・PuLP・pydantic・plotly などの重いモジュールは、使うステージの中で読み込む
+# (読み込み時間は各ステージの計測に含まれ、--help や可視化を省いた実行では読まない)
+if TYPE_CHECKING:
+    from src.schemas.data_schema import SolveProgress, SolverOptions
 
 
-def main() -> None:
+def print_progress(progress: "SolveProgress") -> None:
+    """求解中の最良解・下界・ギャップを1行で表示する"""
+    objective = "-" if progress.objective_value is None else progress.objective_value
+    bound = "-" if progress.best_bound is None else progress.best_bound
+    gap = "-" if progress.gap is None else f"{progress.gap:.4%}"
+    print(
+        f"[{progress.elapsed_seconds:7.1f}s] 最良解 {objective} / 下界 {bound} "
+        f"/ ギャップ {gap}"
+    )
+
+
+def main(
+    profile_stage: str | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    options: "SolverOptions | None" = None,
+    method: str = "monolithic",
+    group_units: bool = False,
+    fix_forced: bool = False,
+    shortfall_penalty: float | None = None,
+    builder: str = "pulp",
+    stop_gap: float | None = None,
+    stall_seconds: float | None = None,
+    dashboard: bool = True,
+) -> None:
     today = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
     output_dir = f"output/{today}"
     os.makedirs(output_dir, exist_ok=True)
+    # 各ステージの計測結果は run_report.json に出力する
+    profiler = RunProfiler(output_dir, profile_stage=profile_stage)
+
+    try:
+        # データの読み込み (求解する期間の行・必要な列だけをチャンクごとに読む)
+        with profiler.stage("load_csv"):
+            from src.logic.ingest import load_generator_parameters, load_timeseries
+
+            timeseries_df = load_timeseries("data/demand_sample.csv", start, end)
+            generator_parameters_df = load_generator_parameters(
+                "data/generator_parameters_sample.csv"
+            )
+        # 前処理
+        with profiler.stage("preprocess"):
+            from src.pipelines.run_preprocess import run_preprocess_arrays
+
+            input_data = run_preprocess_arrays(timeseries_df, generator_parameters_df)
 
-    # データの読み込み
-    timeseries_df = pd.read_csv("data/demand_sample.csv")
-    generator_parameters_df = pd.read_csv("data/generator_parameters_sample.csv")
-    # 前処理
-    input_data = run_preprocess(timeseries_df, generator_parameters_df)
+        # 最適化の実行 (同じ入力の最適解があれば再利用する)
+        with profiler.stage("optimization"):
+            from src.logic.solve_cache import SolveCache
+            from src.models.progress import (
+                StopPredicate,
+                any_of,
+                gap_below,
+                stalled_for,
+            )
+            from src.pipelines.run_optimization import run_optimization
 
-    # 最適化の実行
-    model_output = run_optimization(input_data, output_dir)
+            # 打ち切り条件を指定した場合は、求解中の経過を表示しながら解く
+            predicates: list[StopPredicate] = []
+            if stop_gap is not None:
+                predicates.append(gap_below(stop_gap))
+            if stall_seconds is not None:
+                predicates.append(stalled_for(stall_seconds))
+            stop_when = any_of(*predicates) if predicates else None
+            model_output = run_optimization(
+                input_data,
+                output_dir,
+                builder=builder,
+                method=method,
+                group_units=group_units,
+                fix_forced=fix_forced,
+                shortfall_penalty=shortfall_penalty,
+                on_progress=print_progress if stop_when is not None else None,
+                stop_when=stop_when,
+                options=options,
+                cache=SolveCache("output/cache"),
+                profiler=profiler,
+            )
 
-    # 後処理
-    overall_output = run_postprocess(model_output, input_data)
+        # 後処理
+        with profiler.stage("postprocess"):
+            from src.pipelines.run_postprocess import run_postprocess_arrays
 
-    # 結果の出力
-    create_output(overall_output, output_dir)
+            overall_output = run_postprocess_arrays(model_output, input_data)
+
+        # 結果の出力 (dashboard が False の場合は可視化を省き、plotly を読み込まない)
+        with profiler.stage("output"):
+            from src.pipelines.create_output import create_output
+
+            create_output(
+                overall_output,
+                output_dir,
+                dashboard_mode="auto" if dashboard else "none",
+                profiler=profiler,
+            )
+    finally:
+        profiler.write_report()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Solve the sample unit commitment.")
+    parser.add_argument(
+        "--profile-stage",
+        type=str,
+        default=None,
+        help="Dump cProfile stats for one stage (e.g. optimization/build_model)",
+    )
+    parser.add_argument(
+        "--start", type=str, default=None, help="First date to solve (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--end", type=str, default=None, help="Last date to solve (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default="cbc",
+        help="Solver backend (cbc, highs or a PuLP solver name)",
+    )
+    parser.add_argument(
+        "--time-limit", type=float, default=None, help="Solver time limit in seconds"
+    )
+    parser.add_argument(
+        "--mip-gap", type=float, default=None, help="Relative MIP gap to stop at"
+    )
+    parser.add_argument(
+        "--method",
+        type=str,
+        default="monolithic",
+        help="Solution method (monolithic, lagrangian or heuristic)",
+    )
+    parser.add_argument(
+        "--group-units",
+        action="store_true",
+        help="Model identical units as integer counts of each group",
+    )
+    parser.add_argument(
+        "--fix-forced",
+        action="store_true",
+        help="Fix commitments forced by demand, ramp and min up/down times",
+    )
+    parser.add_argument(
+        "--shortfall-penalty",
+        type=float,
+        default=None,
+        help="Allow unmet demand at this cost per MW and report the short periods",
+    )
+    parser.add_argument(
+        "--builder", type=str, default="pulp", help="Model builder (pulp/matrix)"
+    )
+    parser.add_argument(
+        "--stop-gap",
+        type=float,
+        default=None,
+        help="Stop once the incumbent is within this relative gap (matrix + cbc)",
+    )
+    parser.add_argument(
+        "--stall-seconds",
+        type=float,
+        default=None,
+        help="Stop when the incumbent has not improved for this long (matrix + cbc)",
+    )
+    parser.add_argument(
+        "--no-dashboard",
+        action="store_true",
+        help="Skip the HTML dashboard (and the plotly import); write data files only",
+    )
+    args = parser.parse_args()
+
+    from src.schemas.data_schema import SolverOptions
+
+    main(
+        profile_stage=args.profile_stage,
+        start=args.start,
+        end=args.end,
+        options=SolverOptions(
+            backend=args.backend, time_limit=args.time_limit, mip_gap=args.mip_gap
+        ),
+        method=args.method,
+        group_units=args.group_units,
+        fix_forced=args.fix_forced,
+        shortfall_penalty=args.shortfall_penalty,
+        builder=args.builder,
+        stop_gap=args.stop_gap,
+        stall_seconds=args.stall_seconds,
+        dashboard=not args.no_dashboard,
+    )
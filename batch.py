@@ -0,0 +1,90 @@
+import argparse
+import os
+from datetime import datetime
+
+from src.logic.ingest import load_generator_parameters, load_timeseries
+from src.logic.scenario import demand_scenarios, load_scenarios
+from src.pipelines.create_output import create_output
+from src.pipelines.run_batch import run_batch
+from src.pipelines.run_postprocess import run_postprocess_arrays
+from src.pipelines.run_preprocess import run_preprocess_arrays
+from src.pipelines.run_stochastic import run_stochastic
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run what-if scenarios in parallel.")
+    parser.add_argument("manifest", type=str, help="Scenario manifest (JSON)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (progressive hedging subproblems too)",
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        help="CBC threads per worker process (the whole extensive form too)",
+    )
+    parser.add_argument(
+        "--stochastic",
+        type=str,
+        default=None,
+        choices=["extensive", "progressive_hedging"],
+        help="Share one commitment across the demand scenarios "
+        "instead of solving them independently",
+    )
+    args = parser.parse_args()
+
+    today = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+    output_dir = f"output/batch-{today}"
+    os.makedirs(output_dir, exist_ok=True)
+
+    # データの読み込み
+    timeseries_df = load_timeseries("data/demand_sample.csv")
+    generator_parameters_df = load_generator_parameters(
+        "data/generator_parameters_sample.csv"
+    )
+    scenarios = load_scenarios(args.manifest)
+
+    if args.stochastic is not None:
+        # 全シナリオで共通の稼働計画を求め、シナリオごとの結果を集計する
+        # extensive は1つの MILP を CBC のスレッドで、progressive_hedging は
+        # シナリオごとの部分問題をプロセスで並列に解く
+        input_data = run_preprocess_arrays(timeseries_df, generator_parameters_df)
+        try:
+            scenario_demands, probabilities = demand_scenarios(
+                input_data.demands, scenarios
+            )
+            solver, summary = run_stochastic(
+                input_data,
+                scenario_demands,
+                output_dir,
+                probabilities=probabilities,
+                names=[scenario.name for scenario in scenarios],
+                method=args.stochastic,
+                threads=args.threads
+                if args.stochastic == "extensive"
+                else args.workers,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        create_output(run_postprocess_arrays(solver, input_data), output_dir)
+        print(summary.to_string(index=False))
+        print(f"expected cost: {solver.expected_cost:.1f} (gap {solver.gap})")
+        return
+
+    # シナリオの一括実行
+    summary = run_batch(
+        scenarios,
+        timeseries_df,
+        generator_parameters_df,
+        output_dir,
+        max_workers=args.workers,
+        threads_per_worker=args.threads,
+    )
+    print(summary.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import tempfile
+
+from dev.generatoe_input import generate_input_data
+from src.models.aggregated import evaluate_aggregation
+
+
+def main(sizes: list[tuple[int, int]], block_lengths: list[int], builder: str) -> None:
+    print(
+        f"{'units':>6} {'periods':>8} {'block':>6} {'agg[s]':>8} {'full[s]':>8} "
+        f"{'agg cost':>14} {'full cost':>14} {'gap[%]':>8} {'demand[%]':>10} "
+        f"{'mismatch[%]':>12}"
+    )
+    for num_units, num_timeseries in sizes:
+        input_data = generate_input_data(num_units, num_timeseries)
+        for block_length in block_lengths:
+            with tempfile.TemporaryDirectory() as output_dir:
+                report = evaluate_aggregation(
+                    input_data, output_dir, block_length, builder=builder
+                )
+            print(
+                f"{num_units:>6} {num_timeseries:>8} {block_length:>6} "
+                f"{report.aggregated_seconds:>8.2f} {report.full_seconds:>8.2f} "
+                f"{report.aggregated_cost:>14.1f} {report.full_cost:>14.1f} "
+                f"{100 * report.cost_gap:>8.3f} {100 * report.demand_error:>10.3f} "
+                f"{100 * report.operation_mismatch:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare block-aggregated and full-resolution solves."
+    )
+    parser.add_argument(
+        "--units", type=int, nargs="+", default=[3, 10], help="Fleet sizes"
+    )
+    parser.add_argument(
+        "--periods", type=int, nargs="+", default=[365], help="Horizon lengths"
+    )
+    parser.add_argument(
+        "--block-lengths",
+        type=int,
+        nargs="+",
+        default=[2, 4, 7],
+        help="Periods merged into one block",
+    )
+    parser.add_argument(
+        "--builder", type=str, default="matrix", help="Model builder (pulp/matrix)"
+    )
+    args = parser.parse_args()
+
+    main(
+        [(u, t) for u in args.units for t in args.periods],
+        args.block_lengths,
+        args.builder,
+    )
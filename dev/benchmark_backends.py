@@ -0,0 +1,97 @@
+import tempfile
+
+from dev.generatoe_input import generate_input_data
+from src.models.solver import Solver
+from src.schemas.data_schema import SolverOptions
+from src.schemas.input_arrays import as_input_arrays
+
+
+def main(
+    sizes: list[tuple[int, int]],
+    builder: str,
+    backends: list[str],
+    time_limits: list[float | None],
+    mip_gaps: list[float | None],
+) -> None:
+    print(
+        f"{'units':>6} {'periods':>8} {'backend':>8} {'limit[s]':>9} {'mip_gap':>8} "
+        f"{'status':>11} {'solve[s]':>9} {'objective':>14} {'bound':>14} {'gap':>8}"
+    )
+    for num_units, num_timeseries in sizes:
+        input_arrays = as_input_arrays(generate_input_data(num_units, num_timeseries))
+        for backend in backends:
+            for time_limit in time_limits:
+                for mip_gap in mip_gaps:
+                    options = SolverOptions(
+                        backend=backend, time_limit=time_limit, mip_gap=mip_gap
+                    )
+                    solver = Solver(input_arrays, builder=builder, options=options)
+                    solver.build_model()
+                    with tempfile.TemporaryDirectory() as output_dir:
+                        solver.solve(output_dir)
+                    result = solver.solve_result
+                    assert result is not None
+                    print(
+                        f"{num_units:>6} {num_timeseries:>8} {backend:>8} "
+                        f"{format_optional(time_limit, '.1f'):>9} "
+                        f"{format_optional(mip_gap, '.3f'):>8} {result.status:>11} "
+                        f"{result.runtime_seconds:>9.2f} "
+                        f"{format_optional(result.objective_value, '.1f'):>14} "
+                        f"{format_optional(result.best_bound, '.1f'):>14} "
+                        f"{format_optional(result.gap, '.4f'):>8}"
+                    )
+
+
+def format_optional(value: float | None, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def optional_float(text: str) -> float | None:
+    return None if text == "none" else float(text)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare solver backends, time limits and MIP gaps."
+    )
+    parser.add_argument(
+        "--units", type=int, nargs="+", default=[10, 30], help="Fleet sizes"
+    )
+    parser.add_argument(
+        "--periods", type=int, nargs="+", default=[168], help="Horizon lengths"
+    )
+    parser.add_argument(
+        "--builder", type=str, default="matrix", help="Model builder (pulp/matrix)"
+    )
+    parser.add_argument(
+        "--backends",
+        type=str,
+        nargs="+",
+        default=["cbc", "highs"],
+        help="Solver backends",
+    )
+    parser.add_argument(
+        "--time-limits",
+        type=optional_float,
+        nargs="+",
+        default=[None],
+        help="Time limits in seconds ('none' for no limit)",
+    )
+    parser.add_argument(
+        "--mip-gaps",
+        type=optional_float,
+        nargs="+",
+        default=[None],
+        help="Relative MIP gaps ('none' for the solver default)",
+    )
+    args = parser.parse_args()
+
+    main(
+        [(u, t) for u in args.units for t in args.periods],
+        args.builder,
+        args.backends,
+        args.time_limits,
+        args.mip_gaps,
+    )
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.logic.visualize import (
+    visualize_generations_scalable,
+    visualize_generations_standard,
+)
+
+
+def generate_generation_pivot(
+    num_units: int, num_timeseries: int, seed: int = 0
+) -> pd.DataFrame:
+    """1時間刻みの発電量をランダムに作る"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        rng.uniform(0.0, 200.0, (num_timeseries, num_units)),
+        index=pd.date_range("2024-04-01", periods=num_timeseries, freq="h"),
+        columns=[f"G{p + 1}" for p in range(num_units)],
+    )
+
+
+def measure(
+    mode: str, generation_pivot: pd.DataFrame, output_dir: str
+) -> tuple[float, float, int]:
+    """描画にかかった秒数、HTMLの合計サイズ (MB)、ファイル数を返す"""
+    start = time.perf_counter()
+    if mode == "standard":
+        visualize_generations_standard(generation_pivot, output_dir)
+    else:
+        visualize_generations_scalable(generation_pivot, output_dir)
+    seconds = time.perf_counter() - start
+    paths = [
+        os.path.join(output_dir, name)
+        for name in os.listdir(output_dir)
+        if name.endswith(".html")
+    ]
+    return seconds, sum(os.path.getsize(p) for p in paths) / 1e6, len(paths)
+
+
+def main(sizes: list[tuple[int, int]], modes: list[str]) -> None:
+    print(
+        f"{'units':>6} {'periods':>8} {'mode':>9} "
+        f"{'seconds':>8} {'size[MB]':>9} {'files':>6}"
+    )
+    for num_units, num_timeseries in sizes:
+        generation_pivot = generate_generation_pivot(num_units, num_timeseries)
+        for mode in modes:
+            with tempfile.TemporaryDirectory() as output_dir:
+                seconds, size, files = measure(mode, generation_pivot, output_dir)
+            print(
+                f"{num_units:>6} {num_timeseries:>8} {mode:>9} "
+                f"{seconds:>8.2f} {size:>9.1f} {files:>6}"
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare dashboard size and build time per rendering mode."
+    )
+    parser.add_argument(
+        "--units", type=int, nargs="+", default=[10, 100], help="Fleet sizes"
+    )
+    parser.add_argument(
+        "--periods",
+        type=int,
+        nargs="+",
+        default=[8760],
+        help="Horizon lengths (hourly periods)",
+    )
+    parser.add_argument(
+        "--modes",
+        type=str,
+        nargs="+",
+        default=["standard", "scalable"],
+        help="Rendering modes to measure",
+    )
+    args = parser.parse_args()
+
+    main([(u, t) for u in args.units for t in args.periods], args.modes)
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import time
+
+from dev.generatoe_input import generate_instance
+from src.models.cbc import CbcLogSummary, parse_cbc_log
+from src.models.solver import FORMULATIONS, Solver
+from src.pipelines.run_preprocess import run_preprocess_arrays
+from src.schemas.input_arrays import InputArrays
+
+
+def solve(
+    input_arrays: InputArrays, builder: str, formulation: str
+) -> tuple[Solver, CbcLogSummary, float]:
+    with tempfile.TemporaryDirectory() as output_dir:
+        solver = Solver(input_arrays, builder=builder, formulation=formulation)
+        solver.build_model()
+        start = time.perf_counter()
+        solver.solve(output_dir)
+        seconds = time.perf_counter() - start
+        summary = parse_cbc_log(os.path.join(output_dir, "solver.log"))
+    return solver, summary, seconds
+
+
+def main(sizes: list[tuple[int, int]], seeds: list[int], builder: str) -> None:
+    print(
+        f"{'units':>6} {'periods':>8} {'seed':>5} {'formulation':>12} "
+        f"{'rows':>8} {'root gap':>9} {'nodes':>7} {'solve[s]':>9} {'objective':>14}"
+    )
+    for num_units, num_timeseries in sizes:
+        for seed in seeds:
+            input_arrays = run_preprocess_arrays(
+                *generate_instance(num_units, num_timeseries, seed=seed)
+            )
+            for formulation in FORMULATIONS:
+                solver, summary, seconds = solve(input_arrays, builder, formulation)
+                root_gap = summary.root_gap
+                print(
+                    f"{num_units:>6} {num_timeseries:>8} {seed:>5} {formulation:>12} "
+                    f"{solver.model_size()['num_constraints']:>8} "
+                    f"{root_gap if root_gap is not None else float('nan'):>9.2%} "
+                    f"{summary.nodes if summary.nodes is not None else -1:>7} "
+                    f"{seconds:>9.2f} "
+                    f"{solver.objective_value or float('nan'):>14.1f}"
+                )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare the basic and tight formulations on the same instances."
+    )
+    parser.add_argument(
+        "--units", type=int, nargs="+", default=[10, 30], help="Fleet sizes"
+    )
+    parser.add_argument(
+        "--periods", type=int, nargs="+", default=[30, 168], help="Horizon lengths"
+    )
+    parser.add_argument(
+        "--seeds", type=int, nargs="+", default=[1, 2, 3], help="Instance seeds"
+    )
+    parser.add_argument(
+        "--builder", type=str, default="matrix", help="Model builder (pulp/matrix)"
+    )
+    args = parser.parse_args()
+
+    main([(u, t) for u in args.units for t in args.periods], args.seeds, args.builder)
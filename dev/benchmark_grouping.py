@@ -0,0 +1,78 @@
+import tempfile
+
+from dev.generatoe_input import generate_input_data
+from src.models.grouped import evaluate_grouping
+from src.schemas.data_schema import InputData
+
+
+def generate_duplicated_input(
+    num_types: int, copies: int, num_timeseries: int, seed: int = 42
+) -> InputData:
+    """num_types 種類の発電機を copies 台ずつ並べた入力データ (需要も copies 倍)"""
+    base = generate_input_data(num_types, num_timeseries, seed=seed)
+    return InputData(
+        timeseries=[
+            series.model_copy(update={"demand": series.demand * copies})
+            for series in base.timeseries
+        ],
+        generator_parameters=[
+            parameters.model_copy(
+                update={"generator_id": f"{parameters.generator_id}_{k + 1}"}
+            )
+            for parameters in base.generator_parameters
+            for k in range(copies)
+        ],
+    )
+
+
+def main(
+    fleets: list[tuple[int, int]], num_timeseries: int, builder: str, formulation: str
+) -> None:
+    print(
+        f"{'types':>6} {'copies':>7} {'units':>6} {'groups':>7} {'grouped[s]':>11} "
+        f"{'full[s]':>8} {'grouped cost':>14} {'full cost':>14} {'gap[%]':>8} "
+        f"{'bound gap[%]':>13}"
+    )
+    for num_types, copies in fleets:
+        input_data = generate_duplicated_input(num_types, copies, num_timeseries)
+        with tempfile.TemporaryDirectory() as output_dir:
+            report = evaluate_grouping(
+                input_data, output_dir, builder=builder, formulation=formulation
+            )
+        bound_gap = (report.full_cost - report.grouped_objective) / report.full_cost
+        print(
+            f"{num_types:>6} {copies:>7} {report.num_units:>6} "
+            f"{report.num_groups:>7} {report.grouped_seconds:>11.2f} "
+            f"{report.full_seconds:>8.2f} {report.grouped_cost:>14.1f} "
+            f"{report.full_cost:>14.1f} {100 * report.cost_gap:>8.3f} "
+            f"{100 * bound_gap:>13.3f}"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare per-unit and grouped models on duplicated fleets."
+    )
+    parser.add_argument(
+        "--types", type=int, nargs="+", default=[3, 5], help="Distinct unit types"
+    )
+    parser.add_argument(
+        "--copies", type=int, nargs="+", default=[4, 8], help="Copies of each type"
+    )
+    parser.add_argument("--periods", type=int, default=168, help="Horizon length")
+    parser.add_argument(
+        "--builder", type=str, default="matrix", help="Model builder (pulp/matrix)"
+    )
+    parser.add_argument(
+        "--formulation", type=str, default="basic", help="Formulation (basic/tight)"
+    )
+    args = parser.parse_args()
+
+    main(
+        [(n, c) for n in args.types for c in args.copies],
+        args.periods,
+        args.builder,
+        args.formulation,
+    )
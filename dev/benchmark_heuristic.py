@@ -0,0 +1,49 @@
+import tempfile
+
+from dev.generatoe_input import generate_input_data
+from src.models.heuristic import evaluate_heuristic
+
+
+def main(sizes: list[tuple[int, int]], seeds: list[int], builder: str) -> None:
+    print(
+        f"{'units':>6} {'periods':>8} {'seed':>5} {'heur[ms]':>9} {'milp[s]':>8} "
+        f"{'heur cost':>14} {'milp cost':>14} {'gap[%]':>8}"
+    )
+    for num_units, num_timeseries in sizes:
+        for seed in seeds:
+            input_data = generate_input_data(num_units, num_timeseries, seed=seed)
+            with tempfile.TemporaryDirectory() as output_dir:
+                report = evaluate_heuristic(input_data, output_dir, builder=builder)
+            print(
+                f"{num_units:>6} {num_timeseries:>8} {seed:>5} "
+                f"{1000 * report.heuristic_seconds:>9.1f} "
+                f"{report.milp_seconds:>8.2f} {report.heuristic_cost:>14.1f} "
+                f"{report.milp_cost:>14.1f} {100 * report.cost_gap:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare the priority-list heuristic with the MILP."
+    )
+    parser.add_argument(
+        "--units", type=int, nargs="+", default=[10, 30], help="Fleet sizes"
+    )
+    parser.add_argument(
+        "--periods", type=int, nargs="+", default=[168], help="Horizon lengths"
+    )
+    parser.add_argument(
+        "--seeds", type=int, nargs="+", default=[42], help="Instance seeds"
+    )
+    parser.add_argument(
+        "--builder", type=str, default="matrix", help="Model builder (pulp/matrix)"
+    )
+    args = parser.parse_args()
+
+    main(
+        [(u, t) for u in args.units for t in args.periods],
+        args.seeds,
+        args.builder,
+    )
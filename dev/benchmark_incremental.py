@@ -0,0 +1,97 @@
+import tempfile
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+from dev.generatoe_input import generate_input_data
+from src.models.solver import Solver
+from src.schemas.input_arrays import InputArrays, as_input_arrays
+
+Update = Callable[[Solver], None]
+
+
+def intraday_updates(input_arrays: InputArrays, seed: int) -> dict[str, Update]:
+    """日中に発生する小さな入力変更 (需要の見直し・運転コストの変更・計画外停止)"""
+    rng = np.random.default_rng(seed)
+    num_timeseries = input_arrays.num_timeseries
+    periods = np.sort(rng.choice(num_timeseries, size=3, replace=False)).tolist()
+    demands = (input_arrays.demands[periods] * 1.05).tolist()
+    cheapest = input_arrays.generator_ids[
+        int(np.argmin(input_arrays.cost_runs, axis=0))
+    ]
+    cost_run = float(np.max(input_arrays.cost_runs, axis=0)) + 1.0
+    outage = list(range(num_timeseries // 3, num_timeseries // 3 + 3))
+
+    def revise_demand(solver: Solver) -> None:
+        solver.update_demands(periods, demands)
+
+    def update_cost(solver: Solver) -> None:
+        solver.update_costs(cheapest, cost_run=cost_run)
+
+    def force_outage(solver: Solver) -> None:
+        solver.fix_operation(cheapest, outage, 0)
+
+    return {"demand": revise_demand, "cost": update_cost, "outage": force_outage}
+
+
+def main(sizes: list[tuple[int, int]], builder: str, seed: int) -> None:
+    print(
+        f"{'units':>6} {'periods':>8} {'update':>7} {'build[s]':>9} {'patch[s]':>9} "
+        f"{'solve[s]':>9} {'resolve[s]':>11} {'rebuild cost':>14} {'resolve cost':>14}"
+    )
+    for num_units, num_timeseries in sizes:
+        input_arrays = as_input_arrays(generate_input_data(num_units, num_timeseries))
+        for name, update in intraday_updates(input_arrays, seed).items():
+            with tempfile.TemporaryDirectory() as output_dir:
+                # 新しい Solver を作り直して解く
+                start = time.perf_counter()
+                rebuilt = Solver(input_arrays, builder=builder)
+                rebuilt.build_model()
+                update(rebuilt)
+                build_seconds = time.perf_counter() - start
+                start = time.perf_counter()
+                rebuilt.solve(output_dir)
+                solve_seconds = time.perf_counter() - start
+
+                # 変更前のモデルを解いておき、部分更新して解き直す
+                incremental = Solver(input_arrays, builder=builder)
+                incremental.build_model()
+                incremental.solve(output_dir)
+                start = time.perf_counter()
+                update(incremental)
+                patch_seconds = time.perf_counter() - start
+                start = time.perf_counter()
+                incremental.resolve(output_dir)
+                resolve_seconds = time.perf_counter() - start
+            print(
+                f"{num_units:>6} {num_timeseries:>8} {name:>7} {build_seconds:>9.3f} "
+                f"{patch_seconds:>9.3f} {solve_seconds:>9.2f} {resolve_seconds:>11.2f} "
+                f"{rebuilt.objective_value or float('nan'):>14.1f} "
+                f"{incremental.objective_value or float('nan'):>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare rebuilding the model with in-place updates."
+    )
+    parser.add_argument(
+        "--units", type=int, nargs="+", default=[10, 30], help="Fleet sizes"
+    )
+    parser.add_argument(
+        "--periods", type=int, nargs="+", default=[168], help="Horizon lengths"
+    )
+    parser.add_argument(
+        "--builder", type=str, default="pulp", help="Model builder (pulp/matrix)"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the updates")
+    args = parser.parse_args()
+
+    main(
+        [(u, t) for u in args.units for t in args.periods],
+        args.builder,
+        args.seed,
+    )
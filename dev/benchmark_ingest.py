@@ -0,0 +1,82 @@
+import os
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.logic.ingest import load_timeseries
+
+
+def write_demand_csv(path: str, num_regions: int, num_years: int, seed: int) -> int:
+    """地域ごとに複数年分の日次需要を並べた CSV を書き出し、行数を返す"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2000-01-01", periods=365 * num_years, freq="D")
+    date_strings = dates.strftime("%Y-%m-%d")
+    for r in range(num_regions):
+        pd.DataFrame(
+            {
+                "region": f"R{r + 1}",
+                "date": date_strings,
+                "demand": rng.normal(400, 30, len(dates)).round(1),
+                "temperature": rng.normal(15, 8, len(dates)).round(1),
+            }
+        ).to_csv(path, mode="a", header=r == 0, index=False)
+    return num_regions * len(dates)
+
+
+def measure(load: Callable[[], pd.DataFrame]) -> tuple[float, float, int]:
+    """読み込み時間, ピークメモリ(MB), 読み込んだ行数"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    timeseries_df = load()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1024**2, len(timeseries_df)
+
+
+def main(
+    num_regions: int, num_years: int, start: str, end: str, chunksize: int
+) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "demand.csv")
+        num_rows = write_demand_csv(path, num_regions, num_years, seed=42)
+        size_mb = os.path.getsize(path) / 1024**2
+        print(f"{num_rows} rows, {size_mb:.1f} MB")
+
+        def read_all() -> pd.DataFrame:
+            df = pd.read_csv(path)
+            return df[
+                (df["region"] == "R1") & (df["date"] >= start) & (df["date"] <= end)
+            ]
+
+        def read_chunked() -> pd.DataFrame:
+            return load_timeseries(
+                path, start, end, where={"region": "R1"}, chunksize=chunksize
+            )
+
+        print(f"{'method':>10} {'seconds':>9} {'peak[MB]':>9} {'rows':>7}")
+        for name, load in (("read_csv", read_all), ("chunked", read_chunked)):
+            seconds, peak_mb, rows = measure(load)
+            print(f"{name:>10} {seconds:>9.2f} {peak_mb:>9.1f} {rows:>7}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare a full read_csv with the chunked demand loader."
+    )
+    parser.add_argument("--regions", type=int, default=50, help="Number of regions")
+    parser.add_argument("--years", type=int, default=20, help="Years per region")
+    parser.add_argument("--start", type=str, default="2010-04-01", help="First date")
+    parser.add_argument("--end", type=str, default="2011-03-31", help="Last date")
+    parser.add_argument(
+        "--chunksize", type=int, default=100_000, help="Rows read per chunk"
+    )
+    args = parser.parse_args()
+
+    main(args.regions, args.years, args.start, args.end, args.chunksize)
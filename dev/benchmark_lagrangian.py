@@ -0,0 +1,85 @@
+import tempfile
+import time
+
+from dev.generatoe_input import generate_instance
+from src.models.lagrangian import LagrangianSolver
+from src.models.solver import Solver
+from src.pipelines.run_preprocess import run_preprocess_arrays
+from src.schemas.input_arrays import InputArrays
+
+
+def solve(solver: Solver, workers: int | None) -> float:
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        solver.build_model()
+        solver.solve(output_dir, workers)
+        return time.perf_counter() - start
+
+
+def main(
+    sizes: list[tuple[int, int]],
+    seeds: list[int],
+    workers: int | None,
+    skip_monolithic: bool,
+) -> None:
+    print(
+        f"{'units':>6} {'periods':>8} {'seed':>5} {'method':>11} {'seconds':>9} "
+        f"{'objective':>14} {'lower bound':>14} {'gap':>7} {'iters':>6}"
+    )
+    for num_units, num_timeseries in sizes:
+        for seed in seeds:
+            input_arrays: InputArrays = run_preprocess_arrays(
+                *generate_instance(num_units, num_timeseries, seed=seed)
+            )
+            lagrangian = LagrangianSolver(input_arrays, formulation="tight")
+            seconds = solve(lagrangian, workers)
+            print(
+                f"{num_units:>6} {num_timeseries:>8} {seed:>5} {'lagrangian':>11} "
+                f"{seconds:>9.2f} {lagrangian.objective_value or float('nan'):>14.1f} "
+                f"{lagrangian.lower_bound:>14.1f} {lagrangian.gap:>7.2%} "
+                f"{lagrangian.iterations:>6}"
+            )
+            if skip_monolithic:
+                continue
+            monolithic = Solver(input_arrays, builder="matrix", formulation="tight")
+            seconds = solve(monolithic, None)
+            print(
+                f"{num_units:>6} {num_timeseries:>8} {seed:>5} {'monolithic':>11} "
+                f"{seconds:>9.2f} {monolithic.objective_value or float('nan'):>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare the Lagrangian decomposition with the monolithic solve."
+    )
+    parser.add_argument(
+        "--units", type=int, nargs="+", default=[20, 50], help="Fleet sizes"
+    )
+    parser.add_argument(
+        "--periods", type=int, nargs="+", default=[30, 168], help="Horizon lengths"
+    )
+    parser.add_argument(
+        "--seeds", type=int, nargs="+", default=[1], help="Instance seeds"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes for the unit subproblems (default: CPU count)",
+    )
+    parser.add_argument(
+        "--skip-monolithic",
+        action="store_true",
+        help="Only run the decomposition (for fleets too large to solve at once)",
+    )
+    args = parser.parse_args()
+
+    main(
+        [(u, t) for u in args.units for t in args.periods],
+        args.seeds,
+        args.workers,
+        args.skip_monolithic,
+    )
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import time
+import tracemalloc
+
+from dev.generatoe_input import generate_input_data
+from src.models.matrix_builder import write_mps
+from src.models.solver import Solver
+from src.schemas.data_schema import InputData
+
+
+def measure(input_data: InputData, builder: str) -> tuple[float, float, float]:
+    """モデル構築時間, MPS書き出し時間, 構築時のピークメモリ(MB)を計測する"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    solver = Solver(input_data, builder=builder)
+    solver.build_model()
+    build_time = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        mps_path = os.path.join(tmp_dir, "model.mps")
+        start = time.perf_counter()
+        if builder == "matrix":
+            write_mps(solver.matrix_model, mps_path)
+        else:
+            solver.model.writeMPS(mps_path, rename=1)
+        write_time = time.perf_counter() - start
+    return build_time, write_time, peak / 1024**2
+
+
+def main(sizes: list[tuple[int, int]]) -> None:
+    print(
+        f"{'units':>6} {'periods':>8} {'builder':>8} "
+        f"{'build[s]':>9} {'mps[s]':>8} {'peak[MB]':>9}"
+    )
+    for num_units, num_timeseries in sizes:
+        input_data = generate_input_data(num_units, num_timeseries)
+        for builder in ("pulp", "matrix"):
+            build_time, write_time, peak = measure(input_data, builder)
+            print(
+                f"{num_units:>6} {num_timeseries:>8} {builder:>8} "
+                f"{build_time:>9.3f} {write_time:>8.3f} {peak:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark PuLP and matrix model builders."
+    )
+    parser.add_argument(
+        "--units", type=int, nargs="+", default=[3, 10, 30], help="Fleet sizes"
+    )
+    parser.add_argument(
+        "--periods",
+        type=int,
+        nargs="+",
+        default=[365, 2190],
+        help="Horizon lengths",
+    )
+    args = parser.parse_args()
+
+    main([(u, t) for u in args.units for t in args.periods])
@@ -0,0 +1,107 @@
+import tempfile
+import time
+
+import numpy as np
+
+from dev.generatoe_input import generate_input_data
+from src.models.solver import Solver
+from src.schemas.data_schema import InputData
+
+
+def generate_peaky_input(
+    num_units: int, num_timeseries: int, peak: float, seed: int = 42
+) -> InputData:
+    """7期ごとに2期、需要が設備容量の peak 倍になる入力データ"""
+    base = generate_input_data(num_units, num_timeseries, seed=seed)
+    capacity = sum(parameters.pmax for parameters in base.generator_parameters)
+    peaks = np.isin(np.arange(num_timeseries) % 7, (2, 3))
+    return base.model_copy(
+        update={
+            "timeseries": [
+                series.model_copy(update={"demand": peak * capacity})
+                if peaks[t]
+                else series
+                for t, series in enumerate(base.timeseries)
+            ]
+        }
+    )
+
+
+def main(
+    sizes: list[tuple[int, int]], peaks: list[float], builder: str, formulation: str
+) -> None:
+    print(
+        f"{'units':>6} {'periods':>8} {'peak':>5} {'on':>6} {'fixed':>7} "
+        f"{'vars':>7} {'vars(pre)':>10} {'rows':>7} {'rows(pre)':>10} "
+        f"{'presolve[ms]':>13} {'solve[s]':>9} {'solve(pre)[s]':>14} {'diff':>10}"
+    )
+    for num_units, num_timeseries in sizes:
+        for peak in peaks:
+            input_data = generate_peaky_input(num_units, num_timeseries, peak)
+            solvers = []
+            seconds = []
+            for fix_forced in (False, True):
+                start = time.perf_counter()
+                solver = Solver(
+                    input_data,
+                    builder=builder,
+                    formulation=formulation,
+                    fix_forced=fix_forced,
+                )
+                solver.build_model()
+                with tempfile.TemporaryDirectory() as output_dir:
+                    solver.solve(output_dir)
+                seconds.append(time.perf_counter() - start)
+                solvers.append(solver)
+            full, presolved = solvers
+            result = presolved.presolve_result
+            assert result is not None
+            summary = result.summary()
+            full_size, presolved_size = full.model_size(), presolved.model_size()
+            print(
+                f"{num_units:>6} {num_timeseries:>8} {peak:>5.2f} "
+                f"{summary['num_forced_on']:>6} "
+                f"{summary['num_fixed_switches']:>7} "
+                f"{full_size['num_variables']:>7} "
+                f"{presolved_size['num_variables']:>10} "
+                f"{full_size['num_constraints']:>7} "
+                f"{presolved_size['num_constraints']:>10} "
+                f"{1000 * result.presolve_seconds:>13.1f} {seconds[0]:>9.2f} "
+                f"{seconds[1]:>14.2f} "
+                f"{presolved.objective_value - full.objective_value:>10.3g}"
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare solves with and without fixing forced commitments."
+    )
+    parser.add_argument(
+        "--units", type=int, nargs="+", default=[10, 20], help="Fleet sizes"
+    )
+    parser.add_argument(
+        "--periods", type=int, nargs="+", default=[48], help="Horizon lengths"
+    )
+    parser.add_argument(
+        "--peaks",
+        type=float,
+        nargs="+",
+        default=[0.9, 0.95, 0.98],
+        help="Peak demand as a fraction of the fleet capacity",
+    )
+    parser.add_argument(
+        "--builder", type=str, default="matrix", help="Model builder (pulp/matrix)"
+    )
+    parser.add_argument(
+        "--formulation", type=str, default="basic", help="Formulation (basic/tight)"
+    )
+    args = parser.parse_args()
+
+    main(
+        [(u, t) for u in args.units for t in args.periods],
+        args.peaks,
+        args.builder,
+        args.formulation,
+    )
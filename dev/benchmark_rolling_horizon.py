@@ -0,0 +1,55 @@
+import tempfile
+
+from dev.generatoe_input import generate_input_data
+from src.models.rolling_horizon import evaluate_rolling_horizon
+
+
+def main(
+    sizes: list[tuple[int, int]], window: int, lookahead: int, builder: str
+) -> None:
+    print(
+        f"{'units':>6} {'periods':>8} {'rolling[s]':>11} {'mono[s]':>9} "
+        f"{'rolling cost':>14} {'mono cost':>14} {'gap[%]':>8}"
+    )
+    for num_units, num_timeseries in sizes:
+        input_data = generate_input_data(num_units, num_timeseries)
+        with tempfile.TemporaryDirectory() as output_dir:
+            report = evaluate_rolling_horizon(
+                input_data, output_dir, window, lookahead, builder=builder
+            )
+        print(
+            f"{num_units:>6} {num_timeseries:>8} {report.rolling_seconds:>11.2f} "
+            f"{report.monolithic_seconds:>9.2f} {report.rolling_cost:>14.1f} "
+            f"{report.monolithic_cost:>14.1f} {100 * report.cost_gap:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare rolling-horizon and monolithic solves."
+    )
+    parser.add_argument(
+        "--units", type=int, nargs="+", default=[3, 10], help="Fleet sizes"
+    )
+    parser.add_argument(
+        "--periods", type=int, nargs="+", default=[720], help="Horizon lengths"
+    )
+    parser.add_argument(
+        "--window", type=int, default=168, help="Committed periods per window"
+    )
+    parser.add_argument(
+        "--lookahead", type=int, default=24, help="Lookahead periods per window"
+    )
+    parser.add_argument(
+        "--builder", type=str, default="matrix", help="Model builder (pulp/matrix)"
+    )
+    args = parser.parse_args()
+
+    main(
+        [(u, t) for u in args.units for t in args.periods],
+        args.window,
+        args.lookahead,
+        args.builder,
+    )
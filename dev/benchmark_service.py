@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from src.logic.ingest import load_generator_parameters, load_timeseries
+from src.pipelines.run_preprocess import run_preprocess_arrays
+from src.pipelines.solve_service import JobQueue, create_server
+from src.schemas.data_schema import SolveJobRequest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sample_request() -> bytes:
+    input_arrays = run_preprocess_arrays(
+        load_timeseries(os.path.join(ROOT_DIR, "data/demand_sample.csv")),
+        load_generator_parameters(
+            os.path.join(ROOT_DIR, "data/generator_parameters_sample.csv")
+        ),
+    )
+    request = SolveJobRequest(input_data=input_arrays.to_input_data())
+    return request.model_dump_json().encode()
+
+
+def run_service(
+    num_jobs: int, workers: int, num_clients: int
+) -> tuple[float, list[float]]:
+    """
+    num_clients 個のクライアントがジョブを順に投入して結果を待ち、
+    全体の時間とジョブごとの応答時間を返す。
+    """
+    body = sample_request()
+    with tempfile.TemporaryDirectory() as output_dir:
+        jobs = JobQueue(output_dir, concurrency=workers)
+        server = create_server(jobs, port=0)
+        address = server.server_address
+        assert isinstance(address, tuple)
+        url = f"http://127.0.0.1:{address[1]}"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        latencies: list[float] = []
+
+        def submit_and_wait(num_client_jobs: int) -> None:
+            for _ in range(num_client_jobs):
+                latencies.append(solve_once())
+
+        def solve_once() -> float:
+            start = time.perf_counter()
+            request = urllib.request.Request(f"{url}/jobs", data=body, method="POST")
+            with urllib.request.urlopen(request) as response:
+                job_id = json.load(response)["job_id"]
+            while True:
+                with urllib.request.urlopen(
+                    f"{url}/jobs/{job_id}/result?wait=60"
+                ) as response:
+                    if response.status != 202:
+                        response.read()
+                        break
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        clients = [
+            threading.Thread(
+                target=submit_and_wait,
+                args=(len(range(k, num_jobs, num_clients)),),
+            )
+            for k in range(num_clients)
+        ]
+        for client in clients:
+            client.start()
+        for client in clients:
+            client.join()
+        total = time.perf_counter() - start
+        server.shutdown()
+        server.server_close()
+        jobs.shutdown()
+    return total, latencies
+
+
+def run_app(num_jobs: int) -> tuple[float, list[float]]:
+    """app.py を毎回新しいプロセスで実行した場合の時間"""
+    latencies: list[float] = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.symlink(os.path.join(ROOT_DIR, "data"), os.path.join(work_dir, "data"))
+        start = time.perf_counter()
+        for _ in range(num_jobs):
+            job_start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, os.path.join(ROOT_DIR, "app.py")],
+                cwd=work_dir,
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+            latencies.append(time.perf_counter() - job_start)
+        total = time.perf_counter() - start
+    return total, latencies
+
+
+def main(num_jobs: int, workers: int, num_clients: int) -> None:
+    print(
+        f"{'mode':>8} {'jobs':>5} {'total[s]':>9} {'jobs/s':>7} "
+        f"{'mean[s]':>8} {'max[s]':>7}"
+    )
+    for mode, (total, latencies) in (
+        ("service", run_service(num_jobs, workers, num_clients)),
+        ("app.py", run_app(num_jobs)),
+    ):
+        print(
+            f"{mode:>8} {num_jobs:>5} {total:>9.2f} {num_jobs / total:>7.2f} "
+            f"{sum(latencies) / len(latencies):>8.2f} {max(latencies):>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare the solve service with repeated app.py runs."
+    )
+    parser.add_argument("--jobs", type=int, default=10, help="Number of jobs")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Concurrent jobs in the service"
+    )
+    parser.add_argument(
+        "--clients", type=int, default=1, help="Clients submitting jobs concurrently"
+    )
+    args = parser.parse_args()
+
+    main(args.jobs, args.workers, args.clients)
@@ -0,0 +1,116 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_command(args: list[str], repeats: int, cwd: str = REPO_ROOT) -> list[float]:
+    """新しいインタプリタで args を repeats 回実行し、それぞれの秒数を返す"""
+    env = {**os.environ, "PYTHONPATH": REPO_ROOT}
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def import_breakdown(module: str, top: int) -> list[tuple[str, float]]:
+    """
+    -X importtime で module を読み込み、module が直接読み込むモジュールを
+    累積の読み込み時間 (ミリ秒) が長い順に top 件返す
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # 名前の字下げが深さを表す (module 自身が 0、直接の依存が 1)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            entries.append((name.strip(), int(cumulative) / 1000))
+    return sorted(entries, key=lambda entry: entry[1], reverse=True)[:top]
+
+
+def print_timings(label: str, seconds: list[float]) -> None:
+    print(
+        f"{label:<40} {1000 * statistics.median(seconds):>11.1f} "
+        f"{1000 * min(seconds):>8.1f}"
+    )
+
+
+def main(modules: list[str], repeats: int, top: int, runs: bool) -> None:
+    print(f"{'target':<40} {'median[ms]':>11} {'min[ms]':>8}")
+    print_timings("python -c pass", time_command(["-c", "pass"], repeats))
+    for module in modules:
+        print_timings(
+            f"import {module}", time_command(["-c", f"import {module}"], repeats)
+        )
+    print_timings("app.py --help", time_command(["app.py", "--help"], repeats))
+    if runs:
+        # 最適解はキャッシュから読むため、求解以外 (起動・読み込み・出力) の時間になる
+        with tempfile.TemporaryDirectory() as work_dir:
+            os.symlink(os.path.join(REPO_ROOT, "data"), os.path.join(work_dir, "data"))
+            app = os.path.join(REPO_ROOT, "app.py")
+            time_command([app, "--no-dashboard"], 1, cwd=work_dir)
+            print_timings(
+                "app.py --no-dashboard (cached)",
+                time_command([app, "--no-dashboard"], repeats, cwd=work_dir),
+            )
+            print_timings("app.py (cached)", time_command([app], repeats, cwd=work_dir))
+    for module in modules:
+        print(f"\nslowest imports under {module}")
+        for name, milliseconds in import_breakdown(module, top):
+            print(f"  {name:<38} {milliseconds:>11.1f}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Measure interpreter startup and import time of the entry points."
+    )
+    parser.add_argument(
+        "--modules",
+        type=str,
+        nargs="+",
+        default=[
+            "app",
+            "src.logic.ingest",
+            "src.pipelines.run_optimization",
+            "src.pipelines.create_output",
+            "src.logic.visualize",
+        ],
+        help="Modules to import in a fresh interpreter",
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=5, help="Fresh interpreters per target"
+    )
+    parser.add_argument(
+        "--top", type=int, default=5, help="Slowest direct imports to list per module"
+    )
+    parser.add_argument(
+        "--runs",
+        action="store_true",
+        help="Also time full app.py runs with and without the dashboard",
+    )
+    args = parser.parse_args()
+
+    main(args.modules, args.repeats, args.top, args.runs)
@@ -0,0 +1,87 @@
+import tempfile
+import time
+
+import numpy as np
+import numpy.typing as npt
+
+from dev.generatoe_input import generate_input_data
+from src.models.stochastic import StochasticSolver
+from src.schemas.input_arrays import as_input_arrays
+
+
+def sample_demand_scenarios(
+    demands: npt.NDArray[np.float64], num_scenarios: int, std: float, seed: int = 0
+) -> npt.NDArray[np.float64]:
+    """各期の需要に平均1・標準偏差 std の正規乱数を掛けた需要シナリオ (S, T)"""
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(1.0, std, (num_scenarios, len(demands)))
+    return demands * np.maximum(noise, 0.0)
+
+
+def main(
+    num_units: int,
+    num_timeseries: int,
+    scenario_counts: list[int],
+    methods: list[str],
+    std: float,
+    workers: int | None,
+) -> None:
+    input_arrays = as_input_arrays(generate_input_data(num_units, num_timeseries))
+    print(
+        f"{'scenarios':>10} {'method':>20} {'seconds':>9} {'expected cost':>14} "
+        f"{'lower bound':>14} {'gap':>7} {'iters':>6} {'vars':>8}"
+    )
+    for num_scenarios in scenario_counts:
+        scenario_demands = sample_demand_scenarios(
+            input_arrays.demands, num_scenarios, std
+        )
+        for method in methods:
+            solver = StochasticSolver(input_arrays, scenario_demands, method=method)
+            start = time.perf_counter()
+            solver.build_model()
+            with tempfile.TemporaryDirectory() as output_dir:
+                solver.solve(output_dir, workers)
+            seconds = time.perf_counter() - start
+            num_variables = solver.model_size().get("num_variables", "-")
+            print(
+                f"{num_scenarios:>10} {method:>20} {seconds:>9.2f} "
+                f"{solver.expected_cost:>14.1f} "
+                f"{solver.lower_bound or float('nan'):>14.1f} "
+                f"{solver.gap or 0.0:>7.2%} {solver.iterations:>6} {num_variables:>8}"
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare the extensive form with progressive hedging."
+    )
+    parser.add_argument("--units", type=int, default=10, help="Fleet size")
+    parser.add_argument("--periods", type=int, default=24, help="Horizon length")
+    parser.add_argument(
+        "--scenarios",
+        type=int,
+        nargs="+",
+        default=[5, 20],
+        help="Numbers of demand scenarios",
+    )
+    parser.add_argument(
+        "--methods",
+        type=str,
+        nargs="+",
+        default=["extensive", "progressive_hedging"],
+        help="Solution methods",
+    )
+    parser.add_argument(
+        "--std", type=float, default=0.05, help="Relative std of the demand noise"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes for progressive hedging (CBC threads for the extensive form)",
+    )
+    args = parser.parse_args()
+
+    main(args.units, args.periods, args.scenarios, args.methods, args.std, args.workers)
@@ -0,0 +1,203 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import pandas as pd
+from pulp import LpStatus, LpStatusNotSolved
+
+from dev.generatoe_input import generate_instance
+from src.logic.warm_start import merit_order_schedule
+from src.models.solver import Solver
+from src.pipelines.create_output import create_output
+from src.pipelines.run_optimization import run_optimization
+from src.pipelines.run_postprocess import run_postprocess_arrays
+from src.pipelines.run_preprocess import run_preprocess_arrays
+from src.utils.profiler import RunProfiler
+
+DEFAULT_UNITS = [3, 10, 30, 100, 300, 500]
+DEFAULT_PERIODS = [30, 168, 720, 2190, 8760]
+RESULT_COLUMNS = [
+    "units",
+    "periods",
+    "seed",
+    "builder",
+    "stage",
+    "wall_seconds",
+    "cpu_seconds",
+    "child_cpu_seconds",
+    "peak_rss_mb",
+    "num_variables",
+    "num_constraints",
+    "num_nonzeros",
+    "status",
+    "objective_value",
+]
+
+
+def run_case(
+    num_units: int,
+    num_periods: int,
+    seed: int,
+    builder: str,
+    max_solve_cells: int,
+) -> list[dict[str, Any]]:
+    """
+    1インスタンス分のパイプラインを実行し、ステージごとの計測結果を返す。
+    units × periods が max_solve_cells を超える場合は CBC を呼ばず、
+    モデル構築だけ行ったうえでメリットオーダーの解で後処理・出力を計測する。
+    """
+    timeseries_df, generator_parameters_df = generate_instance(
+        num_units, num_periods, seed=seed
+    )
+    with tempfile.TemporaryDirectory() as output_dir:
+        profiler = RunProfiler(output_dir)
+        with profiler.stage("preprocess"):
+            input_data = run_preprocess_arrays(timeseries_df, generator_parameters_df)
+        if num_units * num_periods <= max_solve_cells:
+            model_output = run_optimization(
+                input_data, output_dir, builder=builder, profiler=profiler
+            )
+        else:
+            model_output = Solver(input_data, builder=builder)
+            with profiler.stage("build_model"):
+                model_output.build_model()
+            profiler.record("model", model_output.model_size())
+            schedule = merit_order_schedule(input_data)
+            model_output.set_solution(schedule, LpStatusNotSolved, None)
+            profiler.record("solver", {"status": LpStatus[LpStatusNotSolved]})
+        with profiler.stage("postprocess"):
+            result = run_postprocess_arrays(model_output, input_data)
+        with profiler.stage("output"):
+            create_output(result, output_dir)
+
+    model = profiler.sections.get("model", {})
+    solver = profiler.sections.get("solver", {})
+    return [
+        {
+            "units": num_units,
+            "periods": num_periods,
+            "seed": seed,
+            "builder": builder,
+            "stage": stage.name,
+            "wall_seconds": stage.wall_seconds,
+            "cpu_seconds": stage.cpu_seconds,
+            "child_cpu_seconds": stage.child_cpu_seconds,
+            "peak_rss_mb": max(
+                (
+                    rss
+                    for rss in (stage.peak_rss_mb, stage.child_peak_rss_mb)
+                    if rss is not None
+                ),
+                default=float("nan"),
+            ),
+            "num_variables": model.get("num_variables"),
+            "num_constraints": model.get("num_constraints"),
+            "num_nonzeros": model.get("num_nonzeros"),
+            "status": solver.get("status"),
+            "objective_value": solver.get("objective_value"),
+        }
+        for stage in profiler.stages
+    ]
+
+
+def main(
+    units: list[int],
+    periods: list[int],
+    seed: int,
+    builder: str,
+    max_solve_cells: int,
+    output_path: str,
+) -> pd.DataFrame:
+    rows: list[dict[str, Any]] = []
+    for num_units in units:
+        for num_periods in periods:
+            # ピークRSSを他のケースと分けるため、ケースごとに新しいプロセスで実行する
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                try:
+                    case_rows = executor.submit(
+                        run_case, num_units, num_periods, seed, builder, max_solve_cells
+                    ).result()
+                except Exception as e:
+                    # メモリ不足で強制終了した場合なども1行として残す
+                    case_rows = [
+                        {
+                            "units": num_units,
+                            "periods": num_periods,
+                            "seed": seed,
+                            "builder": builder,
+                            "stage": "failed",
+                            "wall_seconds": float("nan"),
+                            "peak_rss_mb": float("nan"),
+                            "status": type(e).__name__,
+                        }
+                    ]
+            for row in case_rows:
+                print(
+                    f"{row['units']:>5} {row['periods']:>6} {row['stage']:>12} "
+                    f"{row['wall_seconds']:>9.3f}s {row['peak_rss_mb']:>8.1f}MB"
+                )
+            rows.extend(case_rows)
+
+    # コミット間の差分で比較できるよう、並び順と桁数を固定して保存する
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS).astype(
+        {"num_variables": "Int64", "num_constraints": "Int64", "num_nonzeros": "Int64"}
+    )
+    results = results.round(
+        {
+            "wall_seconds": 3,
+            "cpu_seconds": 3,
+            "child_cpu_seconds": 3,
+            "peak_rss_mb": 1,
+            "objective_value": 1,
+        }
+    )
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    results.to_csv(output_path, index=False)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Run the pipeline over a grid of seeded synthetic instances."
+    )
+    parser.add_argument(
+        "--units", type=int, nargs="+", default=DEFAULT_UNITS, help="Fleet sizes"
+    )
+    parser.add_argument(
+        "--periods",
+        type=int,
+        nargs="+",
+        default=DEFAULT_PERIODS,
+        help="Horizon lengths (daily periods)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42, help="Random seed for reproducibility"
+    )
+    parser.add_argument(
+        "--builder", type=str, default="matrix", help="Model builder (pulp/matrix)"
+    )
+    parser.add_argument(
+        "--max-solve-cells",
+        type=int,
+        default=2_000,
+        help="Skip the CBC solve when units x periods exceeds this",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="dev/benchmark_results.csv",
+        help="Where to store the results",
+    )
+    args = parser.parse_args()
+
+    main(
+        args.units,
+        args.periods,
+        args.seed,
+        args.builder,
+        args.max_solve_cells,
+        args.output,
+    )
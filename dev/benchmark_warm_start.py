@@ -0,0 +1,80 @@
+import os
+import tempfile
+
+import numpy as np
+import numpy.typing as npt
+
+from dev.generatoe_input import generate_input_data
+from src.logic.warm_start import merit_order_schedule
+from src.models.cbc import CbcLogSummary, parse_cbc_log
+from src.models.solver import Solver
+from src.schemas.data_schema import InputData
+
+
+def solve(
+    input_data: InputData,
+    builder: str,
+    warm_start: dict[str, npt.NDArray[np.float64]] | None,
+) -> tuple[Solver, CbcLogSummary]:
+    with tempfile.TemporaryDirectory() as output_dir:
+        solver = Solver(input_data, builder=builder)
+        solver.build_model()
+        solver.solve(output_dir, warm_start=warm_start)
+        summary = parse_cbc_log(os.path.join(output_dir, "solver.log"))
+    return solver, summary
+
+
+def perturb_demand(input_data: InputData, scale: float, seed: int) -> InputData:
+    """前日の計画を当日に使い回す状況を模して、需要を少しだけ変える"""
+    rng = np.random.default_rng(seed)
+    noise = rng.uniform(1 - scale, 1 + scale, len(input_data.timeseries))
+    timeseries = [
+        data.model_copy(update={"demand": data.demand * factor})
+        for data, factor in zip(input_data.timeseries, noise, strict=True)
+    ]
+    return input_data.model_copy(update={"timeseries": timeseries})
+
+
+def main(sizes: list[tuple[int, int]], builder: str) -> None:
+    print(
+        f"{'units':>6} {'periods':>8} {'start':>10} "
+        f"{'first[s]':>9} {'total[s]':>9} {'objective':>14}"
+    )
+    for num_units, num_timeseries in sizes:
+        yesterday = generate_input_data(num_units, num_timeseries)
+        previous, _ = solve(yesterday, builder, None)
+        today = perturb_demand(yesterday, 0.02, seed=1)
+        cases = {
+            "cold": None,
+            "merit": merit_order_schedule(today),
+            "previous": previous.get_variable_values(),
+        }
+        for name, warm_start in cases.items():
+            solver, summary = solve(today, builder, warm_start)
+            first = summary.first_solution_seconds
+            print(
+                f"{num_units:>6} {num_timeseries:>8} {name:>10} "
+                f"{first if first is not None else float('nan'):>9.2f} "
+                f"{summary.total_seconds or float('nan'):>9.2f} "
+                f"{solver.objective_value or float('nan'):>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare cold and warm-started CBC solves."
+    )
+    parser.add_argument(
+        "--units", type=int, nargs="+", default=[10, 30], help="Fleet sizes"
+    )
+    parser.add_argument(
+        "--periods", type=int, nargs="+", default=[336], help="Horizon lengths"
+    )
+    parser.add_argument(
+        "--builder", type=str, default="matrix", help="Model builder (pulp/matrix)"
+    )
+    args = parser.parse_args()
+
+    main([(u, t) for u in args.units for t in args.periods], args.builder)
@@ -1,10 +1,13 @@
-# dev/generate_sample_data.py
+# dev/generatoe_input.py
 import os
 from datetime import date
 
 import numpy as np
 import pandas as pd
 
+from src.pipelines.run_preprocess import run_preprocess
+from src.schemas.data_schema import InputData
+
 
 def generate_demand_data(
     start_date: date, end_date: date, seed: int = 42
@@ -25,12 +28,17 @@ def generate_demand_data(
 def generate_generator_parameters(num_generators: int, seed: int = 42) -> pd.DataFrame:
     """発電機のパラメータをランダム生成（再現性あり）"""
     rng = np.random.default_rng(seed)
-    ids = [f"G{i+1}" for i in range(num_generators)]
+    ids = [f"G{i + 1}" for i in range(num_generators)]
     pmin = rng.integers(30, 150, num_generators)
     pmax = pmin + rng.integers(100, 250, num_generators)
     cost_run = rng.uniform(3.0, 6.0, num_generators).round(2)
     cost_start = rng.integers(80, 200, num_generators)
     cost_stop = rng.integers(40, 120, num_generators)
+    min_operation_time = rng.integers(1, 8, num_generators)
+    min_down_time = rng.integers(1, 6, num_generators)
+    # 停止中から起動・稼働中から停止できるよう、ランプは最小出力以上にする
+    ramp_up = pmin + rng.integers(20, 120, num_generators)
+    ramp_down = pmin + rng.integers(20, 120, num_generators)
 
     return pd.DataFrame(
         {
@@ -40,10 +48,43 @@ def generate_generator_parameters(num_generators: int, seed: int = 42) -> pd.Dat
             "cost_run": cost_run,
             "cost_start": cost_start,
             "cost_stop": cost_stop,
+            "min_operation_time": min_operation_time,
+            "min_down_time": min_down_time,
+            "ramp_up": ramp_up,
+            "ramp_down": ramp_down,
         }
     )
 
 
+def generate_instance(
+    num_generators: int, num_periods: int, seed: int = 42, load_factor: float = 0.55
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    任意の発電機数・期間数 (日次) の需要と発電機パラメータを生成（再現性あり）。
+    需要は発電機の合計最大出力の load_factor 倍を中心に、年周期の変動とノイズを加える。
+    """
+    rng = np.random.default_rng(seed)
+    gen_df = generate_generator_parameters(num_generators, seed)
+    capacity = float(gen_df["Pmax"].sum())
+
+    dates = pd.date_range(start=date(2024, 4, 1), periods=num_periods, freq="D")
+    seasonal = 0.15 * np.sin(2 * np.pi * np.arange(num_periods) / 365)
+    noise = rng.normal(0, 0.03, num_periods)
+    demand = np.clip(load_factor + seasonal + noise, 0.2, 0.9) * capacity
+
+    demand_df = pd.DataFrame({"date": dates.date, "demand": demand.round(1)})
+    return demand_df, gen_df
+
+
+def generate_input_data(
+    num_generators: int, num_periods: int, seed: int = 42, load_factor: float = 0.55
+) -> InputData:
+    """generate_instance で生成した需要と発電機パラメータを前処理した InputData"""
+    return run_preprocess(
+        *generate_instance(num_generators, num_periods, seed, load_factor)
+    )
+
+
 def main(num_generators: int = 3, output_dir: str = "data", seed: int = 42) -> None:
     """データ生成のメイン関数"""
     os.makedirs(output_dir, exist_ok=True)
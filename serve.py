@@ -0,0 +1,45 @@
+import argparse
+
+from src.pipelines.solve_service import JobQueue, create_server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve solve jobs over HTTP.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8000, help="Bind port")
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="Listen on this Unix socket instead of host:port",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of jobs solved concurrently"
+    )
+    parser.add_argument(
+        "--retain",
+        type=int,
+        default=1000,
+        help="Finished jobs kept (older ones and their results are deleted)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="output/service",
+        help="Where job results and the solve cache are stored",
+    )
+    args = parser.parse_args()
+
+    jobs = JobQueue(args.output_dir, concurrency=args.workers, retain=args.retain)
+    server = create_server(jobs, args.host, args.port, args.socket)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        jobs.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from dataclasses import replace
+
+import numpy as np
+import numpy.typing as npt
+
+from src.logic.warm_start import complete_schedule
+from src.schemas.input_arrays import InputArrays
+
+FloatArray = npt.NDArray[np.float64]
+
+
+def block_heads(num_timeseries: int, block_length: int) -> npt.NDArray[np.int64]:
+    """block_length 期ずつ区切ったブロックの先頭の期 (最後のブロックは短くなりうる)"""
+    if block_length < 1:
+        raise ValueError("block_length は1以上である必要があります")
+    return np.arange(0, num_timeseries, block_length, dtype=np.int64)
+
+
+def aggregate_periods(input_arrays: InputArrays, block_length: int) -> InputArrays:
+    """
+    連続する block_length 期を1期にまとめた入力データを作る。
+    縮約後の1期はブロック内の各期で稼働状態が同じとみなし、出力はブロック内の
+    平均出力を表す。
+    - 日付・日付インデックス: ブロックの先頭の期の値
+    - 需要: ブロック内の平均
+    - 運転コスト: block_length 倍 (平均出力 × 期数 が総出力になるため)
+    - 最低稼働・停止期間: block_length で割って切り上げる
+    - ランプ: 起動・停止できる発電機 (最小出力 ≦ ランプ上限) だけ block_length 倍
+      (平均出力どうしの差は1期あたりの変化の block_length 倍まで許される)
+    起動・停止コストはそのまま。
+    """
+    heads = block_heads(input_arrays.num_timeseries, block_length)
+    counts = np.diff(heads, append=input_arrays.num_timeseries)
+    switchable = (input_arrays.ramp_ups >= input_arrays.pmins) & (
+        input_arrays.ramp_downs >= input_arrays.pmins
+    )
+    return replace(
+        input_arrays,
+        dates=input_arrays.dates[heads],
+        date_indices=input_arrays.date_indices[heads],
+        demands=np.add.reduceat(input_arrays.demands, heads) / counts,
+        cost_runs=input_arrays.cost_runs * block_length,
+        min_operation_times=-(-input_arrays.min_operation_times // block_length),
+        min_down_times=-(-input_arrays.min_down_times // block_length),
+        ramp_ups=np.where(
+            switchable, input_arrays.ramp_ups * block_length, input_arrays.ramp_ups
+        ),
+        ramp_downs=np.where(
+            switchable, input_arrays.ramp_downs * block_length, input_arrays.ramp_downs
+        ),
+        _input_data=None,
+    )
+
+
+def aggregate_schedule(
+    schedule: dict[str, FloatArray], block_length: int
+) -> dict[str, FloatArray]:
+    """
+    全期間の解 (T, P) を aggregate_periods の期に縮約する。
+    ブロック内で1期でも稼働していれば稼働とし、出力はブロック内の平均とする。
+    """
+    num_timeseries = len(schedule["operation"])
+    heads = block_heads(num_timeseries, block_length)
+    counts = np.diff(heads, append=num_timeseries)
+    return complete_schedule(
+        np.maximum.reduceat(np.rint(schedule["operation"]), heads, axis=0),
+        np.add.reduceat(schedule["output"], heads, axis=0) / counts[:, None],
+    )
+
+
+def expand_blocks(
+    values: FloatArray, block_length: int, num_timeseries: int
+) -> FloatArray:
+    """縮約した期の値 (ブロック数, ...) を、ブロック内の各期に複製して全期間に展開する"""
+    return np.repeat(values, block_length, axis=0)[:num_timeseries]
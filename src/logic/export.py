@@ -0,0 +1,149 @@
+import json
+import os
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from pulp import LpStatus
+
+from src.schemas.schedule_result import ScheduleResult
+
+EXPORT_FORMATS = ("auto", "parquet", "csv")
+
+# 縦持ちスケジュールの列と型 (load_schedule で読み戻せる並び)
+SCHEDULE_COLUMNS = {
+    "date": "datetime64[ns]",
+    "generator_id": "string",
+    "start": "int8",
+    "stop": "int8",
+    "operation": "int8",
+    "output": "float64",
+    "cost": "float64",
+}
+
+
+def iter_schedule_chunks(
+    result: ScheduleResult, chunk_periods: int
+) -> Iterator[dict[str, Any]]:
+    """chunk_periods 期ずつ、縦持ちの列を配列で返す"""
+    generator_ids = np.array(result.generator_ids, dtype=object)
+    for head in range(0, result.num_timeseries, chunk_periods):
+        tail = min(head + chunk_periods, result.num_timeseries)
+        num_rows = (tail - head) * result.num_units
+        yield {
+            "date": np.repeat(result.dates[head:tail], result.num_units),
+            "generator_id": np.tile(generator_ids, tail - head),
+            **{
+                name: getattr(result, name)[head:tail]
+                .reshape(num_rows)
+                .astype(SCHEDULE_COLUMNS[name])
+                for name in ("start", "stop", "operation", "output", "cost")
+            },
+        }
+
+
+def resolve_export_format(export_format: str) -> str:
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(
+            f"export_format は {EXPORT_FORMATS} のいずれかを指定してください: "
+            f"{export_format}"
+        )
+    if export_format != "auto":
+        return export_format
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "csv"
+    return "parquet"
+
+
+def write_schedules(
+    result: ScheduleResult,
+    output_dir: str,
+    export_format: str = "auto",
+    chunk_periods: int = 1000,
+) -> str:
+    """
+    スケジュールを 日付 × 発電機 の縦持ち形式でファイルに書き出す。
+    - parquet: pyarrow が必要。chunk_periods 期ごとに1つの row group を書く
+    - csv: chunk_periods 期ごとに追記する
+    auto の場合は pyarrow があれば parquet、なければ csv とする。
+    出力したファイルのパスを返す。
+    """
+    export_format = resolve_export_format(export_format)
+    os.makedirs(output_dir, exist_ok=True)
+    chunks = iter_schedule_chunks(result, chunk_periods)
+
+    if export_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = os.path.join(output_dir, "schedules.parquet")
+        schema = pa.schema(
+            [
+                ("date", pa.timestamp("ns")),
+                ("generator_id", pa.string()),
+                ("start", pa.int8()),
+                ("stop", pa.int8()),
+                ("operation", pa.int8()),
+                ("output", pa.float64()),
+                ("cost", pa.float64()),
+            ]
+        )
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in chunks:
+                writer.write_table(pa.Table.from_pydict(chunk, schema=schema))
+        return path
+
+    path = os.path.join(output_dir, "schedules.csv")
+    pd.DataFrame(columns=list(SCHEDULE_COLUMNS)).to_csv(path, index=False)
+    for chunk in chunks:
+        pd.DataFrame(chunk).to_csv(path, mode="a", header=False, index=False)
+    return path
+
+
+def create_summary(result: ScheduleResult) -> dict[str, Any]:
+    """全体・発電機ごとの集計値とソルバーの状態をまとめる"""
+    dates = pd.DatetimeIndex(result.dates)
+    return {
+        "status": None if result.status is None else LpStatus[result.status],
+        "approximate": result.approximate,
+        "objective_value": result.objective_value,
+        "num_timeseries": result.num_timeseries,
+        "num_units": result.num_units,
+        "start_date": dates[0].isoformat() if len(dates) else None,
+        "end_date": dates[-1].isoformat() if len(dates) else None,
+        "overall_cost": result.overall_cost,
+        "overall_output": result.overall_output,
+        "overall_operation_days": result.overall_operation_days,
+        "overall_start_days": result.overall_start_days,
+        "overall_stop_days": result.overall_stop_days,
+        "generators": [
+            {
+                "generator_id": generator_id,
+                "generator_cost": float(cost),
+                "generator_output": float(output),
+                "generator_operation_days": int(operation_days),
+                "generator_start_days": int(start_days),
+                "generator_stop_days": int(stop_days),
+            }
+            for generator_id, cost, output, operation_days, start_days, stop_days in zip(
+                result.generator_ids,
+                result.generator_costs,
+                result.generator_outputs,
+                result.generator_operation_days,
+                result.generator_start_days,
+                result.generator_stop_days,
+                strict=True,
+            )
+        ],
+    }
+
+
+def write_summary(result: ScheduleResult, output_dir: str) -> str:
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, "summary.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(create_summary(result), f, ensure_ascii=False, indent=2)
+    return path
@@ -0,0 +1,133 @@
+from dataclasses import replace
+
+import numpy as np
+import numpy.typing as npt
+
+from src.logic.presolve import presolve_commitment
+from src.models.matrix_builder import remaining_periods
+from src.schemas.data_schema import FeasibilityIssue, UnitInitialState
+from src.schemas.input_arrays import InputArrays
+
+FloatArray = npt.NDArray[np.float64]
+
+# 浮動小数点の誤差として無視する出力の差 (MW)
+TOLERANCE = 1e-6
+
+
+def check_feasibility(
+    input_arrays: InputArrays,
+    initial_states: list[UnitInitialState] | None = None,
+) -> list[FeasibilityIssue]:
+    """
+    モデルを構築する前に、入力データだけで実行不可能と分かる期・発電機を求める。
+    - 発電機ごと: 初期状態から継続する最低稼働・停止期間と直前期の出力からの
+      ランプ制約で、出力の下限が上限を上回る期 (各発電機の最初の期だけを返す)
+    - 期ごと: 各発電機の出力の上限の合計が需要に届かない期。最大出力の合計に
+      届かなければ capacity、最低停止期間で停止を続ける発電機を除くと届かなければ
+      min_up_down、それ以外は ramp
+    上下限は需要を0とした presolve_commitment で求める。
+    初期状態がなければ全台を最大出力で運転し続ける解が常に実行可能なため、
+    最大出力の合計が需要に届かない期だけが原因になる。
+    必要条件だけを調べるため、ここで見つからなくても実行可能とは限らない。
+    """
+    num_timeseries = input_arrays.num_timeseries
+    demands = input_arrays.demands
+    pmaxs = input_arrays.pmaxs
+    usable = input_arrays.pmaxs >= input_arrays.pmins
+    bounds = presolve_commitment(
+        replace(input_arrays, demands=np.zeros(num_timeseries), _input_data=None),
+        initial_states,
+    )
+    issues: list[FeasibilityIssue] = []
+
+    # 初期状態から最低稼働・停止期間で状態を続ける (期, 発電機)
+    held_on = np.zeros_like(bounds.forced_on)
+    held_off = np.broadcast_to(~usable, bounds.forced_off.shape).copy()
+    if initial_states is not None:
+        for p, state in enumerate(initial_states):
+            for length, operation, held in (
+                (int(input_arrays.min_operation_times[p]), 1, held_on),
+                (int(input_arrays.min_down_times[p]), 0, held_off),
+            ):
+                held[: remaining_periods(state, length, operation), p] = True
+        conflicts = bounds.forced_on & bounds.forced_off
+        gaps = bounds.output_lower > bounds.output_upper + TOLERANCE
+        for p in np.flatnonzero((conflicts | gaps).any(axis=0)).tolist():
+            t = int(np.flatnonzero(conflicts[:, p] | gaps[:, p])[0])
+            generator_id = input_arrays.generator_ids[p]
+            date_index = int(input_arrays.date_indices[t])
+            lower = float(bounds.output_lower[t, p])
+            upper = float(bounds.output_upper[t, p])
+            if conflicts[t, p] and (held_on[t, p] or held_off[t, p]):
+                kind = "min_up_down"
+                message = (
+                    f"発電機 {generator_id} は {date_index} 期に稼働と停止の両方が"
+                    "必要になり、最低稼働・停止期間を満たせません"
+                )
+            else:
+                kind = "ramp"
+                message = (
+                    f"発電機 {generator_id} は {date_index} 期に {lower:.1f} MW 以上の"
+                    f"出力が必要ですが、ランプ制約で {upper:.1f} MW までしか出せません"
+                )
+            issues.append(
+                FeasibilityIssue(
+                    kind=kind,
+                    date_index=date_index,
+                    generator_id=generator_id,
+                    required=lower,
+                    available=upper,
+                    message=message,
+                )
+            )
+
+    capacity = float(pmaxs[usable].sum())
+    not_held = np.where(held_off, 0.0, pmaxs).sum(axis=1)
+    available = np.where(bounds.forced_off, 0.0, bounds.output_upper).sum(axis=1)
+    for t in np.flatnonzero(demands > available + TOLERANCE).tolist():
+        demand = float(demands[t])
+        date_index = int(input_arrays.date_indices[t])
+        if demand > capacity + TOLERANCE:
+            kind, limit, reason = "capacity", capacity, "最大出力の合計"
+        elif demand > not_held[t] + TOLERANCE:
+            kind, limit, reason = (
+                "min_up_down",
+                float(not_held[t]),
+                "最低停止期間で停止を続ける発電機を除いた最大出力の合計",
+            )
+        else:
+            kind, limit, reason = (
+                "ramp",
+                float(available[t]),
+                "ランプ制約で出せる出力の合計",
+            )
+        issues.append(
+            FeasibilityIssue(
+                kind=kind,
+                date_index=date_index,
+                required=demand,
+                available=limit,
+                message=(
+                    f"{date_index} 期の需要 {demand:.1f} MW が"
+                    f"{reason} {limit:.1f} MW を上回っています"
+                ),
+            )
+        )
+    return issues
+
+
+def format_issues(issues: list[FeasibilityIssue], limit: int = 10) -> str:
+    """実行不可能な原因を、先頭 limit 件まで1行ずつ並べたメッセージ"""
+    lines = [f"入力データが実行不可能です ({len(issues)} 件)"]
+    lines += [f"- {issue.message}" for issue in issues[:limit]]
+    if len(issues) > limit:
+        lines.append(f"- ほか {len(issues) - limit} 件")
+    return "\n".join(lines)
+
+
+def demand_shortfall(input_arrays: InputArrays, output: FloatArray) -> FloatArray:
+    """
+    各期の需要の不足量 (T,)。
+    Solver の shortfall_penalty で解いた場合、不足量のスラック変数の値と一致する。
+    """
+    return np.maximum(input_arrays.demands - output.sum(axis=1), 0.0)
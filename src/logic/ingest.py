@@ -0,0 +1,103 @@
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from src.logic.preprocess import GENERATOR_COLUMNS
+
+# 1回に読み込む行数 (ピークメモリはおおよそこの行数分のチャンクと抽出結果で決まる)
+DEFAULT_CHUNKSIZE = 100_000
+
+TIMESERIES_DTYPES = {"date": str, "demand": np.float64}
+GENERATOR_DTYPES = {
+    "generator_id": str,
+    **{column: np.float64 for column in GENERATOR_COLUMNS},
+}
+
+
+def read_csv_chunked(
+    path: str,
+    dtypes: Mapping[str, type],
+    where: Mapping[str, str] | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    sorted_by_date: bool = False,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    """
+    CSV をチャンクごとに読み込み、条件に合う行だけを残して結合する。
+    - dtypes の列だけを、指定した型で読み込む (型推論をしない)
+    - where: 列名 → 値。値が一致する行だけを残す (列は結果に含めない)
+    - start / end: date 列 (YYYY-MM-DD) がこの範囲 (両端を含む) の行だけを残す
+    - sorted_by_date: date 列が昇順の場合、end を過ぎたチャンクで読み込みを打ち切る
+    """
+    where = where or {}
+    columns = {**dtypes, **{column: str for column in where}}
+    chunks = []
+    try:
+        reader = pd.read_csv(
+            path, usecols=list(columns), dtype=columns, chunksize=chunksize
+        )
+        with reader:
+            for chunk in reader:
+                mask = np.ones(len(chunk), dtype=np.bool_)
+                for column, value in where.items():
+                    mask &= (chunk[column] == value).to_numpy()
+                # YYYY-MM-DD の文字列は辞書順と日付順が一致するため、日付に変換せず比較する
+                if start is not None:
+                    mask &= (chunk["date"] >= start).to_numpy()
+                if end is not None:
+                    mask &= (chunk["date"] <= end).to_numpy()
+                chunks.append(chunk.loc[mask, list(dtypes)])
+                if sorted_by_date and end is not None and chunk["date"].iloc[-1] > end:
+                    break
+    except ValueError as e:
+        raise ValueError(f"{path} の読み込みに失敗しました: {e}") from e
+    if not chunks:
+        return pd.DataFrame(
+            {column: pd.Series(dtype=t) for column, t in dtypes.items()}
+        )
+    return pd.concat(chunks, ignore_index=True)
+
+
+def load_timeseries(
+    path: str,
+    start: str | None = None,
+    end: str | None = None,
+    where: Mapping[str, str] | None = None,
+    sorted_by_date: bool = False,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    """
+    需要の CSV から、求解する期間 (start 〜 end) の date・demand 列だけを読み込む。
+    地域などの列で絞り込む場合は where に指定する (例: {"region": "tokyo"})。
+    """
+    timeseries_df = read_csv_chunked(
+        path, TIMESERIES_DTYPES, where, start, end, sorted_by_date, chunksize
+    )
+    if timeseries_df.empty:
+        raise ValueError(f"{path} に条件に合う需要データがありません")
+    return timeseries_df
+
+
+def load_generator_parameters(
+    path: str,
+    generator_ids: list[str] | None = None,
+    where: Mapping[str, str] | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> pd.DataFrame:
+    """
+    発電機パラメータの CSV から、前処理で使う列だけを読み込む。
+    generator_ids を指定した場合は、その発電機だけを残す。
+    """
+    generator_parameters_df = read_csv_chunked(
+        path, GENERATOR_DTYPES, where, chunksize=chunksize
+    )
+    if generator_ids is not None:
+        unknown = set(generator_ids) - set(generator_parameters_df["generator_id"])
+        if unknown:
+            raise ValueError(f"存在しない発電機IDが指定されています: {sorted(unknown)}")
+        generator_parameters_df = generator_parameters_df[
+            generator_parameters_df["generator_id"].isin(generator_ids)
+        ].reset_index(drop=True)
+    return generator_parameters_df
@@ -1,45 +1,144 @@
-from datetime import datetime
-
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
-from src.schemas.data_schema import GeneratorParameters, InputTimeSeriesData
+from src.schemas.data_schema import (
+    NON_NEGATIVE_MESSAGES,
+    GeneratorParameters,
+    InputTimeSeriesData,
+)
+from src.schemas.input_arrays import InputArrays
+
+# CSVの列名 → GeneratorParameters のフィールド名
+GENERATOR_COLUMNS = {
+    "Pmin": "pmin",
+    "Pmax": "pmax",
+    "cost_run": "cost_run",
+    "cost_start": "cost_start",
+    "cost_stop": "cost_stop",
+    "min_operation_time": "min_operation_time",
+    "min_down_time": "min_down_time",
+    "ramp_up": "ramp_up",
+    "ramp_down": "ramp_down",
+}
+INTEGER_FIELDS = ("min_operation_time", "min_down_time")
+
+
+def raise_row_errors(errors: list[tuple[int, str]]) -> None:
+    """行番号 (1始まり) 付きのエラーをまとめて送出する"""
+    if errors:
+        errors.sort()
+        raise ValueError(
+            "\n".join(f"{row + 1}行目: {message}" for row, message in errors)
+        )
+
+
+def parse_numeric_column(
+    input_data: pd.DataFrame, column: str, errors: list[tuple[int, str]]
+) -> npt.NDArray[np.float64]:
+    values: npt.NDArray[np.float64] = pd.to_numeric(
+        input_data[column], errors="coerce"
+    ).to_numpy(dtype=np.float64)
+    for row in np.flatnonzero(~np.isfinite(values)):
+        errors.append(
+            (
+                int(row),
+                f"{column} '{input_data[column].iloc[row]}' は数値である必要があります",
+            )
+        )
+    return values
+
+
+def preprocess_timeseries_columns(
+    input_data: pd.DataFrame,
+) -> tuple[npt.NDArray[np.datetime64], npt.NDArray[np.float64]]:
+    """日付・需要の列をまとめて変換・検証する"""
+    errors: list[tuple[int, str]] = []
+    dates = pd.to_datetime(
+        input_data["date"].astype(str), format="%Y-%m-%d", errors="coerce"
+    )
+    for row in np.flatnonzero(dates.isna().to_numpy()):
+        errors.append(
+            (
+                int(row),
+                f"date '{input_data['date'].iloc[row]}' は YYYY-MM-DD 形式である必要があります",
+            )
+        )
+    demands = parse_numeric_column(input_data, "demand", errors)
+    raise_row_errors(errors)
+    return dates.to_numpy(dtype="datetime64[ns]"), demands
+
+
+def preprocess_generator_columns(
+    input_data: pd.DataFrame,
+) -> dict[str, npt.NDArray[np.float64] | npt.NDArray[np.int64]]:
+    """
+    発電機パラメータの列をまとめて変換・検証する。
+    GeneratorParameters のバリデータと同じ条件を列単位で判定する。
+    """
+    errors: list[tuple[int, str]] = []
+    columns: dict[str, npt.NDArray[np.float64] | npt.NDArray[np.int64]] = {}
+    for column, name in GENERATOR_COLUMNS.items():
+        values = parse_numeric_column(input_data, column, errors)
+        if name in NON_NEGATIVE_MESSAGES:
+            for row in np.flatnonzero(values < 0):
+                errors.append((int(row), NON_NEGATIVE_MESSAGES[name]))
+        if name in INTEGER_FIELDS:
+            columns[name] = np.trunc(np.nan_to_num(values)).astype(np.int64)
+        else:
+            columns[name] = values
+    raise_row_errors(errors)
+    return columns
+
+
+def preprocess_input_arrays(
+    timeseries_df: pd.DataFrame, generator_parameters_df: pd.DataFrame
+) -> InputArrays:
+    """行ごとのループや pydantic モデルを介さずに入力データを配列として作る"""
+    dates, demands = preprocess_timeseries_columns(timeseries_df)
+    columns = preprocess_generator_columns(generator_parameters_df)
+    return InputArrays(
+        dates=dates,
+        date_indices=np.arange(1, len(dates) + 1, dtype=np.int64),
+        demands=demands,
+        generator_ids=generator_parameters_df["generator_id"].astype(str).tolist(),
+        pmins=columns["pmin"].astype(np.float64),
+        pmaxs=columns["pmax"].astype(np.float64),
+        cost_runs=columns["cost_run"].astype(np.float64),
+        cost_starts=columns["cost_start"].astype(np.float64),
+        cost_stops=columns["cost_stop"].astype(np.float64),
+        min_operation_times=columns["min_operation_time"].astype(np.int64),
+        min_down_times=columns["min_down_time"].astype(np.int64),
+        ramp_ups=columns["ramp_up"].astype(np.float64),
+        ramp_downs=columns["ramp_down"].astype(np.float64),
+    )
 
 
 def preprocess_timeseries_data(input_data: pd.DataFrame) -> list[InputTimeSeriesData]:
-    data = []
-    for i, (_, row) in enumerate(input_data.iterrows()):
-        date = datetime.strptime(row["date"], "%Y-%m-%d")
-        demand = float(row["demand"])
-        data.append(InputTimeSeriesData(date=date, date_index=i + 1, demand=demand))
-    return data
+    dates, demands = preprocess_timeseries_columns(input_data)
+    return [
+        InputTimeSeriesData(date=date, date_index=i + 1, demand=demand)
+        for i, (date, demand) in enumerate(
+            zip(
+                pd.DatetimeIndex(dates).to_pydatetime(),
+                demands.tolist(),
+                strict=True,
+            )
+        )
+    ]
 
 
 def preprocess_generator_parameters(
     input_data: pd.DataFrame,
 ) -> list[GeneratorParameters]:
-    parameters_list = []
-    for _, (_, row) in enumerate(input_data.iterrows()):
-        generator_id = str(row["generator_id"])
-        pmin = float(row["Pmin"])
-        pmax = float(row["Pmax"])
-        cost_run = float(row["cost_run"])
-        cost_start = float(row["cost_start"])
-        cost_stop = float(row["cost_stop"])
-        min_operation_time = int(row["min_operation_time"])
-        min_down_time = int(row["min_down_time"])
-        ramp_up = float(row["ramp_up"])
-        ramp_down = float(row["ramp_down"])
-        generator_parameters = GeneratorParameters(
+    columns = {
+        name: values.tolist()
+        for name, values in preprocess_generator_columns(input_data).items()
+    }
+    return [
+        GeneratorParameters(
             generator_id=generator_id,
-            pmin=pmin,
-            pmax=pmax,
-            cost_run=cost_run,
-            cost_start=cost_start,
-            cost_stop=cost_stop,
-            min_operation_time=min_operation_time,
-            min_down_time=min_down_time,
-            ramp_up=ramp_up,
-            ramp_down=ramp_down,
+            **{name: values[p] for name, values in columns.items()},
         )
-        parameters_list.append(generator_parameters)
-    return parameters_list
+        for p, generator_id in enumerate(input_data["generator_id"].astype(str))
+    ]
@@ -0,0 +1,186 @@
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from src.models.matrix_builder import VARIABLE_KINDS, MatrixModel, remaining_periods
+from src.schemas.data_schema import UnitInitialState
+from src.schemas.input_arrays import InputArrays
+
+FloatArray = npt.NDArray[np.float64]
+BoolArray = npt.NDArray[np.bool_]
+
+# 上下限の伝播を繰り返す回数の上限 (通常は数回で変化がなくなる)
+MAX_ROUNDS = 20
+
+
+@dataclass
+class PresolveResult:
+    """
+    モデルを構築する前に入力データから決まる変数の上下限 (いずれも (T, P))。
+    - forced_on / forced_off: 稼働・停止が確定した (期, 発電機)
+    - output_lower / output_upper: 出力の上下限
+    - switch_fixed: 起動・停止を0に固定できる (期, 発電機)
+    """
+
+    forced_on: BoolArray
+    forced_off: BoolArray
+    output_lower: FloatArray
+    output_upper: FloatArray
+    switch_fixed: BoolArray
+    num_tightened_bounds: int
+    presolve_seconds: float = 0.0
+
+    @property
+    def infeasible(self) -> bool:
+        """上下限が矛盾し、入力データだけで実行不可能と分かる場合 True"""
+        return bool(
+            (self.forced_on & self.forced_off).any()
+            or (self.output_lower > self.output_upper).any()
+        )
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "num_forced_on": int(self.forced_on.sum()),
+            "num_forced_off": int(self.forced_off.sum()),
+            "num_fixed_switches": 2 * int(self.switch_fixed.sum()),
+            "num_tightened_bounds": self.num_tightened_bounds,
+        }
+
+
+def presolve_commitment(
+    input_arrays: InputArrays,
+    initial_states: list[UnitInitialState] | None = None,
+) -> PresolveResult:
+    """
+    稼働状態が入力データだけで決まる (期, 発電機) を求め、出力の上下限を絞る。
+    次の推論を、変化がなくなるまで全期間・全発電機まとめて繰り返す。
+    - 他の発電機の出力上限の合計が需要に届かない期は、不足分を出力の下限とし、
+      下限が正なら稼働が確定する
+    - 稼働が確定した期は最小出力を下限とする
+    - 出力の上限が最小出力に届かない期は停止が確定する
+    - 出力の下限をランプ制約で前後の期に伝播する (前期 ≧ 当期 - ランプアップ、
+      当期 ≧ 前期 - ランプダウン)。停止が確定した期の上限0も同様に伝播する
+    - 稼働が確定した2つの期の間隔が最低停止期間以下なら、間も稼働が確定する
+      (停止が確定した期の間と最低稼働期間も同様)
+    - 初期状態から継続する最低稼働・停止期間と、直前期の出力からのランプ制約
+    需要制約は「出力の合計 ≧ 需要」のため、最小出力が需要を上回るだけでは
+    停止は確定しない。
+    また、稼働が続く期の起動・停止は0に固定しても最適値は変わらない
+    (起動と停止を同時に立てる解は、両方0にしてもコストが増えないため)。
+    """
+    demands = input_arrays.demands
+    pmins = input_arrays.pmins
+    pmaxs = input_arrays.pmaxs
+    ramp_ups = input_arrays.ramp_ups
+    ramp_downs = input_arrays.ramp_downs
+    shape = (input_arrays.num_timeseries, input_arrays.num_units)
+
+    forced_on = np.zeros(shape, dtype=np.bool_)
+    forced_off = np.broadcast_to(pmaxs < pmins, shape).copy()
+    lower = np.zeros(shape)
+    upper = np.broadcast_to(pmaxs, shape).copy()
+    if initial_states is not None:
+        for p, state in enumerate(initial_states):
+            for length, operation, fixed in (
+                (int(input_arrays.min_operation_times[p]), 1, forced_on),
+                (int(input_arrays.min_down_times[p]), 0, forced_off),
+            ):
+                fixed[: remaining_periods(state, length, operation), p] = True
+        previous = np.array([state.output for state in initial_states])
+        upper[0] = np.minimum(upper[0], previous + ramp_ups)
+        lower[0] = np.maximum(lower[0], previous - ramp_downs)
+
+    for _ in range(MAX_ROUNDS):
+        before = (forced_on.copy(), forced_off.copy(), lower.copy(), upper.copy())
+        upper[forced_off] = 0.0
+        for t in range(1, shape[0]):
+            np.minimum(upper[t], upper[t - 1] + ramp_ups, out=upper[t])
+        for t in range(shape[0] - 2, -1, -1):
+            np.minimum(upper[t], upper[t + 1] + ramp_downs, out=upper[t])
+
+        # 出力の上限が最小出力に届かない期は稼働できない
+        # (ランプアップが最小出力未満の発電機は、一度停止すると起動できない)
+        forced_off |= upper < pmins
+
+        others = upper.sum(axis=1, keepdims=True) - upper
+        np.maximum(lower, demands[:, None] - others, out=lower)
+        forced_on |= lower > 0
+        forced_on = fill_short_gaps(
+            forced_on, input_arrays.min_down_times, initial_states is None
+        )
+        forced_off = fill_short_gaps(
+            forced_off, input_arrays.min_operation_times, initial_states is None
+        )
+        np.maximum(lower, np.where(forced_on, pmins, 0.0), out=lower)
+        for t in range(1, shape[0]):
+            np.maximum(lower[t], lower[t - 1] - ramp_downs, out=lower[t])
+        for t in range(shape[0] - 2, -1, -1):
+            np.maximum(lower[t], lower[t + 1] - ramp_ups, out=lower[t])
+        forced_on |= lower > 0
+
+        if all(
+            np.array_equal(a, b)
+            for a, b in zip(before, (forced_on, forced_off, lower, upper), strict=True)
+        ):
+            break
+
+    # 稼働状態が前期から変わらないことが確定した期は、起動・停止が0に決まる
+    switch_fixed = np.zeros(shape, dtype=np.bool_)
+    switch_fixed[1:] = (forced_on[1:] & forced_on[:-1]) | (
+        forced_off[1:] & forced_off[:-1]
+    )
+    if initial_states is not None:
+        previous_on = np.array([state.operation == 1 for state in initial_states])
+        switch_fixed[0] = (forced_on[0] & previous_on) | (forced_off[0] & ~previous_on)
+    # 稼働状態から決まる上下限 (最小出力・最大出力・停止中の0) より絞れた出力の数
+    tightened = (lower > np.where(forced_on, pmins, 0.0)) | (
+        upper < np.where(forced_off, 0.0, pmaxs)
+    )
+    num_tightened_bounds = int(tightened.sum())
+    return PresolveResult(
+        forced_on=forced_on,
+        forced_off=forced_off,
+        output_lower=lower,
+        output_upper=upper,
+        switch_fixed=switch_fixed,
+        num_tightened_bounds=num_tightened_bounds,
+    )
+
+
+def fill_short_gaps(
+    fixed: BoolArray, min_times: npt.NDArray[np.int64], window_from_start: bool
+) -> BoolArray:
+    """
+    同じ状態が確定した2つの期の間隔が min_times 以下なら、間も同じ状態に確定する。
+    反対の状態に入って戻るには、その状態を min_times + 1 期以上続ける必要があるため
+    (Solver の最低稼働・停止期間の窓)。初期状態がない場合、窓は min_times 期目以降
+    にしか課されないため、戻る期がそれ以降になる間隔だけを埋める。
+    """
+    fixed = fixed.copy()
+    for p in range(fixed.shape[1]):
+        periods = np.flatnonzero(fixed[:, p])
+        length = int(min_times[p])
+        first = length if window_from_start else min(length, 1)
+        for head, tail in zip(periods[:-1].tolist(), periods[1:].tolist(), strict=True):
+            if 1 < tail - head <= length + 1 and head + 2 >= first:
+                fixed[head + 1 : tail, p] = True
+    return fixed
+
+
+def apply_presolve_bounds(model: MatrixModel, result: PresolveResult) -> None:
+    """presolve_commitment の結果を行列形式のモデルの変数の上下限に反映する"""
+    size = result.forced_on.size
+    blocks = {
+        kind: slice(i * size, (i + 1) * size) for i, kind in enumerate(VARIABLE_KINDS)
+    }
+    lower, upper = model.lower_bounds, model.upper_bounds
+    operation, output = blocks["operation"], blocks["output"]
+    lower[operation] = np.where(result.forced_on.ravel(), 1.0, lower[operation])
+    upper[operation] = np.where(result.forced_off.ravel(), 0.0, upper[operation])
+    for kind in ("start", "stop"):
+        upper[blocks[kind]] = np.where(
+            result.switch_fixed.ravel(), 0.0, upper[blocks[kind]]
+        )
+    lower[output] = np.maximum(lower[output], result.output_lower.ravel())
+    upper[output] = np.minimum(upper[output], result.output_upper.ravel())
@@ -0,0 +1,78 @@
+import json
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from src.schemas.data_schema import Scenario
+
+
+def load_scenarios(manifest_path: str) -> list[Scenario]:
+    """
+    シナリオ定義ファイル (JSON) を読み込む。
+    形式: [{"name": ..., "demand_scale": ..., ...}, ...]
+    """
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    scenarios = [Scenario(**scenario) for scenario in manifest]
+    names = [scenario.name for scenario in scenarios]
+    if len(set(names)) != len(names):
+        raise ValueError("シナリオ名が重複しています")
+    return scenarios
+
+
+def apply_scenario(
+    timeseries_df: pd.DataFrame,
+    generator_parameters_df: pd.DataFrame,
+    scenario: Scenario,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """需要・運転コストの倍率と計画外停止をシナリオに従って入力データに反映する"""
+    unknown = set(scenario.outages) | set(scenario.cost_run_scales)
+    unknown -= set(generator_parameters_df["generator_id"].astype(str))
+    if unknown:
+        raise ValueError(f"存在しない発電機IDが指定されています: {sorted(unknown)}")
+
+    timeseries_df = timeseries_df.copy()
+    timeseries_df["demand"] = timeseries_df["demand"] * scenario.demand_scale
+
+    generator_ids = generator_parameters_df["generator_id"].astype(str)
+    generator_parameters_df = generator_parameters_df[
+        ~generator_ids.isin(scenario.outages)
+    ].copy()
+    cost_run_scales = (
+        generator_parameters_df["generator_id"]
+        .astype(str)
+        .map(scenario.cost_run_scales)
+        .fillna(1.0)
+    )
+    generator_parameters_df["cost_run"] = (
+        generator_parameters_df["cost_run"] * scenario.cost_run_scale * cost_run_scales
+    )
+    return timeseries_df, generator_parameters_df
+
+
+def demand_scenarios(
+    demands: npt.NDArray[np.float64], scenarios: list[Scenario]
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """
+    確率的計画 (StochasticSolver) の需要シナリオ (S, T) と発生確率 (S,) を作る。
+    稼働計画を共有できるよう、需要の倍率以外を変えるシナリオは指定できない。
+    """
+    if not scenarios:
+        raise ValueError("シナリオが1つもありません")
+    unsupported = [
+        scenario.name
+        for scenario in scenarios
+        if scenario.cost_run_scale != 1.0
+        or scenario.cost_run_scales
+        or scenario.outages
+    ]
+    if unsupported:
+        raise ValueError(
+            f"確率的計画では需要の倍率以外を変えるシナリオは使えません: {unsupported}"
+        )
+    weights = np.array([scenario.probability for scenario in scenarios])
+    if weights.sum() <= 0:
+        raise ValueError("シナリオの発生確率の合計が0です")
+    scales = np.array([scenario.demand_scale for scenario in scenarios])
+    return scales[:, None] * demands[None, :], weights / weights.sum()
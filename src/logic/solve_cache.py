@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, fields
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from src.models.matrix_builder import VARIABLE_KINDS
+from src.schemas.input_arrays import InputArrays
+
+# 定式化や保存形式を変えたときに上げて、古いキャッシュを無効にする
+CACHE_VERSION = 1
+
+
+@dataclass
+class CachedSolution:
+    """キャッシュから読み出した解"""
+
+    values: dict[str, npt.NDArray[np.float64]]
+    status: int
+    objective_value: float | None
+
+
+def input_fingerprint(input_arrays: InputArrays, options: dict[str, Any]) -> str:
+    """
+    入力データとソルバー設定の内容から、キャッシュのキーとなるハッシュ値を作る。
+    配列は dtype・形状・バイト列を、設定はキーで並べた JSON を順に読み込ませる。
+    """
+    digest = hashlib.sha256()
+    digest.update(f"version={CACHE_VERSION}".encode())
+    for field in fields(input_arrays):
+        if field.name.startswith("_"):
+            continue
+        value = getattr(input_arrays, field.name)
+        digest.update(field.name.encode())
+        if isinstance(value, np.ndarray):
+            array = np.ascontiguousarray(value)
+            digest.update(f"{array.dtype.str}{array.shape}".encode())
+            digest.update(array.tobytes())
+        else:
+            digest.update(json.dumps(value).encode())
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class SolveCache:
+    """
+    解をディスクに保存するキャッシュ。
+    - 1つの解を cache_dir/<key>.npz に保存する
+    - 読み出したファイルは更新時刻を新しくし、合計サイズが max_bytes を超えたら
+      更新時刻の古いものから削除する (LRU)
+    - 書き込みは一時ファイルからの置き換えで行い、並列に実行しても壊れないようにする
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 1_000_000_000):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def load(self, key: str) -> CachedSolution | None:
+        path = self.path(key)
+        try:
+            with np.load(path) as data:
+                values = {kind: data[kind] for kind in VARIABLE_KINDS}
+                status = int(data["status"])
+                objective_value = float(data["objective_value"])
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            # 存在しない・削除された・壊れたファイルはキャッシュなしとして扱う
+            return None
+        return CachedSolution(
+            values=values,
+            status=status,
+            objective_value=None if np.isnan(objective_value) else objective_value,
+        )
+
+    def store(
+        self,
+        key: str,
+        values: dict[str, npt.NDArray[np.float64]],
+        status: int,
+        objective_value: float | None,
+    ) -> None:
+        arrays: dict[str, Any] = {kind: values[kind] for kind in VARIABLE_KINDS}
+        arrays["status"] = np.int64(status)
+        arrays["objective_value"] = np.float64(
+            np.nan if objective_value is None else objective_value
+        )
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """合計サイズが max_bytes 以下になるまで、古いものから削除する"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".npz"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
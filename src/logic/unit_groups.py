@@ -0,0 +1,85 @@
+from collections import deque
+
+import numpy as np
+import numpy.typing as npt
+
+from src.models.matrix_builder import VARIABLE_KINDS
+from src.schemas.input_arrays import PARAMETER_ATTRIBUTES, InputArrays
+
+FloatArray = npt.NDArray[np.float64]
+
+
+def identical_unit_groups(input_arrays: InputArrays) -> list[list[int]]:
+    """
+    発電機ID以外のパラメータが全て同じ発電機をまとめたグループ
+    (各グループは発電機の番号のリスト。先頭の発電機の順に並べる)。
+    ランプ幅が最小出力に届かない発電機は期間内に起動・停止できず、台数で表すと
+    個々の発電機に戻せなくなるため、まとめずに1台ずつのグループにする。
+    """
+    parameters = np.stack(
+        [
+            getattr(input_arrays, attribute).astype(np.float64)
+            for attribute in PARAMETER_ATTRIBUTES.values()
+        ],
+        axis=1,
+    )
+    switchable = (input_arrays.ramp_ups >= input_arrays.pmins) & (
+        input_arrays.ramp_downs >= input_arrays.pmins
+    )
+    groups: dict[tuple[float, ...], list[int]] = {}
+    singles: list[list[int]] = []
+    for p, row in enumerate(parameters.tolist()):
+        if switchable[p]:
+            groups.setdefault(tuple(row), []).append(p)
+        else:
+            singles.append([p])
+    return sorted([*groups.values(), *singles], key=lambda group: group[0])
+
+
+def group_input_arrays(
+    input_arrays: InputArrays, groups: list[list[int]]
+) -> tuple[InputArrays, list[int]]:
+    """
+    各グループを先頭の発電機で代表させた入力データと、グループの台数。
+    Solver の unit_counts に台数を渡すと、グループごとの台数のモデルになる。
+    """
+    return (
+        input_arrays.select_units([group[0] for group in groups]),
+        [len(group) for group in groups],
+    )
+
+
+def group_schedule(
+    schedule: dict[str, FloatArray], groups: list[list[int]]
+) -> dict[str, FloatArray]:
+    """発電機ごとの解 (T, P) をグループごとの台数・合計出力 (T, G) にまとめる"""
+    return {
+        kind: np.stack([schedule[kind][:, group].sum(axis=1) for group in groups], 1)
+        for kind in VARIABLE_KINDS
+    }
+
+
+def disaggregate_operation(
+    counts: FloatArray, groups: list[list[int]], num_units: int
+) -> FloatArray:
+    """
+    グループごとの稼働台数 (T, G) を、発電機ごとの稼働状態 (T, P) に割り当てる。
+    起動する台は停止期間の長い順に、停止する台は稼働期間の長い順に選ぶ
+    (先入れ先出し)。台数のモデルの最低稼働・停止期間の制約
+    (窓内の起動台数 ≦ 稼働台数、窓内の停止台数 ≦ 停止台数) を満たしていれば、
+    選んだ台は窓より前に起動・停止しているため、各台の制約も満たす。
+    """
+    counts = np.rint(counts).astype(np.int64)
+    operation = np.zeros((len(counts), num_units))
+    for g, group in enumerate(groups):
+        # 先頭ほど長く今の状態を続けている台
+        running = deque(group[: counts[0, g]])
+        stopped = deque(group[counts[0, g] :])
+        for t in range(len(counts)):
+            change = counts[t, g] - len(running)
+            for _ in range(change):
+                running.append(stopped.popleft())
+            for _ in range(-change):
+                stopped.append(running.popleft())
+            operation[t, list(running)] = 1.0
+    return operation
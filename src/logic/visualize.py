@@ -5,20 +5,50 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 from src.schemas.data_schema import OverallOutput
+from src.schemas.schedule_result import ScheduleResult
 
+DASHBOARD_MODES = ("auto", "standard", "scalable")
 
-def visualize_generations(overall_output: OverallOutput, output_dir: str) -> None:
-    """
-    発電機ごとの発電量をPlotlyで可視化（需要は表示しない）。
-    構成:
-    - 上: 積み上げ棒グラフ（全発電機）
-    - 下: 各発電機の棒グラフ（積み上げと同じ色）
-    - すべてのy軸スケールを統一
-    出力形式: HTML (縦にグラフを並べる)
-    """
-    os.makedirs(output_dir, exist_ok=True)
+# 積み上げグラフの系列色 (発電機の並び順に循環させる)
+COLORS = [
+    "#1f77b4",
+    "#ff7f0e",
+    "#2ca02c",
+    "#d62728",
+    "#9467bd",
+    "#8c564b",
+    "#e377c2",
+    "#7f7f7f",
+    "#bcbd22",
+    "#17becf",
+]
+
+# 自動で集約するときの候補 (細かい順)
+RESAMPLE_RULES = {"D": "日", "W": "週"}
+
+
+def subplot_spacing(rows: int, spacing: float) -> float:
+    """行数が多いと Plotly の上限 (1 / (rows - 1)) を超えるため、間隔を狭める"""
+    return min(spacing, 0.5 / max(rows - 1, 1))
+
+
+def create_color_map(generator_columns: list[str]) -> dict[str, str]:
+    return {gid: COLORS[i % len(COLORS)] for i, gid in enumerate(generator_columns)}
+
+
+def create_generation_pivot(
+    overall_output: OverallOutput | ScheduleResult,
+) -> pd.DataFrame:
+    """発電量を 日付 × 発電機ID の表にする"""
+    if isinstance(overall_output, ScheduleResult):
+        if overall_output.output.size == 0:
+            raise ValueError("overall_outputに発電量データが含まれていません。")
+        return pd.DataFrame(
+            overall_output.output,
+            index=pd.DatetimeIndex(overall_output.dates, name="date"),
+            columns=pd.Index(overall_output.generator_ids, name="generator_id"),
+        ).sort_index()
 
-    # === OverallOutput → DataFrame変換 ===
     records: list[dict[str, object]] = []
     for generator_output in overall_output.generator_outputs:
         for schedule in generator_output.schedules:
@@ -35,7 +65,7 @@ def visualize_generations(overall_output: OverallOutput, output_dir: str) -> Non
 
     df = pd.DataFrame(records)
     df["date"] = pd.to_datetime(df["date"])
-    generation_pivot = (
+    return (
         df.pivot_table(
             index="date", columns="generator_id", values="output", aggfunc="sum"
         )
@@ -43,24 +73,59 @@ def visualize_generations(overall_output: OverallOutput, output_dir: str) -> Non
         .sort_index()
     )
 
+
+def visualize_generations(
+    overall_output: OverallOutput | ScheduleResult,
+    output_dir: str,
+    mode: str = "auto",
+    max_points: int = 2000,
+    panels_per_page: int = 10,
+) -> None:
+    """
+    発電機ごとの発電量をPlotlyで可視化する。
+    mode:
+    - standard: 全期間・全発電機を1つのHTMLに棒グラフで描く
+    - scalable: WebGL で描き、期間の集約と発電機パネルのページ分割を行う
+    - auto: 期間数が max_points または発電機数が panels_per_page を超える場合に
+      scalable、それ以外は standard
+    """
+    if mode not in DASHBOARD_MODES:
+        raise ValueError(
+            f"mode は {DASHBOARD_MODES} のいずれかを指定してください: {mode}"
+        )
+    generation_pivot = create_generation_pivot(overall_output)
+    if mode == "auto":
+        is_large = (
+            len(generation_pivot) > max_points
+            or len(generation_pivot.columns) > panels_per_page
+        )
+        mode = "scalable" if is_large else "standard"
+
+    if mode == "standard":
+        visualize_generations_standard(generation_pivot, output_dir)
+    else:
+        visualize_generations_scalable(
+            generation_pivot, output_dir, max_points, panels_per_page
+        )
+
+
+def visualize_generations_standard(
+    generation_pivot: pd.DataFrame, output_dir: str
+) -> None:
+    """
+    発電機ごとの発電量をPlotlyで可視化（需要は表示しない）。
+    構成:
+    - 上: 積み上げ棒グラフ（全発電機）
+    - 下: 各発電機の棒グラフ（積み上げと同じ色）
+    - すべてのy軸スケールを統一
+    出力形式: HTML (縦にグラフを並べる)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
     generator_columns = generation_pivot.columns.tolist()
 
     # === カラーマップ ===
-    colors = [
-        "#1f77b4",
-        "#ff7f0e",
-        "#2ca02c",
-        "#d62728",
-        "#9467bd",
-        "#8c564b",
-        "#e377c2",
-        "#7f7f7f",
-        "#bcbd22",
-        "#17becf",
-    ]
-    color_map = {
-        gid: colors[i % len(colors)] for i, gid in enumerate(generator_columns)
-    }
+    color_map = create_color_map(generator_columns)
 
     # === y軸スケールを全グラフで統一 ===
     total_output_each_day = generation_pivot.sum(axis=1)
@@ -71,7 +136,7 @@ def visualize_generations(overall_output: OverallOutput, output_dir: str) -> Non
         rows=len(generator_columns) + 1,
         cols=1,
         shared_xaxes=True,
-        vertical_spacing=0.04,
+        vertical_spacing=subplot_spacing(len(generator_columns) + 1, 0.04),
         subplot_titles=[
             "🔹 全発電機の積み上げ発電量",
             *[f"発電機 {gid} の発電量" for gid in generator_columns],
@@ -141,3 +206,135 @@ def visualize_generations(overall_output: OverallOutput, output_dir: str) -> Non
     # === 出力 ===
     output_path = os.path.join(output_dir, "generation_dashboard.html")
     fig.write_html(output_path, include_plotlyjs="cdn")
+
+
+def resample_generation(
+    generation_pivot: pd.DataFrame, max_points: int
+) -> tuple[pd.DataFrame, str | None]:
+    """
+    期間数が max_points 以下になるまで、日 → 週 の順に平均で集約する。
+    集約しなかった場合は rule に None を返す。
+    """
+    if len(generation_pivot) <= max_points:
+        return generation_pivot, None
+    resampled = generation_pivot
+    rule = None
+    for rule in RESAMPLE_RULES:
+        resampled = generation_pivot.resample(rule).mean().dropna(how="all")
+        if len(resampled) <= max_points:
+            break
+    return resampled, rule
+
+
+def visualize_generations_scalable(
+    generation_pivot: pd.DataFrame,
+    output_dir: str,
+    max_points: int = 2000,
+    panels_per_page: int = 10,
+) -> list[str]:
+    """
+    大規模な発電機群・長期間向けの可視化。
+    - 期間数が max_points を超える場合は日・週平均に集約する
+    - 描画は WebGL (Scattergl) で行う
+    - 発電機ごとの内訳 (customdata) は積み上げの合計系列に1回だけ持たせる
+    - 発電機ごとのパネルは panels_per_page 台ずつ別のHTMLに分ける
+    出力したHTMLのパスを返す (先頭が積み上げグラフ)。
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    generation_pivot, rule = resample_generation(generation_pivot, max_points)
+    unit = "MW" if rule is None else f"MW ({RESAMPLE_RULES[rule]}平均)"
+
+    generator_columns = generation_pivot.columns.tolist()
+    color_map = create_color_map(generator_columns)
+    x = generation_pivot.index
+    values = generation_pivot.to_numpy()
+    unified_ymax = float(values.sum(axis=1).max()) * 1.05
+
+    # === (1) 積み上げグラフ: 累積値を塗りつぶしで重ねる ===
+    stacked = go.Figure()
+    cumulative = values.cumsum(axis=1)
+    for i, gid in enumerate(generator_columns):
+        stacked.add_trace(
+            go.Scattergl(
+                x=x,
+                y=cumulative[:, i],
+                name=f"{gid}",
+                mode="lines",
+                line=dict(width=0.5, color=color_map[gid]),
+                fill="tozeroy" if i == 0 else "tonexty",
+                hoverinfo="skip",
+            )
+        )
+    # 内訳は合計系列だけに持たせる
+    stacked.add_trace(
+        go.Scattergl(
+            x=x,
+            y=cumulative[:, -1],
+            name="合計",
+            mode="lines",
+            line=dict(width=1, color="#333333"),
+            customdata=values,
+            hovertemplate="<b>%{x}</b><br>"
+            + "<br>".join(
+                f"{g}: " + "%{customdata[" + str(i) + "]:.2f} " + unit
+                for i, g in enumerate(generator_columns)
+            )
+            + "<br><b>合計: %{y:.2f} "
+            + unit
+            + "</b><extra></extra>",
+        )
+    )
+    stacked.update_layout(
+        title=f"⚡ 全発電機の積み上げ発電量（{unit}）",
+        xaxis_title="日付",
+        yaxis_title=f"発電量 ({unit})",
+        yaxis_range=[0, unified_ymax],
+        template="plotly_white",
+        height=500,
+        hovermode="x",
+        margin=dict(l=60, r=30, t=80, b=40),
+    )
+    stacked_path = os.path.join(output_dir, "generation_dashboard.html")
+    stacked.write_html(stacked_path, include_plotlyjs="cdn")
+    paths = [stacked_path]
+
+    # === (2) 発電機ごとのパネル: panels_per_page 台ずつ別ページ ===
+    num_pages = -(-len(generator_columns) // panels_per_page)
+    for page in range(num_pages):
+        gids = generator_columns[page * panels_per_page : (page + 1) * panels_per_page]
+        fig = make_subplots(
+            rows=len(gids),
+            cols=1,
+            shared_xaxes=True,
+            vertical_spacing=subplot_spacing(len(gids), 0.02),
+            subplot_titles=[f"発電機 {gid} の発電量" for gid in gids],
+        )
+        for row, gid in enumerate(gids, start=1):
+            fig.add_trace(
+                go.Scattergl(
+                    x=x,
+                    y=generation_pivot[gid].to_numpy(),
+                    name=f"{gid}",
+                    mode="lines",
+                    line=dict(color=color_map[gid]),
+                    hovertemplate="日付: %{x}<br>発電量: %{y:.2f} "
+                    + unit
+                    + "<extra>"
+                    + gid
+                    + "</extra>",
+                ),
+                row=row,
+                col=1,
+            )
+            fig.update_yaxes(range=[0, unified_ymax], row=row, col=1)
+        fig.update_layout(
+            title=f"⚡ 発電機別 発電量 ({page + 1}/{num_pages})",
+            template="plotly_white",
+            height=250 * len(gids),
+            showlegend=False,
+            margin=dict(l=60, r=30, t=80, b=40),
+        )
+        path = os.path.join(output_dir, f"generation_units_{page + 1:03d}.html")
+        fig.write_html(path, include_plotlyjs="cdn")
+        paths.append(path)
+    return paths
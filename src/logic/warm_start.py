@@ -0,0 +1,115 @@
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from src.schemas.data_schema import InputData, OverallOutput
+from src.schemas.input_arrays import InputArrays, as_input_arrays
+
+FloatArray = npt.NDArray[np.float64]
+
+
+def complete_schedule(
+    operation: FloatArray, output: FloatArray
+) -> dict[str, FloatArray]:
+    """稼働状態と出力の (T, P) 配列から、起動・停止を含む初期解を作る"""
+    operation = np.rint(operation)
+    change = np.diff(operation, axis=0, prepend=operation[:1])
+    return {
+        "operation": operation,
+        "start": np.maximum(change, 0.0),
+        "stop": np.maximum(-change, 0.0),
+        "output": np.where(operation > 0, output, 0.0),
+    }
+
+
+def schedule_from_overall_output(
+    overall_output: OverallOutput, input_data: InputData | InputArrays
+) -> dict[str, FloatArray]:
+    """
+    過去の OverallOutput から初期解を作る。
+    日付と発電機IDで突き合わせ、該当しない期・発電機は停止とする。
+    """
+    records = [
+        {
+            "date": schedule.date,
+            "generator_id": generator_output.generator_id,
+            "operation": schedule.operation,
+            "output": schedule.output,
+        }
+        for generator_output in overall_output.generator_outputs
+        for schedule in generator_output.schedules
+    ]
+    return schedule_from_records(pd.DataFrame(records), input_data)
+
+
+def load_schedule(
+    path: str, input_data: InputData | InputArrays
+) -> dict[str, FloatArray]:
+    """
+    ファイルに保存されたスケジュールから初期解を作る。
+    縦持ちのCSV (date, generator_id, operation, output) を想定する。
+    """
+    records = pd.read_csv(
+        path,
+        usecols=["date", "generator_id", "operation", "output"],
+        dtype={"generator_id": str},
+        parse_dates=["date"],
+    )
+    return schedule_from_records(records, input_data)
+
+
+def schedule_from_records(
+    records: pd.DataFrame, input_data: InputData | InputArrays
+) -> dict[str, FloatArray]:
+    input_arrays = as_input_arrays(input_data)
+    dates = pd.DatetimeIndex(input_arrays.dates)
+    generator_ids = input_arrays.generator_ids
+    if records.empty:
+        shape = (len(dates), len(generator_ids))
+        return complete_schedule(np.zeros(shape), np.zeros(shape))
+    records = records.assign(date=pd.to_datetime(records["date"]))
+    operation = records.pivot_table(
+        index="date", columns="generator_id", values="operation", aggfunc="max"
+    ).reindex(index=dates, columns=generator_ids, fill_value=0)
+    output = records.pivot_table(
+        index="date", columns="generator_id", values="output", aggfunc="sum"
+    ).reindex(index=dates, columns=generator_ids, fill_value=0.0)
+    return complete_schedule(
+        operation.fillna(0).to_numpy(dtype=np.float64),
+        output.fillna(0.0).to_numpy(dtype=np.float64),
+    )
+
+
+def merit_order_schedule(
+    input_data: InputData | InputArrays,
+) -> dict[str, FloatArray]:
+    """
+    運転コスト (cost_run) の安い順に発電機を並べ、各期の需要を満たすまで起動する。
+    起動した発電機は最小出力で運転し、残りの需要を安い順に最大出力まで割り当てる。
+    最低稼働・停止期間やランプ制約は考慮しないため、実行可能とは限らない。
+    """
+    input_arrays = as_input_arrays(input_data)
+    demands = input_arrays.demands
+    pmins = input_arrays.pmins
+    pmaxs = input_arrays.pmaxs
+    order = np.argsort(input_arrays.cost_runs, kind="stable")
+
+    # 安い順に何台起動すれば各期の需要を賄えるか
+    cumulative_pmax = np.cumsum(pmaxs[order])
+    num_committed = np.minimum(
+        np.searchsorted(cumulative_pmax, demands, side="left") + 1, len(order)
+    )
+    committed = np.arange(len(order))[None, :] < num_committed[:, None]
+
+    # 最小出力を超える分を安い順に割り当てる
+    headroom = np.where(committed, pmaxs[order] - pmins[order], 0.0)
+    base = np.where(committed, pmins[order], 0.0)
+    remaining = np.maximum(demands - base.sum(axis=1), 0.0)
+    filled_before = np.cumsum(headroom, axis=1) - headroom
+    extra = np.clip(remaining[:, None] - filled_before, 0.0, headroom)
+
+    operation = np.zeros_like(base)
+    output = np.zeros_like(base)
+    operation[:, order] = committed
+    output[:, order] = base + extra
+    return complete_schedule(operation, output)
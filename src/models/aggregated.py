@@ -0,0 +1,138 @@
+import os
+import time
+
+import numpy as np
+import numpy.typing as npt
+from pulp import LpProblem, LpStatusNotSolved, LpStatusOptimal
+
+from src.logic.aggregation import (
+    aggregate_periods,
+    aggregate_schedule,
+    expand_blocks,
+)
+from src.models.dispatch import solve_dispatch
+from src.models.matrix_builder import MatrixModel
+from src.models.solver import Solver
+from src.schemas.data_schema import AggregationReport, InputData, SolverOptions
+from src.schemas.input_arrays import InputArrays
+
+
+class AggregatedSolver(Solver):
+    """
+    連続する block_length 期を1期にまとめた縮約モデルで解くソルバー。
+    - aggregate_periods で縮約した入力から起動停止計画を立てる
+    - 稼働状態を全期間に展開し、solve_dispatch で最低稼働・停止期間・ランプ・
+      各期の需要を満たすよう修復して、全期間の出力を決め直す
+    解は全期間の日付インデックスで持つため、後処理は一括求解と同じ。
+    縮約モデルの目的関数値は aggregated_objective に残す。
+    """
+
+    def __init__(
+        self,
+        input_data: InputData | InputArrays,
+        block_length: int,
+        builder: str = "pulp",
+        formulation: str = "basic",
+        options: SolverOptions | None = None,
+    ):
+        super().__init__(
+            input_data, builder=builder, formulation=formulation, options=options
+        )
+        self.block_length = block_length
+        self.reduced = Solver(
+            aggregate_periods(self.input_arrays, block_length),
+            builder=builder,
+            formulation=formulation,
+            options=self.options,
+        )
+
+    def build_model(self) -> None:
+        self.reduced.build_model()
+
+    def model_size(self) -> dict[str, int]:
+        return {"num_blocks": self.reduced.num_timeseries, **self.reduced.model_size()}
+
+    def solve(
+        self,
+        output_dir: str,
+        threads: int | None = None,
+        warm_start: dict[str, npt.NDArray[np.float64]] | None = None,
+    ) -> LpProblem | MatrixModel:
+        aggregation_dir = os.path.join(output_dir, "aggregation")
+        reduced_dir = os.path.join(aggregation_dir, "reduced")
+        os.makedirs(reduced_dir, exist_ok=True)
+        reduced_warm_start = None
+        if warm_start is not None:
+            reduced_warm_start = aggregate_schedule(warm_start, self.block_length)
+        self.reduced.solve(reduced_dir, threads, reduced_warm_start)
+        if not self.reduced.has_solution:
+            raise ValueError("縮約モデルで解が得られませんでした")
+        self.aggregated_objective = float(self.reduced.objective_value)
+
+        operation = expand_blocks(
+            self.reduced.get_variable_values()["operation"],
+            self.block_length,
+            self.num_timeseries,
+        )
+        dispatch = solve_dispatch(
+            self.input_arrays, operation, os.path.join(aggregation_dir, "dispatch")
+        )
+        if dispatch is None:
+            raise ValueError("縮約モデルの解から全期間の実行可能解を作れませんでした")
+        self.matrix_model = dispatch.matrix_model
+        self._variable_values = dispatch.get_variable_values()
+        self.status = LpStatusNotSolved
+        self.approximate = True
+        self.objective_value = float(dispatch.objective_value)
+        return self.matrix_model
+
+
+def evaluate_aggregation(
+    input_data: InputData | InputArrays,
+    output_dir: str,
+    block_length: int,
+    builder: str = "pulp",
+    formulation: str = "basic",
+) -> AggregationReport:
+    """同じ入力を全期間のモデルと縮約モデルで解き、コスト差を比較する"""
+    full_dir = os.path.join(output_dir, "full")
+    os.makedirs(full_dir, exist_ok=True)
+    start = time.perf_counter()
+    full = Solver(input_data, builder=builder, formulation=formulation)
+    full.build_model()
+    full.solve(full_dir)
+    full_seconds = time.perf_counter() - start
+    if full.status != LpStatusOptimal or full.objective_value is None:
+        raise ValueError("全期間のモデルで最適解が得られませんでした")
+
+    start = time.perf_counter()
+    aggregated = AggregatedSolver(
+        input_data, block_length, builder=builder, formulation=formulation
+    )
+    aggregated.build_model()
+    aggregated.solve(output_dir)
+    aggregated_seconds = time.perf_counter() - start
+
+    full_cost = float(full.objective_value)
+    aggregated_cost = float(aggregated.objective_value)
+    demands = aggregated.input_arrays.demands
+    block_demands = expand_blocks(
+        aggregated.reduced.input_arrays.demands, block_length, len(demands)
+    )
+    return AggregationReport(
+        block_length=block_length,
+        num_blocks=aggregated.reduced.num_timeseries,
+        reduced_cost=aggregated.aggregated_objective,
+        aggregated_cost=aggregated_cost,
+        full_cost=full_cost,
+        cost_gap=(aggregated_cost - full_cost) / abs(full_cost),
+        demand_error=float(np.abs(block_demands - demands).sum() / demands.sum()),
+        operation_mismatch=float(
+            np.mean(
+                np.rint(aggregated.get_variable_values()["operation"])
+                != np.rint(full.get_variable_values()["operation"])
+            )
+        ),
+        aggregated_seconds=aggregated_seconds,
+        full_seconds=full_seconds,
+    )
@@ -0,0 +1,208 @@
+import inspect
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from pulp import (
+    PULP_CBC_CMD,
+    LpSolver,
+    LpStatusInfeasible,
+    LpStatusNotSolved,
+    LpStatusOptimal,
+    LpStatusUnbounded,
+    getSolver,
+    listSolvers,
+)
+
+from src.models.matrix_builder import MatrixModel
+from src.schemas.data_schema import SolverOptions
+
+FloatArray = npt.NDArray[np.float64]
+
+# PuLP のソルバー名で指定できない、このリポジトリ独自のバックエンド名
+NATIVE_BACKENDS = ("cbc", "highs")
+
+
+def validate_backend(backend: str, builder: str) -> None:
+    """
+    バックエンドが builder で使えるかを確認する。
+    - "cbc": CBC のコマンドライン (pulp / matrix)
+    - "highs": HiGHS の Python API (highspy) (pulp / matrix)
+    - それ以外: PuLP のソルバー名 (pulp のみ。例: "GLPK_CMD", "HiGHS_CMD")
+    """
+    if backend in NATIVE_BACKENDS:
+        return
+    if builder == "matrix":
+        raise ValueError(f"matrix で使えるバックエンドは {NATIVE_BACKENDS} です")
+    if backend not in listSolvers():
+        raise ValueError(
+            f"backend は {NATIVE_BACKENDS} か PuLP のソルバー名である必要があります"
+        )
+
+
+def cbc_command_options(options: SolverOptions, threads: int | None) -> list[str]:
+    """matrix の CBC コマンドラインに渡すオプション"""
+    args = []
+    if threads is not None:
+        args += ["-threads", str(threads)]
+    if options.time_limit is not None:
+        args += ["-sec", str(options.time_limit)]
+    if options.mip_gap is not None:
+        args += ["-ratioGap", str(options.mip_gap)]
+    if options.node_limit is not None:
+        args += ["-maxNodes", str(options.node_limit)]
+    if not options.presolve:
+        args += ["-presolve", "off"]
+    return args
+
+
+def pulp_solver(
+    options: SolverOptions, threads: int | None, log_path: str, warm_start: bool
+) -> LpSolver:
+    """pulp の LpProblem.solve に渡すソルバー"""
+    if options.backend == "cbc":
+        return PULP_CBC_CMD(
+            msg=False,
+            logPath=log_path,
+            threads=threads,
+            warmStart=warm_start,
+            timeLimit=options.time_limit,
+            gapRel=options.mip_gap,
+            maxNodes=options.node_limit,
+            presolve=None if options.presolve else False,
+        )
+    if options.backend == "highs":
+        solver_params: dict[str, Any] = {}
+        if options.node_limit is not None:
+            solver_params["mip_max_nodes"] = options.node_limit
+        if not options.presolve:
+            solver_params["presolve"] = "off"
+        solver = getSolver(
+            "HiGHS",
+            msg=False,
+            timeLimit=options.time_limit,
+            gapRel=options.mip_gap,
+            threads=threads,
+            **solver_params,
+        )
+    else:
+        # PuLP の他のソルバーは、コンストラクタが受け付ける設定だけを渡す
+        solver_class = type(getSolver(options.backend))
+        parameters = inspect.signature(solver_class.__init__).parameters
+        accepts_any = any(
+            parameter.kind == inspect.Parameter.VAR_KEYWORD
+            for parameter in parameters.values()
+        )
+        settings = {
+            name: value
+            for name, value in {
+                "timeLimit": options.time_limit,
+                "gapRel": options.mip_gap,
+                "threads": threads,
+                "maxNodes": options.node_limit,
+                "presolve": None if options.presolve else False,
+            }.items()
+            if value is not None
+        }
+        unsupported = [] if accepts_any else sorted(set(settings) - set(parameters))
+        if unsupported:
+            raise ValueError(f"{options.backend} では {unsupported} を指定できません")
+        if warm_start and "warmStart" in parameters:
+            settings["warmStart"] = True
+        solver = solver_class(msg=False, **settings)
+    if not solver.available():
+        raise ValueError(f"{options.backend} はこの環境では利用できません")
+    return solver
+
+
+def solve_highs(
+    matrix_model: MatrixModel,
+    options: SolverOptions,
+    threads: int | None,
+    log_path: str,
+    initial_values: FloatArray | None = None,
+) -> tuple[int, float | None, float | None, FloatArray]:
+    """
+    行列形式のモデルを highspy で解く。
+    initial_values: 変数値の配列。指定した場合は初期解として渡す
+    戻り値: (PuLP互換のステータス, 目的関数値, 下界, 変数値の配列)
+    """
+    try:
+        import highspy
+    except ImportError as e:
+        raise ValueError("highs を使うには highspy が必要です") from e
+
+    indptr, indices, data = matrix_model.to_csr()
+    senses = matrix_model.senses
+    rhs = matrix_model.rhs
+    lp = highspy.HighsLp()
+    lp.num_col_ = matrix_model.num_variables
+    lp.num_row_ = matrix_model.num_constraints
+    lp.col_cost_ = matrix_model.objective
+    lp.col_lower_ = matrix_model.lower_bounds
+    lp.col_upper_ = np.where(
+        np.isinf(matrix_model.upper_bounds),
+        highspy.kHighsInf,
+        matrix_model.upper_bounds,
+    )
+    lp.row_lower_ = np.where(senses == "L", -highspy.kHighsInf, rhs)
+    lp.row_upper_ = np.where(senses == "G", highspy.kHighsInf, rhs)
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+    lp.a_matrix_.start_ = indptr
+    lp.a_matrix_.index_ = indices
+    lp.a_matrix_.value_ = data
+    lp.integrality_ = [
+        highspy.HighsVarType.kInteger if integer else highspy.HighsVarType.kContinuous
+        for integer in matrix_model.is_integer.tolist()
+    ]
+
+    highs = highspy.Highs()  # type: ignore[no-untyped-call, unused-ignore]
+    highs.setOptionValue("log_to_console", False)
+    highs.setOptionValue("log_file", log_path)
+    if threads is not None:
+        highs.setOptionValue("threads", threads)
+    if options.time_limit is not None:
+        highs.setOptionValue("time_limit", float(options.time_limit))
+    if options.mip_gap is not None:
+        highs.setOptionValue("mip_rel_gap", options.mip_gap)
+    if options.node_limit is not None:
+        highs.setOptionValue("mip_max_nodes", options.node_limit)
+    if not options.presolve:
+        highs.setOptionValue("presolve", "off")
+    highs.passModel(lp)
+    if initial_values is not None:
+        solution = highspy.HighsSolution()
+        solution.col_value = initial_values.tolist()
+        solution.value_valid = True
+        highs.setSolution(solution)
+    highs.run()
+
+    model_status = highs.getModelStatus()
+    info = highs.getInfo()
+    has_solution = int(info.primal_solution_status) == int(
+        highspy.SolutionStatus.kSolutionStatusFeasible
+    )
+    if model_status == highspy.HighsModelStatus.kInfeasible:
+        status = LpStatusInfeasible
+    elif model_status == highspy.HighsModelStatus.kUnbounded:
+        status = LpStatusUnbounded
+    elif model_status == highspy.HighsModelStatus.kOptimal:
+        # mip_rel_gap に達して停止した場合も含む
+        status = LpStatusOptimal
+    else:
+        # 時間制限などで停止した場合は、実行可能解があっても CBC と同様に Not Solved
+        status = LpStatusNotSolved
+    if not has_solution:
+        return status, None, None, np.full(matrix_model.num_variables, np.nan)
+    return (
+        status,
+        float(info.objective_function_value),
+        highs_best_bound(highs),
+        np.asarray(highs.getSolution().col_value, dtype=np.float64),
+    )
+
+
+def highs_best_bound(highs: Any) -> float | None:
+    """highspy.Highs の MIP の下界 (MIP を解いていなければ None)"""
+    bound = float(highs.getInfo().mip_dual_bound)
+    return bound if np.isfinite(bound) else None
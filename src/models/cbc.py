@@ -0,0 +1,300 @@
+import os
+import re
+import subprocess
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+from pulp import (
+    PULP_CBC_CMD,
+    LpStatusInfeasible,
+    LpStatusNotSolved,
+    LpStatusOptimal,
+    LpStatusUnbounded,
+)
+
+CBC_STATUS = {
+    "Optimal": LpStatusOptimal,
+    "Infeasible": LpStatusInfeasible,
+    "Integer": LpStatusInfeasible,
+    "Unbounded": LpStatusUnbounded,
+    "Stopped": LpStatusNotSolved,
+}
+
+
+def cbc_path() -> str:
+    """PuLP に同梱されている CBC の実行ファイルパスを返す"""
+    return str(PULP_CBC_CMD().path)
+
+
+def cbc_args(mps_path: str, solution_path: str, options: list[str]) -> list[str]:
+    """MPS ファイルを解いて解を solution_path に書き出す CBC のコマンドライン"""
+    return [
+        cbc_path(),
+        mps_path,
+        *options,
+        "-timeMode",
+        "elapsed",
+        "-branch",
+        "-printingOptions",
+        "all",
+        "-solution",
+        solution_path,
+    ]
+
+
+def run_cbc(
+    mps_path: str, solution_path: str, log_path: str, options: list[str]
+) -> None:
+    """MPS ファイルを CBC で解き、解をファイルへ、ログを log_path へ書き出す"""
+    with open(log_path, "w") as log:
+        subprocess.run(
+            cbc_args(mps_path, solution_path, options),
+            stdout=log,
+            stderr=log,
+            stdin=subprocess.DEVNULL,
+            check=True,
+        )
+
+
+def read_cbc_solution(
+    path: str, num_constraints: int, num_variables: int
+) -> tuple[int, float | None, npt.NDArray[np.float64]]:
+    """
+    CBC の解ファイル (printingOptions all) を読み込む。
+    - 先頭行: ステータスと目的関数値
+    - 続いて制約 num_constraints 行、変数 num_variables 行
+    戻り値: (PuLP互換のステータス, 目的関数値, 変数値の配列)
+    時間制限などで停止した場合は、実行可能解があっても最適性が証明されていないため
+    Not Solved とし、その最良解の目的関数値を返す
+    (ratioGap に達して停止した場合は CBC が Optimal とする)。
+    """
+    with open(path) as f:
+        first_line = f.readline()
+        lines = f.readlines()
+
+    header = first_line.split()
+    status = CBC_STATUS.get(header[0], LpStatusNotSolved)
+    objective = None
+    if "no integer solution" in first_line:
+        # 整数解が見つからないまま停止した (値は LP 緩和の解)
+        status = LpStatusNotSolved
+    elif "objective" in header:
+        objective = float(header[header.index("objective") + 2])
+
+    values = np.full(num_variables, np.nan)
+    for line in lines[num_constraints : num_constraints + num_variables]:
+        fields = line.split()
+        if fields[0] == "**":
+            fields = fields[1:]
+        values[int(fields[0])] = float(fields[2])
+    return status, objective, values
+
+
+def write_cbc_mip_start(
+    path: str, variable_names: list[str], values: npt.NDArray[np.float64]
+) -> None:
+    """CBC の -mips オプションで読み込む初期解ファイルを書き出す"""
+    lines = ["Stopped on time - objective value 0\n"]
+    lines += [
+        f"{i:>7} {name} {v:>15.12g} {0:>23}\n"
+        for i, (name, v) in enumerate(zip(variable_names, values.tolist(), strict=True))
+    ]
+    with open(path, "w") as f:
+        f.writelines(lines)
+
+
+INTEGER_SOLUTION = re.compile(r"Integer solution of (\S+) found.*\(([\d.]+) seconds\)")
+CONTINUOUS_OBJECTIVE = re.compile(r"Continuous objective value is (\S+)")
+MIP_START = re.compile(r"MIPStart provided solution with cost (\S+)")
+SEARCH_PROGRESS = re.compile(
+    r"After (\d+) nodes, \d+ on tree, (\S+) best solution, "
+    r"best possible (\S+) \(([\d.]+) seconds\)"
+)
+SEARCH_FINISHED = re.compile(
+    r"best objective (\S+)(?: \(best possible (\S+)\))?, "
+    r"took \d+ iterations and (\d+) nodes \(([\d.]+) seconds\)"
+)
+RESULT = re.compile(r"^Result - (.*)$")
+OBJECTIVE_VALUE = re.compile(r"^Objective value:\s+(\S+)")
+LOWER_BOUND = re.compile(r"^Lower bound:\s+(\S+)")
+ROOT_CUTS = re.compile(r"At root node, \d+ cuts changed objective from \S+ to (\S+)")
+TOTAL_TIME = re.compile(r"Total time .*\(Wallclock seconds\):\s+(\S+)")
+# CBC は解がない場合に目的関数値として 1e+50 を出力する
+NO_SOLUTION = 1e50
+
+
+@dataclass
+class CbcLogSummary:
+    """CBC のログから読み取った探索の進捗"""
+
+    continuous_objective: float | None = None
+    first_solution_seconds: float | None = None
+    first_solution_objective: float | None = None
+    mip_start_objective: float | None = None
+    best_objective: float | None = None
+    best_bound: float | None = None
+    nodes: int | None = None
+    elapsed_seconds: float | None = None
+    total_seconds: float | None = None
+    result: str | None = None
+
+    @property
+    def gap(self) -> float | None:
+        """相対MIPギャップ (best_objective - best_bound) / |best_objective|"""
+        if self.best_objective is None or self.best_bound is None:
+            return None
+        return abs(self.best_objective - self.best_bound) / max(
+            abs(self.best_objective), 1e-10
+        )
+
+    @property
+    def root_gap(self) -> float | None:
+        """LP 緩和 (カット前) と最良解の相対ギャップ"""
+        if self.best_objective is None or self.continuous_objective is None:
+            return None
+        return abs(self.best_objective - self.continuous_objective) / max(
+            abs(self.best_objective), 1e-10
+        )
+
+    def update(self, line: str) -> bool:
+        """ログ1行を反映する。進捗 (解・下界) が更新された場合は True を返す"""
+        if match := INTEGER_SOLUTION.search(line):
+            objective, seconds = float(match[1]), float(match[2])
+            if self.first_solution_seconds is None:
+                self.first_solution_seconds = seconds
+                self.first_solution_objective = objective
+            self.best_objective = objective
+            self.elapsed_seconds = seconds
+            return True
+        if match := ROOT_CUTS.search(line):
+            self.best_bound = float(match[1])
+            return True
+        if match := CONTINUOUS_OBJECTIVE.search(line):
+            self.continuous_objective = float(match[1])
+            return True
+        if match := MIP_START.search(line):
+            self.mip_start_objective = float(match[1])
+            return False
+        if match := SEARCH_PROGRESS.search(line):
+            self.nodes = int(match[1])
+            self._set_objective(float(match[2]))
+            self.best_bound = float(match[3])
+            self.elapsed_seconds = float(match[4])
+            return True
+        if match := SEARCH_FINISHED.search(line):
+            self._set_objective(float(match[1]))
+            if match[2] is not None:
+                self.best_bound = float(match[2])
+            self.nodes = int(match[3])
+            self.elapsed_seconds = float(match[4])
+            return True
+        if match := RESULT.search(line):
+            self.result = match[1].strip()
+            if self.result.startswith("Optimal"):
+                self.best_bound = self.best_objective
+            return False
+        if match := OBJECTIVE_VALUE.search(line):
+            self._set_objective(float(match[1]))
+            if self.result is not None and self.result.startswith("Optimal"):
+                self.best_bound = self.best_objective
+            return False
+        if match := LOWER_BOUND.search(line):
+            self.best_bound = float(match[1])
+            return False
+        if match := TOTAL_TIME.search(line):
+            self.total_seconds = float(match[1])
+        return False
+
+    def _set_objective(self, objective: float) -> None:
+        if objective < NO_SOLUTION:
+            self.best_objective = objective
+
+
+def parse_cbc_log(path: str) -> CbcLogSummary:
+    summary = CbcLogSummary()
+    with open(path) as f:
+        for line in f:
+            summary.update(line)
+    return summary
+
+
+def streaming_available() -> bool:
+    """run_cbc_streaming が使えるか (擬似端末は Unix 系の OS でしか使えない)"""
+    try:
+        import pty  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def run_cbc_streaming(
+    mps_path: str,
+    solution_path: str,
+    log_path: str,
+    options: list[str],
+    on_poll: Callable[[CbcLogSummary, bool], bool],
+    poll_seconds: float = 0.2,
+) -> CbcLogSummary:
+    """
+    run_cbc と同じく CBC で解きながら、ログを1行ずつ CbcLogSummary に反映する。
+    - CBC はファイルやパイプへの出力をバッファするため、擬似端末に出力させて読み、
+      log_path にも書き写す
+    - on_poll(summary, updated) はログを読むたびと poll_seconds ごとに呼ぶ
+      (updated は解・下界が更新されたか)。True を返したら CBC に SIGINT を送る。
+      CBC は次に割り込みを確かめた時点で探索を打ち切り、それまでの最良解を
+      解ファイルに書き出す
+    """
+    # pty は Windows にない termios に依存するため、ここで読み込む
+    import pty
+    import select
+    import signal
+
+    summary = CbcLogSummary()
+    master, slave = pty.openpty()
+    try:
+        process = subprocess.Popen(
+            cbc_args(mps_path, solution_path, options),
+            stdout=slave,
+            stderr=slave,
+            stdin=subprocess.DEVNULL,
+        )
+    finally:
+        os.close(slave)
+    interrupted = False
+    pending = b""
+    with open(log_path, "w") as log:
+        try:
+            while True:
+                ready, _, _ = select.select([master], [], [], poll_seconds)
+                updated = False
+                if ready:
+                    try:
+                        data = os.read(master, 65536)
+                    except OSError:
+                        # CBC が終了して擬似端末が閉じられた
+                        data = b""
+                    if not data:
+                        break
+                    *lines, pending = (pending + data).split(b"\n")
+                    for raw in lines:
+                        line = raw.decode(errors="replace").rstrip("\r")
+                        log.write(line + "\n")
+                        updated |= summary.update(line)
+                if not interrupted and on_poll(summary, updated):
+                    process.send_signal(signal.SIGINT)
+                    interrupted = True
+            if pending:
+                line = pending.decode(errors="replace").rstrip("\r")
+                log.write(line + "\n")
+                summary.update(line)
+        except BaseException:
+            process.kill()
+            raise
+        finally:
+            os.close(master)
+            returncode = process.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, process.args)
+    return summary
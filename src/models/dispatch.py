@@ -0,0 +1,247 @@
+import os
+
+import numpy as np
+import numpy.typing as npt
+from pulp import LpStatusOptimal
+
+from src.logic.warm_start import complete_schedule
+from src.models.matrix_builder import INTEGER_KINDS, MatrixBuilder, MatrixModel
+from src.models.solver import Solver
+from src.schemas.input_arrays import InputArrays
+
+FloatArray = npt.NDArray[np.float64]
+
+
+def solve_dispatch(
+    input_arrays: InputArrays, operation: FloatArray, output_dir: str
+) -> Solver | None:
+    """
+    稼働状態 (T, P) から全期間の実行可能解を作る。
+    enforce_min_times と commit_for_demand で最低稼働・停止期間と各期の供給力を
+    満たすよう稼働させる期を追加し、稼働状態を固定して出力だけを LP で決める
+    (経済負荷配分)。解いた経済負荷配分のソルバーを返し、全台稼働しても
+    需要を満たせない期がある場合は None を返す。
+    """
+    operation = commit_for_demand(
+        input_arrays, enforce_min_times(input_arrays, operation)
+    )
+    envelope = output_envelope(input_arrays, operation)
+    if (envelope.sum(axis=1) < input_arrays.demands).any():
+        return None
+    os.makedirs(output_dir, exist_ok=True)
+    solver = Solver(input_arrays, builder="matrix")
+    solver.matrix_model = build_dispatch_model(input_arrays, operation, envelope)
+    solver.solve(output_dir)
+    if solver.status != LpStatusOptimal or solver.objective_value is None:
+        return None
+    return solver
+
+
+def build_dispatch_model(
+    input_arrays: InputArrays, operation: FloatArray, envelope: FloatArray
+) -> MatrixModel:
+    """
+    稼働状態を固定した経済負荷配分の LP。
+    変数の並びは build_matrix_model と同じで、稼働・起動・停止は上下限で固定する。
+    出力の上下限を 最小出力 〜 output_envelope とすることで、起動・停止時の
+    ランプ制約と最低稼働・停止期間の制約は不要になり、需要とランプの制約だけが残る。
+    """
+    num_timeseries, num_units = operation.shape
+    builder = MatrixBuilder(num_timeseries, num_units)
+    all_t = np.arange(num_timeseries)
+    all_p = np.arange(num_units)
+    demand_rows = builder.add_rows(
+        builder.index("output", all_t[:, None], all_p[None, :]),
+        1.0,
+        "G",
+        input_arrays.demands,
+    )
+    lt, lp = (a.ravel() for a in np.meshgrid(all_t[1:], all_p, indexing="ij"))
+    ramp_cols = np.stack(
+        [builder.index("output", lt, lp), builder.index("output", lt - 1, lp)],
+        axis=1,
+    )
+    builder.add_rows(ramp_cols, np.array([1.0, -1.0]), "L", input_arrays.ramp_ups[lp])
+    builder.add_rows(ramp_cols, np.array([-1.0, 1.0]), "L", input_arrays.ramp_downs[lp])
+
+    schedule = complete_schedule(operation, np.zeros_like(operation))
+    fixed = np.concatenate([schedule[kind].ravel() for kind in INTEGER_KINDS])
+    objective = np.concatenate(
+        [
+            np.zeros(operation.size),
+            np.tile(input_arrays.cost_starts, num_timeseries),
+            np.tile(input_arrays.cost_stops, num_timeseries),
+            np.tile(input_arrays.cost_runs, num_timeseries),
+        ]
+    ).astype(np.float64)
+    lower_bounds = np.concatenate([fixed, (operation * input_arrays.pmins).ravel()])
+    upper_bounds = np.concatenate([fixed, envelope.ravel()])
+    return builder.build(
+        objective,
+        lower_bounds,
+        upper_bounds,
+        np.zeros(len(objective), dtype=np.bool_),
+        demand_rows,
+    )
+
+
+def commit_for_demand(input_arrays: InputArrays, operation: FloatArray) -> FloatArray:
+    """
+    各期の供給力 (output_envelope の合計) が需要を下回る場合、
+    運転コストの安い発電機から追加で稼働させる。
+    停止中の区間を埋めるか、前後に最低停止期間を空けて最低稼働期間だけ稼働させるため、
+    各発電機の最低稼働・停止期間は満たしたままになる。
+    """
+    operation = np.rint(operation)
+    num_timeseries = len(operation)
+    order = np.argsort(input_arrays.cost_runs, kind="stable")
+    # ランプ幅が最小出力に届かない発電機は起動・停止できない
+    switchable = (input_arrays.ramp_ups >= input_arrays.pmins) & (
+        input_arrays.ramp_downs >= input_arrays.pmins
+    )
+    envelope = output_envelope(input_arrays, operation)
+
+    for t in range(num_timeseries):
+        while envelope[t].sum() < input_arrays.demands[t]:
+            for p in order:
+                if operation[t, p] == 0:
+                    break
+            else:
+                # 全台稼働していても起動直後・停止直前のランプで出力を上げられない
+                # 発電機があれば、隣の停止区間を埋めて稼働区間を延ばす
+                extendable = ramp_limited_run(
+                    input_arrays, operation, envelope, t, order
+                )
+                if extendable is None:
+                    # 全台稼働しても足りない期はそのままにする
+                    break
+                p, head, tail = extendable
+                operation[head : tail + 1, p] = 1.0
+                envelope[:, p] = output_envelope(
+                    input_arrays.select_units([int(p)]), operation[:, [p]]
+                )[:, 0]
+                continue
+            # 停止区間 [head, tail] のうち稼働させる範囲を決める
+            # (起動・停止できない発電機は停止区間全体を稼働させる)
+            head, tail = off_interval(operation[:, p], t)
+            min_up = int(input_arrays.min_operation_times[p])
+            min_down = int(input_arrays.min_down_times[p])
+            if switchable[p]:
+                if head > 0 and tail < num_timeseries - 1:
+                    if head + min_down < t and t + min_up < tail - min_down:
+                        head, tail = t, t + min_up
+                elif head > 0:
+                    tail = t
+                elif tail < num_timeseries - 1:
+                    head = t
+                else:
+                    head, tail = t, min(t + min_up, num_timeseries - 1)
+            operation[head : tail + 1, p] = 1.0
+            envelope[:, p] = output_envelope(
+                input_arrays.select_units([int(p)]), operation[:, [p]]
+            )[:, 0]
+    return operation
+
+
+def ramp_limited_run(
+    input_arrays: InputArrays,
+    operation: FloatArray,
+    envelope: FloatArray,
+    t: int,
+    order: npt.NDArray[np.int64],
+) -> tuple[int, int, int] | None:
+    """
+    期 t に稼働中で、起動・停止のランプにより最大出力を出せない発電機を order の
+    順に探し、(発電機, 埋める停止区間の先頭, 末尾) を返す。
+    稼働区間の前に停止区間があればそれを、なければ後ろの停止区間を埋める。
+    """
+    for p in order:
+        if envelope[t, p] >= input_arrays.pmaxs[p]:
+            continue
+        off = np.flatnonzero(operation[:, p] == 0)
+        before = off[off < t]
+        after = off[off > t]
+        if len(before):
+            return int(p), *off_interval(operation[:, p], int(before[-1]))
+        if len(after):
+            return int(p), *off_interval(operation[:, p], int(after[0]))
+    return None
+
+
+def enforce_min_times(input_arrays: InputArrays, operation: FloatArray) -> FloatArray:
+    """
+    最低稼働・停止期間の制約 (Solver と同じく、窓が期間内に収まる期からのみ課す)
+    を満たすよう、稼働させる期を追加する。発電機ごとに稼働区間を先頭から調べ、
+    - 起動から α 期以内に停止している場合は、稼働区間を延ばす
+    - 停止から β 期以内に起動している場合や、α 期以内に2回起動・β 期以内に
+      2回停止している場合は、間の停止区間を埋めて2つの稼働区間をつなげる
+    """
+    operation = np.rint(operation)
+    num_timeseries = len(operation)
+    last = num_timeseries - 1
+    for p in range(operation.shape[1]):
+        column = operation[:, p]
+        min_up = int(input_arrays.min_operation_times[p])
+        min_down = int(input_arrays.min_down_times[p])
+        changed = True
+        while changed:
+            changed = False
+            heads, tails = on_intervals(column)
+            for k, (head, tail) in enumerate(zip(heads, tails, strict=True)):
+                end = min(head + min_up, last)
+                if head > 0 and tail < end and max(tail + 1, min_up) <= end:
+                    column[tail + 1 : end + 1] = 1.0
+                    changed = True
+                    break
+                if k + 1 == len(heads):
+                    break
+                stop, next_head, next_tail = tail + 1, heads[k + 1], tails[k + 1]
+                if (
+                    max(next_head, min_down) <= min(next_tail, stop + min_down)
+                    or (head > 0 and min_up <= last and next_head <= head + min_up)
+                    or (
+                        min_down <= last
+                        and next_tail < last
+                        and next_tail + 1 <= stop + min_down
+                    )
+                ):
+                    column[stop:next_head] = 1.0
+                    changed = True
+                    break
+    return operation
+
+
+def on_intervals(operation: FloatArray) -> tuple[list[int], list[int]]:
+    """1台分の稼働状態の、連続した稼働区間の先頭と末尾"""
+    padded = np.concatenate(([0.0], operation, [0.0]))
+    change = np.diff(padded)
+    heads = np.flatnonzero(change > 0)
+    tails = np.flatnonzero(change < 0) - 1
+    return heads.tolist(), tails.tolist()
+
+
+def output_envelope(input_arrays: InputArrays, operation: FloatArray) -> FloatArray:
+    """
+    稼働状態 (T, P) を固定したとき、ランプ制約のもとで各期に出せる最大出力。
+    前向きに起動時とランプアップの上限を、後ろ向きに停止前とランプダウンの上限を
+    適用する (ランプ制約は差の制約なので、両方向の上限を同時に満たす解がある)。
+    """
+    pmaxs = input_arrays.pmaxs
+    ramp_ups = input_arrays.ramp_ups
+    ramp_downs = input_arrays.ramp_downs
+    envelope = np.where(operation > 0, pmaxs, 0.0)
+    for t in range(1, len(envelope)):
+        envelope[t] = np.minimum(envelope[t], envelope[t - 1] + ramp_ups)
+    for t in range(len(envelope) - 2, -1, -1):
+        envelope[t] = np.minimum(envelope[t], envelope[t + 1] + ramp_downs)
+    return envelope
+
+
+def off_interval(operation: FloatArray, t: int) -> tuple[int, int]:
+    """停止中の期 t を含む、連続した停止区間の先頭と末尾"""
+    running = np.flatnonzero(operation)
+    before = running[running < t]
+    after = running[running > t]
+    head = int(before[-1]) + 1 if len(before) else 0
+    tail = int(after[0]) - 1 if len(after) else len(operation) - 1
+    return head, tail
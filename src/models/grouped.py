@@ -0,0 +1,131 @@
+import os
+import time
+
+import numpy as np
+import numpy.typing as npt
+from pulp import LpProblem, LpStatusNotSolved, LpStatusOptimal
+
+from src.logic.unit_groups import (
+    disaggregate_operation,
+    group_input_arrays,
+    group_schedule,
+    identical_unit_groups,
+)
+from src.models.dispatch import solve_dispatch
+from src.models.matrix_builder import MatrixModel
+from src.models.solver import Solver
+from src.schemas.data_schema import GroupingReport, InputData, SolverOptions
+from src.schemas.input_arrays import InputArrays
+
+
+class GroupedSolver(Solver):
+    """
+    パラメータが同じ発電機をまとめ、グループごとの台数で解くソルバー。
+    - identical_unit_groups で発電機をグループに分け、各グループの
+      稼働・起動・停止台数を整数変数とするモデル (Solver の unit_counts) を解く
+      (同じ発電機の入れ替えだけが異なる解を CBC が別々に探索しなくて済む)
+    - disaggregate_operation で台数を発電機ごとの稼働状態に割り当て、
+      solve_dispatch で発電機ごとの出力を決め直す
+    解は発電機ごとに持つため、後処理は一括求解と同じ。
+    台数のモデルは発電機ごとのモデルの緩和なので、その目的関数値
+    (grouped_objective) は最適値の下界になる。
+    """
+
+    def __init__(
+        self,
+        input_data: InputData | InputArrays,
+        builder: str = "pulp",
+        formulation: str = "basic",
+        options: SolverOptions | None = None,
+    ):
+        super().__init__(
+            input_data, builder=builder, formulation=formulation, options=options
+        )
+        self.groups = identical_unit_groups(self.input_arrays)
+        group_arrays, unit_counts = group_input_arrays(self.input_arrays, self.groups)
+        self.reduced = Solver(
+            group_arrays,
+            builder=builder,
+            formulation=formulation,
+            options=self.options,
+            unit_counts=unit_counts,
+        )
+
+    def build_model(self) -> None:
+        self.reduced.build_model()
+
+    def model_size(self) -> dict[str, int]:
+        return {"num_groups": len(self.groups), **self.reduced.model_size()}
+
+    def solve(
+        self,
+        output_dir: str,
+        threads: int | None = None,
+        warm_start: dict[str, npt.NDArray[np.float64]] | None = None,
+    ) -> LpProblem | MatrixModel:
+        grouping_dir = os.path.join(output_dir, "grouping")
+        grouped_dir = os.path.join(grouping_dir, "grouped")
+        os.makedirs(grouped_dir, exist_ok=True)
+        grouped_warm_start = None
+        if warm_start is not None:
+            grouped_warm_start = group_schedule(warm_start, self.groups)
+        self.reduced.solve(grouped_dir, threads, grouped_warm_start)
+        if not self.reduced.has_solution:
+            raise ValueError("台数のモデルで解が得られませんでした")
+        self.grouped_objective = float(self.reduced.objective_value)
+
+        operation = disaggregate_operation(
+            self.reduced.get_variable_values()["operation"],
+            self.groups,
+            self.num_units,
+        )
+        dispatch = solve_dispatch(
+            self.input_arrays, operation, os.path.join(grouping_dir, "dispatch")
+        )
+        if dispatch is None:
+            raise ValueError(
+                "台数のモデルの解から発電機ごとの実行可能解を作れませんでした"
+            )
+        self.matrix_model = dispatch.matrix_model
+        self._variable_values = dispatch.get_variable_values()
+        self.status = LpStatusNotSolved
+        self.approximate = True
+        self.objective_value = float(dispatch.objective_value)
+        return self.matrix_model
+
+
+def evaluate_grouping(
+    input_data: InputData | InputArrays,
+    output_dir: str,
+    builder: str = "pulp",
+    formulation: str = "basic",
+) -> GroupingReport:
+    """同じ入力を発電機ごとのモデルと台数のモデルで解き、コストと求解時間を比較する"""
+    full_dir = os.path.join(output_dir, "full")
+    os.makedirs(full_dir, exist_ok=True)
+    start = time.perf_counter()
+    full = Solver(input_data, builder=builder, formulation=formulation)
+    full.build_model()
+    full.solve(full_dir)
+    full_seconds = time.perf_counter() - start
+    if full.status != LpStatusOptimal or full.objective_value is None:
+        raise ValueError("発電機ごとのモデルで最適解が得られませんでした")
+
+    start = time.perf_counter()
+    grouped = GroupedSolver(input_data, builder=builder, formulation=formulation)
+    grouped.build_model()
+    grouped.solve(output_dir)
+    grouped_seconds = time.perf_counter() - start
+
+    full_cost = float(full.objective_value)
+    grouped_cost = float(grouped.objective_value)
+    return GroupingReport(
+        num_units=grouped.num_units,
+        num_groups=len(grouped.groups),
+        grouped_objective=grouped.grouped_objective,
+        grouped_cost=grouped_cost,
+        full_cost=full_cost,
+        cost_gap=(grouped_cost - full_cost) / abs(full_cost),
+        grouped_seconds=grouped_seconds,
+        full_seconds=full_seconds,
+    )
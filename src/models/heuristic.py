@@ -0,0 +1,208 @@
+import os
+import time
+
+import numpy as np
+import numpy.typing as npt
+from pulp import (
+    LpProblem,
+    LpStatus,
+    LpStatusInfeasible,
+    LpStatusNotSolved,
+    LpStatusOptimal,
+)
+
+from src.logic.warm_start import complete_schedule
+from src.models.dispatch import (
+    commit_for_demand,
+    enforce_min_times,
+    on_intervals,
+    output_envelope,
+)
+from src.models.matrix_builder import MatrixModel
+from src.models.solver import Solver
+from src.schemas.data_schema import HeuristicReport, InputData, SolveResult
+from src.schemas.input_arrays import InputArrays
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+
+class HeuristicSolver(Solver):
+    """
+    優先順位法で起動停止計画を立てるソルバー (CBC を使わない近似解法)。
+    - 最大出力時の平均コストの安い順に、各期の需要を賄うまで発電機を起動する
+    - 起動・停止コストより最小出力で運転し続ける方が安い停止区間は埋める
+    - enforce_min_times・commit_for_demand で最低稼働・停止期間とランプを考慮した
+      供給力を満たすよう修復し、economic_dispatch で出力を決める
+    最適性の保証はないため、実行可能解が得られた場合は status を Not Solved のまま
+    approximate を True とする (全台稼働しても需要を満たせない期がある場合は
+    Infeasible)。
+    初期状態には対応しない。
+    """
+
+    def build_model(self) -> None:
+        if self.initial_states is not None:
+            raise ValueError("優先順位法では initial_states を指定できません")
+        # 数理モデルは作らず、空のモデルを置いておく
+        self.model = LpProblem("heuristic")
+
+    def model_size(self) -> dict[str, int]:
+        return {}
+
+    def solve(
+        self,
+        output_dir: str,
+        threads: int | None = None,
+        warm_start: dict[str, npt.NDArray[np.float64]] | None = None,
+    ) -> LpProblem | MatrixModel:
+        start = time.perf_counter()
+        input_arrays = self.input_arrays
+        operation = priority_list_commitment(input_arrays)
+        operation = bridge_short_outages(input_arrays, operation)
+        operation = commit_for_demand(
+            input_arrays, enforce_min_times(input_arrays, operation)
+        )
+        envelope = output_envelope(input_arrays, operation)
+        if (envelope.sum(axis=1) < input_arrays.demands).any():
+            self.status = LpStatusInfeasible
+            self.objective_value = None
+            self._variable_values = None
+            self.approximate = False
+        else:
+            output = economic_dispatch(input_arrays, operation, envelope)
+            schedule = complete_schedule(operation, output)
+            self.set_solution(
+                schedule, LpStatusNotSolved, schedule_cost(input_arrays, schedule)
+            )
+            self.approximate = True
+        self.solve_result = SolveResult(
+            backend="heuristic",
+            status=LpStatus[self.status],
+            objective_value=self.objective_value,
+            runtime_seconds=time.perf_counter() - start,
+        )
+        return self.model
+
+
+def priority_order(input_arrays: InputArrays) -> IntArray:
+    """
+    最大出力で最低稼働期間だけ運転したときの 1MW あたりの平均コスト
+    (運転コストに起動・停止コストを按分したもの) の安い順に並べた発電機の番号
+    """
+    periods = np.maximum(input_arrays.min_operation_times, 1)
+    average_costs = input_arrays.cost_runs + (
+        input_arrays.cost_starts + input_arrays.cost_stops
+    ) / np.maximum(input_arrays.pmaxs * periods, 1e-9)
+    return np.argsort(average_costs, kind="stable")
+
+
+def priority_list_commitment(input_arrays: InputArrays) -> FloatArray:
+    """
+    priority_order の順に、各期の最大出力の合計が需要を上回るまで起動する。
+    ランプ幅が最小出力に届かない発電機は期間内に起動・停止できないため、
+    一度でも起動する場合は全期間稼働させる。
+    """
+    order = priority_order(input_arrays)
+    cumulative_pmax = np.cumsum(input_arrays.pmaxs[order])
+    num_committed = np.minimum(
+        np.searchsorted(cumulative_pmax, input_arrays.demands, side="left") + 1,
+        len(order),
+    )
+    operation = np.zeros((input_arrays.num_timeseries, input_arrays.num_units))
+    operation[:, order] = np.arange(len(order))[None, :] < num_committed[:, None]
+    switchable = (input_arrays.ramp_ups >= input_arrays.pmins) & (
+        input_arrays.ramp_downs >= input_arrays.pmins
+    )
+    always_on = ~switchable & operation.any(axis=0)
+    operation[:, always_on] = 1.0
+    return operation
+
+
+def bridge_short_outages(
+    input_arrays: InputArrays, operation: FloatArray
+) -> FloatArray:
+    """
+    稼働区間に挟まれた停止区間のうち、最小出力で運転し続けるコストが
+    停止・再起動のコストを下回るものを稼働に変える
+    """
+    operation = operation.copy()
+    keep_running = input_arrays.cost_runs * input_arrays.pmins
+    restart = input_arrays.cost_starts + input_arrays.cost_stops
+    for p in range(operation.shape[1]):
+        heads, tails = on_intervals(operation[:, p])
+        for tail, next_head in zip(tails[:-1], heads[1:], strict=True):
+            if keep_running[p] * (next_head - tail - 1) < restart[p]:
+                operation[tail + 1 : next_head, p] = 1.0
+    return operation
+
+
+def economic_dispatch(
+    input_arrays: InputArrays, operation: FloatArray, envelope: FloatArray
+) -> FloatArray:
+    """
+    稼働状態を固定して出力を決める。
+    - 各期、稼働中の発電機を最小出力で運転し、残りの需要を運転コストの安い順に
+      output_envelope まで割り当てる (全期間をまとめて計算する)
+    - ランプ制約を満たさない箇所は出力を上げて解消する。後ろ向きに前期の出力を
+      「当期 - ランプアップ」以上に、前向きに当期の出力を「前期 - ランプダウン」
+      以上に上げる。envelope 自体がランプ制約を満たすため envelope は超えない
+    供給力 (envelope の合計) が需要以上であれば、各期の需要を満たす。
+    """
+    order = np.argsort(input_arrays.cost_runs, kind="stable")
+    lower = (operation * input_arrays.pmins)[:, order]
+    headroom = np.maximum(envelope[:, order] - lower, 0.0)
+    remaining = np.maximum(input_arrays.demands - lower.sum(axis=1), 0.0)
+    filled_before = np.cumsum(headroom, axis=1) - headroom
+    extra = np.clip(remaining[:, None] - filled_before, 0.0, headroom)
+    output = np.zeros_like(lower)
+    output[:, order] = lower + extra
+
+    for t in range(len(output) - 1, 0, -1):
+        np.maximum(output[t - 1], output[t] - input_arrays.ramp_ups, out=output[t - 1])
+    for t in range(1, len(output)):
+        np.maximum(output[t], output[t - 1] - input_arrays.ramp_downs, out=output[t])
+    return output
+
+
+def schedule_cost(input_arrays: InputArrays, schedule: dict[str, FloatArray]) -> float:
+    """スケジュールの総コスト (Solver の目的関数と同じ)"""
+    return float(
+        (schedule["output"] @ input_arrays.cost_runs).sum()
+        + (schedule["start"] @ input_arrays.cost_starts).sum()
+        + (schedule["stop"] @ input_arrays.cost_stops).sum()
+    )
+
+
+def evaluate_heuristic(
+    input_data: InputData | InputArrays,
+    output_dir: str,
+    builder: str = "pulp",
+    formulation: str = "basic",
+) -> HeuristicReport:
+    """同じ入力を MILP と優先順位法で解き、コスト差と求解時間を比較する"""
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    milp = Solver(input_data, builder=builder, formulation=formulation)
+    milp.build_model()
+    milp.solve(output_dir)
+    milp_seconds = time.perf_counter() - start
+    if milp.status != LpStatusOptimal or milp.objective_value is None:
+        raise ValueError("MILP で最適解が得られませんでした")
+
+    start = time.perf_counter()
+    heuristic = HeuristicSolver(input_data)
+    heuristic.build_model()
+    heuristic.solve(output_dir)
+    heuristic_seconds = time.perf_counter() - start
+    if not heuristic.approximate or heuristic.objective_value is None:
+        raise ValueError("優先順位法で実行可能解が得られませんでした")
+
+    milp_cost = float(milp.objective_value)
+    heuristic_cost = float(heuristic.objective_value)
+    return HeuristicReport(
+        heuristic_cost=heuristic_cost,
+        milp_cost=milp_cost,
+        cost_gap=(heuristic_cost - milp_cost) / abs(milp_cost),
+        heuristic_seconds=heuristic_seconds,
+        milp_seconds=milp_seconds,
+    )
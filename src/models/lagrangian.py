@@ -0,0 +1,211 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pulp import LpProblem, LpStatusNotSolved, LpStatusOptimal
+
+from src.logic.warm_start import merit_order_schedule
+from src.models.dispatch import solve_dispatch
+from src.models.matrix_builder import VARIABLE_KINDS, MatrixModel
+from src.models.solver import Solver
+from src.schemas.data_schema import InputData
+from src.schemas.input_arrays import InputArrays
+
+FloatArray = npt.NDArray[np.float64]
+
+
+def solve_unit_subproblem(
+    unit_arrays: InputArrays, prices: FloatArray, formulation: str = "tight"
+) -> tuple[dict[str, FloatArray], float]:
+    """
+    1台分の部分問題を formulation の定式化で構築し、CBC で解く。
+    需要制約を外し、出力の係数を cost_run - prices とした単機の起動停止問題。
+    最適値は定式化によらないが、tight の方が分枝が少ない。
+    戻り値: (変数種別ごとの長さ T の配列, 目的関数値)
+    """
+    num_timeseries = unit_arrays.num_timeseries
+    if (prices <= unit_arrays.cost_runs[0]).all():
+        # 出力するほど損になるため停止し続けるのが最適
+        # (CBC は前処理で空になるこのモデルを解くと異常終了することがある)
+        return {kind: np.zeros(num_timeseries) for kind in VARIABLE_KINDS}, 0.0
+    solver = Solver(
+        replace(unit_arrays, demands=np.zeros(num_timeseries), _input_data=None),
+        builder="matrix",
+        formulation=formulation,
+    )
+    solver.build_model()
+    objective = solver.matrix_model.objective.copy()
+    offset = VARIABLE_KINDS.index("output") * num_timeseries
+    objective[offset : offset + num_timeseries] -= prices
+    solver.matrix_model = replace(solver.matrix_model, objective=objective)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        solver.solve(tmp_dir, threads=1)
+    if solver.status != LpStatusOptimal or solver.objective_value is None:
+        raise ValueError(
+            f"発電機 {unit_arrays.generator_ids[0]} の部分問題が解けませんでした"
+        )
+    values = solver.get_variable_values()
+    return {kind: values[kind][:, 0] for kind in VARIABLE_KINDS}, float(
+        solver.objective_value
+    )
+
+
+class LagrangianSolver(Solver):
+    """
+    需要制約をラグランジュ緩和し、発電機ごとの部分問題に分解して解くソルバー。
+    - 各期の乗数 (価格) のもとで、単機の起動停止問題 (formulation の定式化) を
+      プロセスプールで並列に解く
+    - 需要の過不足を劣勾配として、Polyak のステップ幅で乗数を更新する
+    - repair_interval 反復ごとに、部分問題の稼働状態を需要を満たすよう修復し、
+      経済負荷配分を行って実行可能解を作る (solve_dispatch を参照)
+    - 下界 (双対関数値) と最良の実行可能解の相対ギャップが tolerance 以下になるか、
+      max_iterations 回に達したら終了し、最良の実行可能解を解とする
+    最適性は保証されないため、実行可能解が得られた場合も status は Not Solved のまま
+    approximate を True とし、下界とギャップを lower_bound / gap に残す。
+    """
+
+    def __init__(
+        self,
+        input_data: InputData | InputArrays,
+        max_iterations: int = 30,
+        tolerance: float = 0.005,
+        repair_interval: int = 1,
+        step_scale: float = 1.0,
+        formulation: str = "basic",
+    ):
+        if max_iterations < 1:
+            raise ValueError("max_iterations は1以上である必要があります")
+        if repair_interval < 1:
+            raise ValueError("repair_interval は1以上である必要があります")
+        super().__init__(input_data, builder="matrix", formulation=formulation)
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.repair_interval = repair_interval
+        self.step_scale = step_scale
+
+    def build_model(self) -> None:
+        # 部分問題と経済負荷配分のモデルは solve の中で構築する
+        pass
+
+    def model_size(self) -> dict[str, int]:
+        return {"num_subproblems": self.num_units}
+
+    def initial_prices(self) -> FloatArray:
+        """メリットオーダーで各期に起動する発電機のうち、最も高い運転コスト"""
+        schedule = merit_order_schedule(self.input_arrays)
+        return np.where(
+            schedule["operation"] > 0, self.input_arrays.cost_runs, 0.0
+        ).max(axis=1)
+
+    def solve(
+        self,
+        output_dir: str,
+        threads: int | None = None,
+        warm_start: dict[str, npt.NDArray[np.float64]] | None = None,
+    ) -> LpProblem | MatrixModel:
+        """
+        threads: 部分問題を並列に解くプロセス数 (None の場合は CPU 数)
+        warm_start: 指定した場合は、その稼働状態を修復した解を最初の実行可能解とする
+        """
+        units = [self.input_arrays.select_units([p]) for p in range(self.num_units)]
+        demands = self.input_arrays.demands
+        prices = self.initial_prices()
+        step_scale = self.step_scale
+        lagrangian_dir = os.path.join(output_dir, "lagrangian")
+
+        self.lower_bound = -np.inf
+        upper_bound = np.inf
+        best: Solver | None = None
+        self.history: list[dict[str, Any]] = []
+        stalled = 0
+        if warm_start is not None:
+            repaired = solve_dispatch(
+                self.input_arrays,
+                warm_start["operation"],
+                os.path.join(lagrangian_dir, "warm_start"),
+            )
+            if repaired is not None:
+                best, upper_bound = repaired, float(repaired.objective_value)
+        with ProcessPoolExecutor(max_workers=threads) as executor:
+            for k in range(self.max_iterations):
+                results = list(
+                    executor.map(
+                        solve_unit_subproblem,
+                        units,
+                        [prices] * self.num_units,
+                        [self.formulation] * self.num_units,
+                    )
+                )
+                unit_values = {
+                    kind: np.column_stack([values[kind] for values, _ in results])
+                    for kind in VARIABLE_KINDS
+                }
+                dual = sum(objective for _, objective in results) + float(
+                    prices @ demands
+                )
+                # 下界が更新されない反復が続いたらステップ幅を半分にする
+                if dual > self.lower_bound:
+                    self.lower_bound = dual
+                    stalled = 0
+                else:
+                    stalled += 1
+                    if stalled >= 3:
+                        step_scale /= 2
+                        stalled = 0
+
+                subgradient = demands - unit_values["output"].sum(axis=1)
+                norm = float(subgradient @ subgradient)
+                if (
+                    k % self.repair_interval == 0
+                    or k == self.max_iterations - 1
+                    or norm == 0
+                ):
+                    repaired = solve_dispatch(
+                        self.input_arrays,
+                        unit_values["operation"],
+                        os.path.join(lagrangian_dir, f"repair_{k:03d}"),
+                    )
+                    if repaired is not None and repaired.objective_value < upper_bound:
+                        best, upper_bound = repaired, float(repaired.objective_value)
+
+                gap = (upper_bound - self.lower_bound) / abs(upper_bound)
+                self.history.append(
+                    {
+                        "iteration": k,
+                        "dual_value": dual,
+                        "lower_bound": self.lower_bound,
+                        "upper_bound": upper_bound,
+                        "gap": gap,
+                        "shortage": float(np.maximum(subgradient, 0.0).max()),
+                        "step_scale": step_scale,
+                    }
+                )
+                if gap <= self.tolerance or norm == 0:
+                    break
+
+                # 実行可能解がまだない場合は下界の少し上を目標値とする
+                target = (
+                    upper_bound if np.isfinite(upper_bound) else dual + 0.05 * abs(dual)
+                )
+                step = step_scale * max(target - dual, 0.0) / norm
+                prices = np.maximum(prices + step * subgradient, 0.0)
+
+        os.makedirs(lagrangian_dir, exist_ok=True)
+        pd.DataFrame(self.history).to_csv(
+            os.path.join(lagrangian_dir, "history.csv"), index=False
+        )
+        if best is None:
+            raise ValueError("ラグランジュ緩和で実行可能解が得られませんでした")
+        self.iterations = len(self.history)
+        self.gap = self.history[-1]["gap"]
+        self.matrix_model = best.matrix_model
+        self._variable_values = best.get_variable_values()
+        self.status = LpStatusNotSolved
+        self.approximate = True
+        self.objective_value = upper_bound
+        return self.matrix_model
@@ -0,0 +1,644 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import numpy.typing as npt
+
+from src.schemas.data_schema import UnitInitialState
+from src.schemas.input_arrays import InputArrays
+
+VARIABLE_KINDS = ("operation", "start", "stop", "output")
+INTEGER_KINDS = ("operation", "start", "stop")
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+
+@dataclass
+class MatrixModel:
+    """
+    Solverと同一の定式化を疎行列 (COO形式) で保持するモデル。
+    - 変数は VARIABLE_KINDS の順に (t, p) で並べる
+    - 制約は 行インデックス / 列インデックス / 係数 の3配列で保持する
+    - demand_rows は各期の需要制約の行インデックス (右辺を差し替える際に使う)
+    - drop_fixed_variables で固定された変数を除いた場合、columns は残した列の
+      元のインデックス、fixed_values は元の全変数の値 (除いた変数の固定値)、
+      objective_offset は除いた変数の目的関数値になる
+    - shortfall が True の場合、VARIABLE_KINDS の後ろに各期の需要の不足量の
+      変数を並べる (Solver の shortfall_penalty を参照)
+    - num_scenarios が2以上の場合、その後ろに2番目以降のシナリオの出力の変数を
+      シナリオごとに (t, p) で並べる (稼働・起動・停止は全シナリオで共通。
+      StochasticSolver の build_extensive_form を参照)
+    """
+
+    num_timeseries: int
+    num_units: int
+    rows: IntArray
+    cols: IntArray
+    coefs: FloatArray
+    senses: npt.NDArray[np.str_]
+    rhs: FloatArray
+    objective: FloatArray
+    lower_bounds: FloatArray
+    upper_bounds: FloatArray
+    is_integer: npt.NDArray[np.bool_]
+    demand_rows: IntArray = field(default_factory=lambda: np.zeros(0, np.int64))
+    columns: IntArray | None = None
+    fixed_values: FloatArray | None = None
+    objective_offset: float = 0.0
+    shortfall: bool = False
+    num_scenarios: int = 1
+
+    @property
+    def num_variables(self) -> int:
+        return len(self.objective)
+
+    @property
+    def num_constraints(self) -> int:
+        return len(self.rhs)
+
+    @property
+    def num_nonzeros(self) -> int:
+        return len(self.coefs)
+
+    def index(self, kind: str, t: IntArray | int, p: IntArray | int) -> IntArray:
+        """変数種別・期・発電機から変数のインデックスを求める"""
+        offset = VARIABLE_KINDS.index(kind) * self.num_timeseries * self.num_units
+        return np.asarray(offset + np.asarray(t) * self.num_units + p, dtype=np.int64)
+
+    def variable_names(self) -> list[str]:
+        names = [
+            f"{kind}_{t}_{p}"
+            for kind in VARIABLE_KINDS
+            for t in range(self.num_timeseries)
+            for p in range(self.num_units)
+        ]
+        if self.shortfall:
+            names += [f"shortfall_{t}" for t in range(self.num_timeseries)]
+        names += [
+            f"output_{s}_{t}_{p}"
+            for s in range(1, self.num_scenarios)
+            for t in range(self.num_timeseries)
+            for p in range(self.num_units)
+        ]
+        if self.columns is None:
+            return names
+        return [names[c] for c in self.columns.tolist()]
+
+    def compact_values(self, values: FloatArray) -> FloatArray:
+        """元の全変数の値ベクトルから、モデルに残した列の値を取り出す"""
+        return values if self.columns is None else values[self.columns]
+
+    def to_csr(self) -> tuple[IntArray, IntArray, FloatArray]:
+        """制約行列をCSR形式 (indptr, indices, data) で返す"""
+        order = np.lexsort((self.cols, self.rows))
+        counts = np.bincount(self.rows, minlength=self.num_constraints)
+        indptr = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        return indptr, self.cols[order], self.coefs[order]
+
+    def reshape_values(self, values: FloatArray) -> dict[str, FloatArray]:
+        """
+        変数値ベクトルを 変数種別ごとの (T, P) 配列に分解する。
+        num_scenarios が2以上の場合は、全シナリオの出力を (S, T, P) 配列として
+        scenario_output に加える (output は1番目のシナリオの出力)
+        """
+        if self.columns is not None and self.fixed_values is not None:
+            full = self.fixed_values.copy()
+            full[self.columns] = values
+            values = full
+        shape = (self.num_timeseries, self.num_units)
+        size = self.num_timeseries * self.num_units
+        reshaped = {
+            kind: values[i * size : (i + 1) * size].reshape(shape)
+            for i, kind in enumerate(VARIABLE_KINDS)
+        }
+        if self.num_scenarios > 1:
+            extra = values[len(values) - (self.num_scenarios - 1) * size :]
+            reshaped["scenario_output"] = np.concatenate(
+                [reshaped["output"][None], extra.reshape(-1, *shape)]
+            )
+        return reshaped
+
+
+class MatrixBuilder:
+    """制約を行ブロック単位で NumPy 配列として積み上げるビルダー"""
+
+    def __init__(self, num_timeseries: int, num_units: int):
+        self.num_timeseries = num_timeseries
+        self.num_units = num_units
+        self.num_rows = 0
+        self._rows: list[IntArray] = []
+        self._cols: list[IntArray] = []
+        self._coefs: list[FloatArray] = []
+        self._senses: list[npt.NDArray[np.str_]] = []
+        self._rhs: list[FloatArray] = []
+
+    def index(self, kind: str, t: IntArray | int, p: IntArray | int) -> IntArray:
+        offset = VARIABLE_KINDS.index(kind) * self.num_timeseries * self.num_units
+        return np.asarray(offset + np.asarray(t) * self.num_units + p, dtype=np.int64)
+
+    def add_rows(
+        self,
+        cols: IntArray,
+        coefs: FloatArray | float,
+        sense: str,
+        rhs: FloatArray | float,
+    ) -> IntArray:
+        """
+        cols の各行を1本の制約として追加し、追加した行のインデックスを返す。
+        cols: (制約数, 項数) の列インデックス
+        coefs: cols にブロードキャスト可能な係数
+        """
+        cols = np.atleast_2d(cols)
+        num_new = cols.shape[0]
+        if num_new == 0:
+            return np.zeros(0, dtype=np.int64)
+        row_ids = self.num_rows + np.arange(num_new, dtype=np.int64)
+        self._rows.append(np.broadcast_to(row_ids[:, None], cols.shape).ravel())
+        self._cols.append(cols.ravel())
+        self._coefs.append(
+            np.broadcast_to(np.asarray(coefs, dtype=np.float64), cols.shape).ravel()
+        )
+        self._senses.append(np.full(num_new, sense))
+        self._rhs.append(
+            np.broadcast_to(np.asarray(rhs, dtype=np.float64), (num_new,)).copy()
+        )
+        self.num_rows += num_new
+        return row_ids
+
+    def build(
+        self,
+        objective: FloatArray,
+        lower_bounds: FloatArray,
+        upper_bounds: FloatArray,
+        is_integer: npt.NDArray[np.bool_],
+        demand_rows: IntArray | None = None,
+        shortfall: bool = False,
+    ) -> MatrixModel:
+        # 係数0の項は PuLP と同様に行列に含めない
+        coefs = np.concatenate(self._coefs)
+        nonzero = coefs != 0.0
+        return MatrixModel(
+            num_timeseries=self.num_timeseries,
+            num_units=self.num_units,
+            rows=np.concatenate(self._rows)[nonzero],
+            cols=np.concatenate(self._cols)[nonzero],
+            coefs=coefs[nonzero],
+            senses=np.concatenate(self._senses),
+            rhs=np.concatenate(self._rhs),
+            objective=objective,
+            lower_bounds=lower_bounds,
+            upper_bounds=upper_bounds,
+            is_integer=is_integer,
+            demand_rows=np.zeros(0, np.int64) if demand_rows is None else demand_rows,
+            shortfall=shortfall,
+        )
+
+
+def build_matrix_model(
+    input_arrays: InputArrays,
+    initial_states: list[UnitInitialState] | None = None,
+    formulation: str = "basic",
+    unit_counts: IntArray | None = None,
+    shortfall_penalty: float | None = None,
+) -> MatrixModel:
+    """Solver.add_constraints / add_objective と同じ定式化を行列として組み立てる"""
+    tight = formulation == "tight"
+    demands = input_arrays.demands
+    pmins = input_arrays.pmins
+    pmaxs = input_arrays.pmaxs
+    min_operation_times = input_arrays.min_operation_times
+    min_down_times = input_arrays.min_down_times
+    ramp_ups = input_arrays.ramp_ups
+    ramp_downs = input_arrays.ramp_downs
+    num_timeseries = len(demands)
+    num_units = len(pmins)
+    counts = np.ones(num_units, dtype=np.int64) if unit_counts is None else unit_counts
+    builder = MatrixBuilder(num_timeseries, num_units)
+
+    all_t = np.arange(num_timeseries)
+    all_p = np.arange(num_units)
+    t_grid, p_grid = np.meshgrid(all_t, all_p, indexing="ij")
+    tt, pp = t_grid.ravel(), p_grid.ravel()
+    later_t_grid, later_p_grid = np.meshgrid(
+        np.arange(1, num_timeseries), all_p, indexing="ij"
+    )
+    lt, lp = later_t_grid.ravel(), later_p_grid.ravel()
+
+    # 起動停止変数の関係を表す制約
+    builder.add_rows(
+        np.stack(
+            [builder.index("start", tt, pp), builder.index("operation", tt, pp)],
+            axis=1,
+        ),
+        np.array([1.0, -1.0]),
+        "L",
+        0.0,
+    )
+    if tight:
+        builder.add_rows(
+            np.stack(
+                [builder.index("start", tt, pp), builder.index("stop", tt, pp)],
+                axis=1,
+            ),
+            1.0,
+            "L",
+            counts[pp].astype(np.float64),
+        )
+        builder.add_rows(
+            np.stack(
+                [builder.index("stop", tt, pp), builder.index("operation", tt, pp)],
+                axis=1,
+            ),
+            1.0,
+            "L",
+            counts[pp].astype(np.float64),
+        )
+    builder.add_rows(
+        np.stack(
+            [
+                builder.index("start", lt, lp),
+                builder.index("stop", lt, lp),
+                builder.index("operation", lt, lp),
+                builder.index("operation", lt - 1, lp),
+            ],
+            axis=1,
+        ),
+        np.array([1.0, -1.0, -1.0, 1.0]),
+        "E",
+        0.0,
+    )
+
+    # 開始したら最低でもα期は連続稼働 / 停止したら最低でもβ期間は連続停止
+    for p in range(num_units):
+        for kind, length, sign, rhs in (
+            ("start", int(min_operation_times[p]), -1.0, 0.0),
+            ("stop", int(min_down_times[p]), 1.0, float(counts[p])),
+        ):
+            # 初期状態がない場合は窓が期間内に収まる期からのみ制約を課す
+            # tight: 前期の窓が課されている期 (t > first) では当期の起動・停止も含める
+            first = length if initial_states is None else min(length, 1)
+            for t in range(first, min(length, num_timeseries)):
+                last = t + 1 if tight and t > first else t
+                builder.add_rows(
+                    np.append(
+                        builder.index(kind, np.arange(last), p),
+                        builder.index("operation", t, p),
+                    ),
+                    np.append(np.ones(last), sign),
+                    "L",
+                    rhs,
+                )
+            t_full = np.arange(length, num_timeseries)
+            extended = tight & (t_full > first)
+            for mask, width in ((~extended, length), (extended, length + 1)):
+                t_window = t_full[mask]
+                s_window = t_window[:, None] - length + np.arange(width)[None, :]
+                builder.add_rows(
+                    np.concatenate(
+                        [
+                            builder.index(kind, s_window, p),
+                            builder.index("operation", t_window, p)[:, None],
+                        ],
+                        axis=1,
+                    ),
+                    np.append(np.ones(width), sign),
+                    "L",
+                    rhs,
+                )
+
+    # 発電機の出力制約
+    builder.add_rows(
+        np.stack(
+            [builder.index("operation", tt, pp), builder.index("output", tt, pp)],
+            axis=1,
+        ),
+        np.stack([pmins[pp], -np.ones(len(pp))], axis=1),
+        "L",
+        0.0,
+    )
+    builder.add_rows(
+        np.stack(
+            [builder.index("output", tt, pp), builder.index("operation", tt, pp)],
+            axis=1,
+        ),
+        np.stack([np.ones(len(pp)), -pmaxs[pp]], axis=1),
+        "L",
+        0.0,
+    )
+    if tight:
+        # 起動期は停止中の出力0からランプアップ、停止前期はランプダウンで0へ
+        startup_cut = np.maximum(pmaxs - ramp_ups, 0.0)
+        shutdown_cut = np.maximum(pmaxs - ramp_downs, 0.0)
+        builder.add_rows(
+            np.stack(
+                [
+                    builder.index("output", lt, lp),
+                    builder.index("operation", lt, lp),
+                    builder.index("start", lt, lp),
+                ],
+                axis=1,
+            ),
+            np.stack([np.ones(len(lp)), -pmaxs[lp], startup_cut[lp]], axis=1),
+            "L",
+            0.0,
+        )
+        builder.add_rows(
+            np.stack(
+                [
+                    builder.index("output", lt - 1, lp),
+                    builder.index("operation", lt - 1, lp),
+                    builder.index("stop", lt, lp),
+                ],
+                axis=1,
+            ),
+            np.stack([np.ones(len(lp)), -pmaxs[lp], shutdown_cut[lp]], axis=1),
+            "L",
+            0.0,
+        )
+
+    # 各日の需要を満たす制約 (shortfall_penalty では不足量の変数を加える)
+    size = num_timeseries * num_units
+    demand_cols = builder.index("output", all_t[:, None], all_p[None, :])
+    if shortfall_penalty is not None:
+        shortfall_cols = len(VARIABLE_KINDS) * size + all_t
+        demand_cols = np.concatenate([demand_cols, shortfall_cols[:, None]], axis=1)
+    demand_rows = builder.add_rows(demand_cols, 1.0, "G", demands)
+
+    # 各発電機のランプアップ・ランプダウン制約
+    # (tight と、複数台をまとめた発電機は右辺を稼働状態に応じた値にする)
+    proportional = np.full(len(lp), tight) | (counts[lp] > 1)
+    sp, sl = lp[proportional], lt[proportional]
+    ramp_cols = np.stack(
+        [builder.index("output", sl, sp), builder.index("output", sl - 1, sp)],
+        axis=1,
+    )
+    builder.add_rows(
+        np.concatenate(
+            [
+                ramp_cols,
+                builder.index("operation", sl - 1, sp)[:, None],
+                builder.index("start", sl, sp)[:, None],
+            ],
+            axis=1,
+        ),
+        np.stack(
+            [
+                np.ones(len(sp)),
+                -np.ones(len(sp)),
+                -ramp_ups[sp],
+                -ramp_ups[sp],
+            ],
+            axis=1,
+        ),
+        "L",
+        0.0,
+    )
+    builder.add_rows(
+        np.concatenate(
+            [
+                ramp_cols,
+                builder.index("operation", sl, sp)[:, None],
+                builder.index("stop", sl, sp)[:, None],
+            ],
+            axis=1,
+        ),
+        np.stack(
+            [
+                -np.ones(len(sp)),
+                np.ones(len(sp)),
+                -ramp_downs[sp],
+                -ramp_downs[sp],
+            ],
+            axis=1,
+        ),
+        "L",
+        0.0,
+    )
+    cp, cl = lp[~proportional], lt[~proportional]
+    ramp_cols = np.stack(
+        [builder.index("output", cl, cp), builder.index("output", cl - 1, cp)],
+        axis=1,
+    )
+    builder.add_rows(ramp_cols, np.array([1.0, -1.0]), "L", ramp_ups[cp])
+    builder.add_rows(ramp_cols, np.array([-1.0, 1.0]), "L", ramp_downs[cp])
+
+    if initial_states is not None:
+        add_initial_state_rows(
+            builder,
+            initial_states,
+            min_operation_times,
+            min_down_times,
+            ramp_ups,
+            ramp_downs,
+        )
+
+    # 総コストを最小化
+    num_shortfall = 0 if shortfall_penalty is None else num_timeseries
+    objective = np.concatenate(
+        [
+            np.zeros(size),
+            np.tile(input_arrays.cost_starts, num_timeseries),
+            np.tile(input_arrays.cost_stops, num_timeseries),
+            np.tile(input_arrays.cost_runs, num_timeseries),
+            np.full(num_shortfall, shortfall_penalty or 0.0),
+        ]
+    ).astype(np.float64)
+    num_binary = len(INTEGER_KINDS) * size
+    # tight では operation が整数なら start / stop も整数値に決まるため連続変数にする
+    num_integer = size if tight else num_binary
+    num_variables = len(VARIABLE_KINDS) * size + num_shortfall
+    is_integer = np.zeros(num_variables, dtype=np.bool_)
+    is_integer[:num_integer] = True
+    lower_bounds = np.zeros(num_variables)
+    upper_bounds = np.full(num_variables, np.inf)
+    upper_bounds[:num_binary] = np.tile(
+        np.tile(counts, num_timeseries), len(INTEGER_KINDS)
+    )
+    return builder.build(
+        objective,
+        lower_bounds,
+        upper_bounds,
+        is_integer,
+        demand_rows,
+        shortfall=shortfall_penalty is not None,
+    )
+
+
+def drop_fixed_variables(model: MatrixModel) -> MatrixModel:
+    """
+    上下限が等しい変数をモデルから除き、その寄与を制約の右辺と目的関数の定数に移す。
+    変数が残らず、固定値で満たされる制約も除く (需要制約は update_demands の
+    ために残す)。整数変数は先頭に並んだまま残る。
+    """
+    fixed = model.lower_bounds == model.upper_bounds
+    if not fixed.any():
+        return model
+    values = np.where(fixed, model.lower_bounds, 0.0)
+    contribution = np.bincount(
+        model.rows,
+        weights=model.coefs * values[model.cols],
+        minlength=model.num_constraints,
+    )
+    rhs = model.rhs - contribution
+
+    kept = np.flatnonzero(~fixed)
+    new_col = np.full(model.num_variables, -1, dtype=np.int64)
+    new_col[kept] = np.arange(len(kept))
+    nonzero = ~fixed[model.cols]
+    rows, cols, coefs = (
+        model.rows[nonzero],
+        new_col[model.cols[nonzero]],
+        model.coefs[nonzero],
+    )
+    satisfied = np.select(
+        [model.senses == "L", model.senses == "G"],
+        [rhs >= 0.0, rhs <= 0.0],
+        rhs == 0.0,
+    )
+    empty = np.bincount(rows, minlength=model.num_constraints) == 0
+    empty[model.demand_rows] = False
+    kept_rows = np.flatnonzero(~(empty & satisfied))
+    new_row = np.full(model.num_constraints, -1, dtype=np.int64)
+    new_row[kept_rows] = np.arange(len(kept_rows))
+
+    return MatrixModel(
+        num_timeseries=model.num_timeseries,
+        num_units=model.num_units,
+        rows=new_row[rows],
+        cols=cols,
+        coefs=coefs,
+        senses=model.senses[kept_rows],
+        rhs=rhs[kept_rows],
+        objective=model.objective[kept],
+        lower_bounds=model.lower_bounds[kept],
+        upper_bounds=model.upper_bounds[kept],
+        is_integer=model.is_integer[kept],
+        demand_rows=new_row[model.demand_rows],
+        columns=kept,
+        fixed_values=values,
+        objective_offset=float(model.objective @ values),
+        shortfall=model.shortfall,
+        num_scenarios=model.num_scenarios,
+    )
+
+
+def remaining_periods(state: UnitInitialState, length: int, operation: int) -> int:
+    """
+    直前期の状態 state が operation であるとき、先頭から状態を維持すべき期間数を返す。
+    起動 (停止) した期の次期から length 期間は状態を維持する。
+    """
+    if state.operation != operation or state.duration < 1:
+        return 0
+    return max(0, length - state.duration + 1)
+
+
+def add_initial_state_rows(
+    builder: MatrixBuilder,
+    initial_states: list[UnitInitialState],
+    min_operation_times: IntArray,
+    min_down_times: IntArray,
+    ramp_ups: FloatArray,
+    ramp_downs: FloatArray,
+) -> None:
+    """Solver.add_initial_state_constraints と同じ制約を行として追加する"""
+    for p, state in enumerate(initial_states):
+        # 直前期との起動停止の関係
+        builder.add_rows(
+            np.array(
+                [
+                    builder.index("start", 0, p),
+                    builder.index("stop", 0, p),
+                    builder.index("operation", 0, p),
+                ]
+            ),
+            np.array([1.0, -1.0, -1.0]),
+            "E",
+            -float(state.operation),
+        )
+        # 直前期から継続する最低稼働・最低停止期間
+        for length, operation in (
+            (int(min_operation_times[p]), 1),
+            (int(min_down_times[p]), 0),
+        ):
+            num_fixed = min(
+                remaining_periods(state, length, operation), builder.num_timeseries
+            )
+            builder.add_rows(
+                builder.index("operation", np.arange(num_fixed), p)[:, None],
+                1.0,
+                "E",
+                float(operation),
+            )
+        # 直前期の出力からのランプ制約
+        output_col = builder.index("output", 0, p)
+        builder.add_rows(output_col, 1.0, "L", ramp_ups[p] + state.output)
+        builder.add_rows(output_col, -1.0, "L", ramp_downs[p] - state.output)
+
+
+def write_mps(
+    model: MatrixModel, path: str, name: str = "UnitCommitmentProblem"
+) -> None:
+    """MatrixModel を MPS ファイルとして書き出す"""
+    row_names = np.array(["OBJ"] + [f"c{i}" for i in range(model.num_constraints)])
+    col_names = np.array(model.variable_names())
+
+    # 目的関数は全列について出力し、制約に現れない列も COLUMNS に残す
+    all_rows = np.concatenate([np.full(model.num_variables, -1), model.rows])
+    all_cols = np.concatenate([np.arange(model.num_variables), model.cols])
+    all_coefs = np.concatenate([model.objective, model.coefs])
+    order = np.lexsort((all_rows, all_cols))
+    all_rows, all_cols, all_coefs = all_rows[order], all_cols[order], all_coefs[order]
+    column_lines = [
+        f"    {c} {r} {v:.12g}\n"
+        for c, r, v in zip(
+            col_names[all_cols].tolist(),
+            row_names[all_rows + 1].tolist(),
+            all_coefs.tolist(),
+            strict=True,
+        )
+    ]
+    integer_cols = np.flatnonzero(model.is_integer)
+    if len(integer_cols) > 0:
+        start = int(np.searchsorted(all_cols, integer_cols[0], side="left"))
+        stop = int(np.searchsorted(all_cols, integer_cols[-1], side="right"))
+        column_lines.insert(stop, "    MARKER 'MARKER' 'INTEND'\n")
+        column_lines.insert(start, "    MARKER 'MARKER' 'INTORG'\n")
+
+    nonzero_rhs = np.flatnonzero(model.rhs)
+    rhs_lines = [
+        f"    RHS {r} {v:.12g}\n"
+        for r, v in zip(
+            row_names[nonzero_rhs + 1].tolist(),
+            model.rhs[nonzero_rhs].tolist(),
+            strict=True,
+        )
+    ]
+
+    fixed = model.lower_bounds == model.upper_bounds
+    bound_lines = []
+    for kind, mask, bounds in (
+        ("FX", fixed, model.lower_bounds),
+        ("LO", ~fixed & (model.lower_bounds != 0), model.lower_bounds),
+        ("UP", ~fixed & np.isfinite(model.upper_bounds), model.upper_bounds),
+    ):
+        bound_cols = np.flatnonzero(mask)
+        bound_lines += [
+            f" {kind} BND {c} {v:.12g}\n"
+            for c, v in zip(
+                col_names[bound_cols].tolist(), bounds[bound_cols].tolist(), strict=True
+            )
+        ]
+
+    with open(path, "w") as f:
+        f.write(f"NAME {name}\nROWS\n N OBJ\n")
+        f.writelines(
+            f" {s} {r}\n"
+            for s, r in zip(model.senses.tolist(), row_names[1:].tolist(), strict=True)
+        )
+        f.write("COLUMNS\n")
+        f.writelines(column_lines)
+        f.write("RHS\n")
+        f.writelines(rhs_lines)
+        f.write("BOUNDS\n")
+        f.writelines(bound_lines)
+        f.write("ENDATA\n")
@@ -0,0 +1,71 @@
+from collections.abc import Callable
+
+from src.models.cbc import CbcLogSummary
+from src.schemas.data_schema import SolveProgress
+
+ProgressCallback = Callable[[SolveProgress], None]
+StopPredicate = Callable[[SolveProgress], bool]
+
+
+def log_progress(
+    summary: CbcLogSummary, elapsed_seconds: float, objective_offset: float = 0.0
+) -> SolveProgress:
+    """
+    CBC のログの途中経過を SolveProgress にする。
+    下界がまだなければ LP 緩和の目的関数値を下界とする。
+    objective_offset: モデルから除いた固定変数の目的関数値 (目的関数値と下界に加える)
+    """
+    objective_value = summary.best_objective
+    best_bound = summary.best_bound
+    if best_bound is None:
+        best_bound = summary.continuous_objective
+    if objective_value is not None:
+        objective_value += objective_offset
+    if best_bound is not None:
+        best_bound += objective_offset
+    gap = None
+    if objective_value is not None and best_bound is not None:
+        gap = abs(objective_value - best_bound) / max(abs(objective_value), 1e-10)
+    return SolveProgress(
+        objective_value=objective_value,
+        best_bound=best_bound,
+        gap=gap,
+        nodes=summary.nodes,
+        elapsed_seconds=elapsed_seconds,
+    )
+
+
+def gap_below(gap: float) -> StopPredicate:
+    """最良解と下界の相対ギャップが gap 以下になったら止める"""
+
+    def predicate(progress: SolveProgress) -> bool:
+        return progress.gap is not None and progress.gap <= gap
+
+    return predicate
+
+
+def stalled_for(seconds: float) -> StopPredicate:
+    """
+    最良解が seconds 秒更新されなければ止める。
+    最初の解が見つかるまでは止めない。
+    """
+    last: dict[str, float] = {}
+
+    def predicate(progress: SolveProgress) -> bool:
+        if progress.objective_value is None:
+            return False
+        if last.get("objective_value") != progress.objective_value:
+            last["objective_value"] = progress.objective_value
+            last["elapsed_seconds"] = progress.elapsed_seconds
+        return progress.elapsed_seconds - last["elapsed_seconds"] >= seconds
+
+    return predicate
+
+
+def any_of(*predicates: StopPredicate) -> StopPredicate:
+    """いずれかの条件を満たしたら止める"""
+
+    def predicate(progress: SolveProgress) -> bool:
+        return any(p(progress) for p in predicates)
+
+    return predicate
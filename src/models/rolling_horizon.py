@@ -0,0 +1,181 @@
+import os
+import time
+
+import numpy as np
+import numpy.typing as npt
+from pulp import LpProblem, LpStatusNotSolved, LpStatusOptimal
+
+from src.models.matrix_builder import VARIABLE_KINDS, MatrixModel
+from src.models.solver import Solver
+from src.schemas.data_schema import (
+    InputData,
+    RollingHorizonReport,
+    SolverOptions,
+    UnitInitialState,
+)
+from src.schemas.input_arrays import InputArrays
+
+
+class RollingHorizonSolver(Solver):
+    """
+    ローリングホライズンで起動停止問題を解くソルバー。
+    - 先頭から window 期間ずつ確定し、各ウィンドウは lookahead 期間を先読みして解く
+    - 確定した最終期の稼働状態・継続期間・出力を次のウィンドウの初期状態として引き継ぐ
+    initial_states を指定した場合は最初のウィンドウの初期状態とし、
+    先頭から状態が変わらない発電機の継続期間にも加える
+    """
+
+    def __init__(
+        self,
+        input_data: InputData | InputArrays,
+        window: int,
+        lookahead: int = 0,
+        builder: str = "pulp",
+        formulation: str = "basic",
+        options: SolverOptions | None = None,
+        initial_states: list[UnitInitialState] | None = None,
+    ):
+        if window < 1:
+            raise ValueError("window は1以上である必要があります")
+        if lookahead < 0:
+            raise ValueError("lookahead は0以上である必要があります")
+        super().__init__(
+            input_data,
+            builder=builder,
+            formulation=formulation,
+            options=options,
+            initial_states=initial_states,
+        )
+        self.window = window
+        self.lookahead = lookahead
+
+    def build_model(self) -> None:
+        # 各ウィンドウのモデルは solve の中で構築する
+        self.num_windows = -(-self.num_timeseries // self.window)
+
+    def model_size(self) -> dict[str, int]:
+        # モデルはウィンドウごとに作られるため、ウィンドウ数だけを返す
+        return {"num_windows": self.num_windows}
+
+    def solve(
+        self,
+        output_dir: str,
+        threads: int | None = None,
+        warm_start: dict[str, npt.NDArray[np.float64]] | None = None,
+    ) -> LpProblem | MatrixModel:
+        values = {
+            kind: np.full((self.num_timeseries, self.num_units), np.nan)
+            for kind in VARIABLE_KINDS
+        }
+        initial_states = self.initial_states
+        for k, head in enumerate(range(0, self.num_timeseries, self.window)):
+            commit = min(head + self.window, self.num_timeseries)
+            tail = min(commit + self.lookahead, self.num_timeseries)
+            window_dir = os.path.join(output_dir, "rolling_horizon", f"window_{k:03d}")
+            os.makedirs(window_dir, exist_ok=True)
+
+            solver = Solver(
+                self.input_arrays.slice_periods(head, tail),
+                builder=self.builder,
+                initial_states=initial_states,
+                formulation=self.formulation,
+                options=self.options,
+            )
+            solver.build_model()
+            window_warm_start = None
+            if warm_start is not None:
+                window_warm_start = {
+                    kind: warm_start[kind][head:tail] for kind in VARIABLE_KINDS
+                }
+            model = solver.solve(window_dir, threads, window_warm_start)
+            # 制限で打ち切ったウィンドウは、その最良解を確定する
+            if not solver.has_solution:
+                raise ValueError(
+                    f"ウィンドウ {k} ({head}〜{tail - 1}期) で解が得られませんでした"
+                )
+
+            window_values = solver.get_variable_values()
+            for kind in VARIABLE_KINDS:
+                values[kind][head:commit] = window_values[kind][: commit - head]
+            initial_states = carry_over_states(values, commit, self.initial_states)
+
+        self._variable_values = values
+        self.status = LpStatusNotSolved
+        self.approximate = True
+        self.objective_value = float(
+            (
+                values["output"] * np.array(self.cost_runs)
+                + values["start"] * np.array(self.cost_starts)
+                + values["stop"] * np.array(self.cost_stops)
+            ).sum()
+        )
+        return model
+
+
+def carry_over_states(
+    values: dict[str, npt.NDArray[np.float64]],
+    commit: int,
+    previous: list[UnitInitialState] | None = None,
+) -> list[UnitInitialState]:
+    """
+    確定済みの解から commit 期直前の各発電機の状態を求める。
+    previous: 先頭の期の直前の状態。先頭から previous と同じ状態が続いている
+    発電機は、previous の継続期間を加える
+    """
+    operations = np.rint(values["operation"][:commit]).astype(np.int64)
+    last = operations[-1]
+    # 最終期と異なる状態だった最後の期を後ろから探す
+    changed = (operations != last)[::-1]
+    durations = np.where(changed.any(axis=0), changed.argmax(axis=0), commit)
+    if previous is not None:
+        unchanged = ~changed.any(axis=0) & (
+            np.array([state.operation for state in previous]) == last
+        )
+        durations = durations + np.where(
+            unchanged, [state.duration for state in previous], 0
+        )
+    return [
+        UnitInitialState(
+            operation=int(last[p]),
+            duration=int(durations[p]),
+            output=float(values["output"][commit - 1, p]),
+        )
+        for p in range(operations.shape[1])
+    ]
+
+
+def evaluate_rolling_horizon(
+    input_data: InputData | InputArrays,
+    output_dir: str,
+    window: int,
+    lookahead: int = 0,
+    builder: str = "pulp",
+) -> RollingHorizonReport:
+    """同じ入力を一括求解とローリングホライズンで解き、コスト差を比較する"""
+    monolithic_dir = os.path.join(output_dir, "monolithic")
+    os.makedirs(monolithic_dir, exist_ok=True)
+    start = time.perf_counter()
+    monolithic = Solver(input_data, builder=builder)
+    monolithic.build_model()
+    monolithic.solve(monolithic_dir)
+    monolithic_seconds = time.perf_counter() - start
+    if monolithic.status != LpStatusOptimal or monolithic.objective_value is None:
+        raise ValueError("一括求解で最適解が得られませんでした")
+
+    start = time.perf_counter()
+    rolling = RollingHorizonSolver(input_data, window, lookahead, builder=builder)
+    rolling.build_model()
+    rolling.solve(output_dir)
+    rolling_seconds = time.perf_counter() - start
+
+    monolithic_cost = float(monolithic.objective_value)
+    rolling_cost = float(rolling.objective_value)
+    return RollingHorizonReport(
+        window=window,
+        lookahead=lookahead,
+        rolling_cost=rolling_cost,
+        monolithic_cost=monolithic_cost,
+        cost_gap=(rolling_cost - monolithic_cost) / abs(monolithic_cost),
+        rolling_seconds=rolling_seconds,
+        monolithic_seconds=monolithic_seconds,
+    )
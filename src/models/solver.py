@@ -1,62 +1,274 @@
+import os
+import tempfile
+import time
+from collections.abc import Sequence
+from dataclasses import replace
+
+import numpy as np
+import numpy.typing as npt
 from pulp import (
-    PULP_CBC_CMD,
     LpBinary,
+    LpConstraint,
     LpContinuous,
+    LpInteger,
     LpMinimize,
     LpProblem,
+    LpSolutionIntegerFeasible,
+    LpSolutionOptimal,
+    LpStatus,
+    LpStatusInfeasible,
+    LpStatusNotSolved,
+    LpStatusOptimal,
     LpVariable,
     lpSum,
+    value,
+)
+
+from src.logic.feasibility import demand_shortfall
+from src.logic.presolve import (
+    PresolveResult,
+    apply_presolve_bounds,
+    presolve_commitment,
+)
+from src.logic.warm_start import complete_schedule
+from src.models.backends import (
+    cbc_command_options,
+    highs_best_bound,
+    pulp_solver,
+    solve_highs,
+    validate_backend,
+)
+from src.models.cbc import (
+    CbcLogSummary,
+    parse_cbc_log,
+    read_cbc_solution,
+    run_cbc,
+    run_cbc_streaming,
+    streaming_available,
+    write_cbc_mip_start,
 )
+from src.models.matrix_builder import (
+    VARIABLE_KINDS,
+    MatrixModel,
+    build_matrix_model,
+    drop_fixed_variables,
+    remaining_periods,
+    write_mps,
+)
+from src.models.progress import ProgressCallback, StopPredicate, log_progress
+from src.schemas.data_schema import (
+    InputData,
+    SolveResult,
+    SolverOptions,
+    UnitInitialState,
+)
+from src.schemas.input_arrays import InputArrays, as_input_arrays
 
-from src.schemas.data_schema import InputData
+BUILDERS = ("pulp", "matrix")
+FORMULATIONS = ("basic", "tight")
 
 
 class Solver:
-    def __init__(self, input_data: InputData):
-        self.timeseries = input_data.timeseries
-        self.generator_parameters = input_data.generator_parameters
-        self.num_units = len(self.generator_parameters)
-        self.num_timeseries = len(self.timeseries)
-        self.min_operation_times = [
-            generator.min_operation_time for generator in self.generator_parameters
-        ]
-
-        self.min_down_times = [
-            generator.min_down_time for generator in self.generator_parameters
-        ]
-        self.pmins = [generator.pmin for generator in self.generator_parameters]
-        self.pmaxs = [generator.pmax for generator in self.generator_parameters]
-        self.cost_runs = [generator.cost_run for generator in self.generator_parameters]
-        self.cost_starts = [
-            generator.cost_start for generator in self.generator_parameters
-        ]
-        self.cost_stops = [
-            generator.cost_stop for generator in self.generator_parameters
-        ]
-        self.ramp_ups = [generator.ramp_up for generator in self.generator_parameters]
-        self.ramp_downs = [
-            generator.ramp_down for generator in self.generator_parameters
-        ]
+    """
+    起動停止問題ソルバー。
+    builder:
+    - "pulp": PuLP の変数・制約オブジェクトでモデルを構築する
+    - "matrix": 同じ定式化を NumPy の疎行列として構築し、MPS 経由で CBC に渡す
+      (backend が highs の場合は highspy に直接渡す)
+    initial_states:
+    - 各発電機の直前期の状態。指定した場合は先頭期を直前期と接続する
+    formulation:
+    - "basic": 起動停止の3バイナリ変数による基本の定式化
+    - "tight": 最適値を変えずに LP 緩和を強めた定式化 (add_constraints を参照)
+    options:
+    - ソルバー・制限時間・MIPギャップ・スレッド数など (SolverOptions を参照)。
+      solve の結果は solve_result に残す
+    unit_counts:
+    - 各「発電機」がまとめている同一の発電機の台数 (既定は全て1)。
+      2台以上の場合、稼働・起動・停止は台数を表す整数変数、出力は合計出力になり、
+      ランプ制約は tight と同じく稼働台数に比例する形にする (GroupedSolver を参照)
+    fix_forced:
+    - True の場合、構築前に presolve_commitment で稼働・停止が確定する変数を固定し、
+      出力の上下限を絞る。matrix では固定した変数をモデルから除く
+      (unit_counts が2以上の発電機があるモデルでは使えない)
+    shortfall_penalty:
+    - 指定した場合、各期の需要制約に不足量の変数を加え、不足1MWあたり
+      shortfall_penalty 円を目的関数に加える。供給力が足りない入力でも解が得られ、
+      不足が残る期 (demand_shortfall) から実行不可能な期が分かる
+    on_progress / stop_when:
+    - 求解中、最良解・下界・ギャップ・経過時間 (SolveProgress) が更新されるたびに
+      on_progress を呼び、stop_when が True を返したら探索を打ち切って
+      それまでの最良解を解とする (stopped_early が True になる)。
+      CBC のログを擬似端末で読みながら解くため、builder が matrix で backend が
+      cbc の場合 (Unix 系の OS のみ) だけ使える
+      (条件は src/models/progress.py の gap_below などで作る)
+    status は最適性が証明された場合 (mip_gap に達して停止した場合を含む) だけ
+    Optimal とする。時間・ノード数の制限や stop_when で打ち切った場合は、実行可能解が
+    あっても Not Solved とし、その最良解を objective_value と解に残す
+    (has_solution で解の有無が分かる)。
+    構築したモデルは update_demands / update_costs / fix_operation で部分的に
+    書き換え、resolve で再構築せずに解き直せる (fix_forced では固定が入力データに
+    依存するため使えない)。
+    """
+
+    def __init__(
+        self,
+        input_data: InputData | InputArrays,
+        builder: str = "pulp",
+        initial_states: list[UnitInitialState] | None = None,
+        formulation: str = "basic",
+        options: SolverOptions | None = None,
+        unit_counts: list[int] | None = None,
+        fix_forced: bool = False,
+        shortfall_penalty: float | None = None,
+        on_progress: ProgressCallback | None = None,
+        stop_when: StopPredicate | None = None,
+    ):
+        if builder not in BUILDERS:
+            raise ValueError(f"builder は {BUILDERS} のいずれかである必要があります")
+        if formulation not in FORMULATIONS:
+            raise ValueError(
+                f"formulation は {FORMULATIONS} のいずれかである必要があります"
+            )
+        self.options = SolverOptions() if options is None else options
+        validate_backend(self.options.backend, builder)
+        self.input_arrays = as_input_arrays(input_data)
+        if initial_states is not None and (
+            len(initial_states) != self.input_arrays.num_units
+        ):
+            raise ValueError("initial_states は発電機と同数である必要があります")
+        if unit_counts is None:
+            unit_counts = [1] * self.input_arrays.num_units
+        if (
+            len(unit_counts) != self.input_arrays.num_units
+            or min(unit_counts, default=1) < 1
+        ):
+            raise ValueError(
+                "unit_counts は発電機と同数の1以上の整数である必要があります"
+            )
+        if initial_states is not None and max(unit_counts, default=1) > 1:
+            raise ValueError(
+                "unit_counts が2以上の場合は initial_states を指定できません"
+            )
+        if fix_forced and max(unit_counts, default=1) > 1:
+            raise ValueError("unit_counts が2以上の場合は fix_forced を指定できません")
+        if shortfall_penalty is not None and shortfall_penalty <= 0:
+            raise ValueError("shortfall_penalty は正の値である必要があります")
+        if fix_forced and shortfall_penalty is not None:
+            # presolve_commitment は需要を満たすことを前提に変数を固定する
+            raise ValueError("fix_forced と shortfall_penalty は併用できません")
+        if (on_progress is not None or stop_when is not None) and (
+            builder != "matrix" or self.options.backend != "cbc"
+        ):
+            raise ValueError(
+                "on_progress・stop_when は builder が matrix、backend が cbc の場合"
+                "だけ使えます"
+            )
+        if (
+            on_progress is not None or stop_when is not None
+        ) and not streaming_available():
+            raise ValueError(
+                "on_progress・stop_when は擬似端末 (pty) が使えない OS では使えません"
+            )
+        self.unit_counts = list(unit_counts)
+        self.on_progress = on_progress
+        self.stop_when = stop_when
+        self.stopped_early = False
+        # 近似解法 (HeuristicSolver など) の解は最適性の保証がないため、
+        # status は Not Solved のままにして approximate を True にする
+        self.approximate = False
+        self.shortfall_penalty = shortfall_penalty
+        self.fix_forced = fix_forced
+        self.presolve_result: PresolveResult | None = None
+        self.builder = builder
+        self.initial_states = initial_states
+        self.formulation = formulation
+        self.num_units = self.input_arrays.num_units
+        self.num_timeseries = self.input_arrays.num_timeseries
+        self.dates = self.input_arrays.date_list()
+        self.demands = self.input_arrays.demands.tolist()
+        self.min_operation_times = self.input_arrays.min_operation_times.tolist()
+        self.min_down_times = self.input_arrays.min_down_times.tolist()
+        self.pmins = self.input_arrays.pmins.tolist()
+        self.pmaxs = self.input_arrays.pmaxs.tolist()
+        self.cost_runs = self.input_arrays.cost_runs.tolist()
+        self.cost_starts = self.input_arrays.cost_starts.tolist()
+        self.cost_stops = self.input_arrays.cost_stops.tolist()
+        self.ramp_ups = self.input_arrays.ramp_ups.tolist()
+        self.ramp_downs = self.input_arrays.ramp_downs.tolist()
+        self._variable_values: dict[str, npt.NDArray[np.float64]] | None = None
+        self.status = LpStatusNotSolved
+        self._best_bound: float | None = None
+        self.solve_result: SolveResult | None = None
 
     def build_model(self) -> None:
+        if self.fix_forced:
+            start = time.perf_counter()
+            self.presolve_result = presolve_commitment(
+                self.input_arrays, self.initial_states
+            )
+            self.presolve_result.presolve_seconds = time.perf_counter() - start
+        if self.builder == "matrix":
+            self.matrix_model = build_matrix_model(
+                self.input_arrays,
+                initial_states=self.initial_states,
+                formulation=self.formulation,
+                unit_counts=np.asarray(self.unit_counts, dtype=np.int64),
+                shortfall_penalty=self.shortfall_penalty,
+            )
+            if self.presolve_result is not None:
+                apply_presolve_bounds(self.matrix_model, self.presolve_result)
+                self.matrix_model = drop_fixed_variables(self.matrix_model)
+            return
         self.model = LpProblem("UnitCommitmentProblem", LpMinimize)
         self.add_variables()
+        if self.presolve_result is not None:
+            self.apply_presolve_bounds(self.presolve_result)
         self.add_constraints()
         self.add_objective()
 
+    def model_size(self) -> dict[str, int]:
+        """構築したモデルの変数・制約・非ゼロ要素の数 (fix_forced では固定した数も)"""
+        presolved = {}
+        if self.presolve_result is not None:
+            presolved = self.presolve_result.summary()
+        if self.builder == "matrix":
+            return {
+                "num_variables": self.matrix_model.num_variables,
+                "num_constraints": self.matrix_model.num_constraints,
+                "num_nonzeros": self.matrix_model.num_nonzeros,
+                **presolved,
+            }
+        return {
+            "num_variables": self.model.numVariables(),
+            "num_constraints": self.model.numConstraints(),
+            "num_nonzeros": sum(
+                len(constraint) for constraint in self.model.constraints.values()
+            ),
+            **presolved,
+        }
+
     def add_variables(self) -> None:
+        # tight では operation が整数なら start / stop も整数値に決まるため連続変数にする
+        switch_cat = LpContinuous if self.formulation == "tight" else LpInteger
+        counts = self.unit_counts
         self.operation = {
-            (t, p): LpVariable(f"operation_{t}_{p}", cat=LpBinary)
+            (t, p): LpVariable(
+                f"operation_{t}_{p}",
+                0,
+                counts[p],
+                cat=LpBinary if counts[p] == 1 else LpInteger,
+            )
             for t in range(self.num_timeseries)
             for p in range(self.num_units)
         }
         self.start = {
-            (t, p): LpVariable(f"start_{t}_{p}", cat=LpBinary)
+            (t, p): LpVariable(f"start_{t}_{p}", 0, counts[p], cat=switch_cat)
             for t in range(self.num_timeseries)
             for p in range(self.num_units)
         }
         self.stop = {
-            (t, p): LpVariable(f"stop_{t}_{p}", cat=LpBinary)
+            (t, p): LpVariable(f"stop_{t}_{p}", 0, counts[p], cat=switch_cat)
             for t in range(self.num_timeseries)
             for p in range(self.num_units)
         }
@@ -65,12 +277,48 @@ class Solver:
             for t in range(self.num_timeseries)
             for p in range(self.num_units)
         }
+        self.shortfall = {}
+        if self.shortfall_penalty is not None:
+            self.shortfall = {
+                t: LpVariable(f"shortfall_{t}", lowBound=0, cat=LpContinuous)
+                for t in range(self.num_timeseries)
+            }
+
+    def apply_presolve_bounds(self, result: PresolveResult) -> None:
+        """
+        presolve_commitment の結果を PuLP の変数の上下限に反映する。
+        固定した変数は CBC の前処理で取り除かれる。
+        """
+        for (t, p), variable in self.operation.items():
+            if result.forced_on[t, p]:
+                variable.lowBound = 1
+            if result.forced_off[t, p]:
+                variable.upBound = 0
+            if result.switch_fixed[t, p]:
+                self.start[t, p].upBound = 0
+                self.stop[t, p].upBound = 0
+            self.output[t, p].lowBound = float(result.output_lower[t, p])
+            self.output[t, p].upBound = float(result.output_upper[t, p])
 
     def add_constraints(self) -> None:
+        """
+        formulation="tight" では基本の制約を次のように強める。
+        いずれも基本の定式化の最適解を除外しない。
+        - 同じ期の起動と停止は同時に立たない (start + stop <= 1)
+        - 最低稼働・停止の窓に当期の起動・停止を含める (turn-on / turn-off)
+        - 起動期の出力は ramp_up、停止前期の出力は ramp_down 以下
+        - ランプ制約の右辺を稼働状態に応じて0にする
+        """
+        tight = self.formulation == "tight"
+        counts = self.unit_counts
+
         # 起動停止変数の関係を表す制約
         for p in range(self.num_units):
             for t in range(self.num_timeseries):
                 self.model += self.start[t, p] <= self.operation[t, p]
+                if tight:
+                    self.model += self.start[t, p] + self.stop[t, p] <= counts[p]
+                    self.model += self.stop[t, p] <= counts[p] - self.operation[t, p]
         for p in range(self.num_units):
             for t in range(1, self.num_timeseries):
                 self.model += (
@@ -80,21 +328,25 @@ class Solver:
 
         # 開始したら最低でもα期は連続稼働
         for p in range(self.num_units):
-            for t in range(self.min_operation_times[p], self.num_timeseries):
+            alpha = self.min_operation_times[p]
+            first = self._first_window_period(alpha)
+            for t in range(first, self.num_timeseries):
+                # tight: 前期の窓が課されている期では当期の起動も窓に含められる
+                last = t + 1 if tight and t > first else t
                 self.model += (
-                    lpSum(
-                        self.start[s, p]
-                        for s in range(t - self.min_operation_times[p], t)
-                    )
+                    lpSum(self.start[s, p] for s in range(max(0, t - alpha), last))
                     <= self.operation[t, p]
                 )
 
         # 停止したら最低でもβ期間は連続停止
         for p in range(self.num_units):
-            for t in range(self.min_down_times[p], self.num_timeseries):
+            beta = self.min_down_times[p]
+            first = self._first_window_period(beta)
+            for t in range(first, self.num_timeseries):
+                last = t + 1 if tight and t > first else t
                 self.model += (
-                    lpSum(self.stop[s, p] for s in range(t - self.min_down_times[p], t))
-                    <= 1 - self.operation[t, p]
+                    lpSum(self.stop[s, p] for s in range(max(0, t - beta), last))
+                    <= counts[p] - self.operation[t, p]
                 )
 
         # 発電機の出力制約
@@ -102,34 +354,446 @@ class Solver:
             for t in range(self.num_timeseries):
                 self.model += self.pmins[p] * self.operation[t, p] <= self.output[t, p]
                 self.model += self.output[t, p] <= self.pmaxs[p] * self.operation[t, p]
+            if tight:
+                # 起動期は停止中の出力0からランプアップ、停止前期はランプダウンで0へ
+                startup_cut = max(self.pmaxs[p] - self.ramp_ups[p], 0.0)
+                shutdown_cut = max(self.pmaxs[p] - self.ramp_downs[p], 0.0)
+                for t in range(1, self.num_timeseries):
+                    self.model += (
+                        self.output[t, p]
+                        <= self.pmaxs[p] * self.operation[t, p]
+                        - startup_cut * self.start[t, p]
+                    )
+                    self.model += (
+                        self.output[t - 1, p]
+                        <= self.pmaxs[p] * self.operation[t - 1, p]
+                        - shutdown_cut * self.stop[t, p]
+                    )
 
-        # 各日の需要を満たす制約
+        # 各日の需要を満たす制約 (update_demands で右辺を書き換えるため保持する)
+        self.demand_constraints: dict[int, LpConstraint] = {}
         for t in range(self.num_timeseries):
-            self.model += (
-                lpSum(self.output[t, p] for p in range(self.num_units))
-                >= self.timeseries[t].demand
-            )
+            supply = lpSum(self.output[t, p] for p in range(self.num_units))
+            if t in self.shortfall:
+                supply += self.shortfall[t]
+            constraint = supply >= self.demands[t]
+            self.model += constraint
+            self.demand_constraints[t] = constraint
 
         # 各発電機のランプアップ・ランプダウン制約
         for p in range(self.num_units):
             for t in range(1, self.num_timeseries):
-                self.model += (
-                    self.output[t, p] - self.output[t - 1, p] <= self.ramp_ups[p]
-                )
-                self.model += (
-                    self.output[t - 1, p] - self.output[t, p] <= self.ramp_downs[p]
-                )
+                # 複数台をまとめた発電機は、稼働台数に比例する右辺にする
+                if tight or counts[p] > 1:
+                    ramp_up = self.ramp_ups[p] * (
+                        self.operation[t - 1, p] + self.start[t, p]
+                    )
+                    ramp_down = self.ramp_downs[p] * (
+                        self.operation[t, p] + self.stop[t, p]
+                    )
+                else:
+                    ramp_up = self.ramp_ups[p]
+                    ramp_down = self.ramp_downs[p]
+                self.model += self.output[t, p] - self.output[t - 1, p] <= ramp_up
+                self.model += self.output[t - 1, p] - self.output[t, p] <= ramp_down
+
+        if self.initial_states is not None:
+            self.add_initial_state_constraints(self.initial_states)
+
+    def _first_window_period(self, length: int) -> int:
+        # 初期状態がない場合は窓が期間内に収まる期からのみ制約を課す
+        if self.initial_states is None:
+            return length
+        return min(length, 1)
+
+    def add_initial_state_constraints(
+        self, initial_states: list[UnitInitialState]
+    ) -> None:
+        for p, state in enumerate(initial_states):
+            # 直前期との起動停止の関係
+            self.model += (
+                self.start[0, p] - self.stop[0, p]
+                == self.operation[0, p] - state.operation
+            )
+            # 直前期から継続する最低稼働・最低停止期間
+            for length, operation in (
+                (self.min_operation_times[p], 1),
+                (self.min_down_times[p], 0),
+            ):
+                num_fixed = remaining_periods(state, length, operation)
+                for t in range(min(num_fixed, self.num_timeseries)):
+                    self.model += self.operation[t, p] == operation
+            # 直前期の出力からのランプ制約
+            self.model += self.output[0, p] - state.output <= self.ramp_ups[p]
+            self.model += state.output - self.output[0, p] <= self.ramp_downs[p]
 
     def add_objective(self) -> None:
         # 総コストを最小化
-        self.model += lpSum(
+        objective = lpSum(
             self.cost_runs[p] * self.output[t, p]
             + self.cost_starts[p] * self.start[t, p]
             + self.cost_stops[p] * self.stop[t, p]
             for p in range(self.num_units)
             for t in range(self.num_timeseries)
         )
+        if self.shortfall_penalty is not None:
+            objective += self.shortfall_penalty * lpSum(self.shortfall.values())
+        self.model += objective
 
-    def solve(self, output_dir: str) -> LpProblem:
-        self.model.solve(PULP_CBC_CMD(msg=False, logPath=f"{output_dir}/solver.log"))
-        return self.model
+    def update_demands(self, periods: Sequence[int], demands: Sequence[float]) -> None:
+        """
+        構築済みモデルの periods 期の需要を demands に差し替える。
+        需要制約の右辺だけを書き換え、モデルは再構築しない。
+        """
+        self._require_unpresolved("update_demands")
+        periods_array = self._period_indices(periods)
+        values = np.asarray(demands, dtype=np.float64)
+        if values.shape != periods_array.shape:
+            raise ValueError("periods と demands は同じ長さである必要があります")
+        new_demands = self.input_arrays.demands.copy()
+        new_demands[periods_array] = values
+        self.input_arrays = replace(
+            self.input_arrays, demands=new_demands, _input_data=None
+        )
+        self.demands = new_demands.tolist()
+        if self.builder == "matrix":
+            self.matrix_model.rhs[self.matrix_model.demand_rows[periods_array]] = values
+            return
+        for t, demand in zip(periods_array.tolist(), values.tolist(), strict=True):
+            self.demand_constraints[t].changeRHS(demand)
+
+    def update_costs(
+        self,
+        generator_id: str,
+        cost_run: float | None = None,
+        cost_start: float | None = None,
+        cost_stop: float | None = None,
+    ) -> None:
+        """
+        構築済みモデルの発電機 generator_id のコストを差し替える (None は変更しない)。
+        目的関数の係数だけを書き換え、モデルは再構築しない。
+        """
+        self._require_unpresolved("update_costs")
+        p = self._unit_index(generator_id)
+        for attribute, kind, cost in (
+            ("cost_runs", "output", cost_run),
+            ("cost_starts", "start", cost_start),
+            ("cost_stops", "stop", cost_stop),
+        ):
+            if cost is None:
+                continue
+            costs = getattr(self.input_arrays, attribute).copy()
+            costs[p] = cost
+            self.input_arrays = replace(
+                self.input_arrays, **{attribute: costs}, _input_data=None
+            )
+            setattr(self, attribute, costs.tolist())
+            if self.builder == "matrix":
+                index = self.matrix_model.index(kind, np.arange(self.num_timeseries), p)
+                self.matrix_model.objective[index] = cost
+                continue
+            variables = getattr(self, kind)
+            for t in range(self.num_timeseries):
+                self.model.objective[variables[t, p]] = cost
+
+    def fix_operation(
+        self, generator_id: str, periods: Sequence[int], operation: int | None
+    ) -> None:
+        """
+        構築済みモデルの発電機 generator_id の稼働状態を periods 期で固定する。
+        operation: 0 (停止・計画外停止), 1 (稼働),
+        None (固定を解除し、上下限を 0〜unit_counts の台数に戻す)
+        稼働状態の変数の上下限だけを書き換え、モデルは再構築しない。
+        """
+        if operation not in (0, 1, None):
+            raise ValueError("operation は 0・1・None のいずれかである必要があります")
+        self._require_unpresolved("fix_operation")
+        p = self._unit_index(generator_id)
+        periods_array = self._period_indices(periods)
+        lower, upper = (
+            (0.0, float(self.unit_counts[p]))
+            if operation is None
+            else (float(operation), float(operation))
+        )
+        if self.builder == "matrix":
+            index = self.matrix_model.index("operation", periods_array, p)
+            self.matrix_model.lower_bounds[index] = lower
+            self.matrix_model.upper_bounds[index] = upper
+            return
+        for t in periods_array.tolist():
+            self.operation[t, p].lowBound = lower
+            self.operation[t, p].upBound = upper
+
+    def resolve(
+        self, output_dir: str, threads: int | None = None
+    ) -> LpProblem | MatrixModel:
+        """
+        update_demands などで書き換えたモデルを、再構築せずに解き直す。
+        直前に解 (打ち切った探索の最良解を含む) が得られていれば、稼働状態を fix_operation の固定に合わせたうえで
+        初期解として CBC に渡す。
+        """
+        self._require_unpresolved("resolve")
+        warm_start = None
+        if self.has_solution:
+            previous = self.get_variable_values()
+            lower, upper = self._operation_bounds()
+            warm_start = complete_schedule(
+                np.clip(previous["operation"], lower, upper), previous["output"]
+            )
+        return self.solve(output_dir, threads, warm_start)
+
+    def _operation_bounds(
+        self,
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """稼働状態の変数の現在の上下限 (T, P)"""
+        shape = (self.num_timeseries, self.num_units)
+        if self.builder == "matrix":
+            index = self.matrix_model.index(
+                "operation",
+                np.arange(self.num_timeseries)[:, None],
+                np.arange(self.num_units)[None, :],
+            )
+            return (
+                self.matrix_model.lower_bounds[index],
+                self.matrix_model.upper_bounds[index],
+            )
+        lower = np.zeros(shape)
+        upper = np.ones(shape)
+        for (t, p), variable in self.operation.items():
+            lower[t, p] = variable.lowBound
+            upper[t, p] = variable.upBound
+        return lower, upper
+
+    def _require_unpresolved(self, method: str) -> None:
+        if self.fix_forced:
+            raise ValueError(f"fix_forced を指定したモデルでは {method} を使えません")
+
+    def _unit_index(self, generator_id: str) -> int:
+        if generator_id not in self.input_arrays.generator_ids:
+            raise ValueError(f"発電機 {generator_id} は存在しません")
+        return self.input_arrays.generator_ids.index(generator_id)
+
+    def _period_indices(self, periods: Sequence[int]) -> npt.NDArray[np.int64]:
+        periods_array = np.asarray(periods, dtype=np.int64)
+        if ((periods_array < 0) | (periods_array >= self.num_timeseries)).any():
+            raise ValueError(
+                f"periods は 0 以上 {self.num_timeseries} 未満である必要があります"
+            )
+        return periods_array
+
+    def solve(
+        self,
+        output_dir: str,
+        threads: int | None = None,
+        warm_start: dict[str, npt.NDArray[np.float64]] | None = None,
+    ) -> LpProblem | MatrixModel:
+        """
+        モデルを options.backend のソルバーで解き、結果を solve_result に残す。
+        threads: 指定しなければ options.threads を使う
+        warm_start: 変数種別ごとの (T, P) 配列。指定した場合はソルバーに初期解として渡す
+        """
+        self._variable_values = None
+        self._best_bound = None
+        self.stopped_early = False
+        log_path = f"{output_dir}/solver.log"
+        threads = self.options.threads if threads is None else threads
+        start = time.perf_counter()
+        result: LpProblem | MatrixModel
+        if self.presolve_result is not None and self.presolve_result.infeasible:
+            result = self._set_presolve_infeasible()
+        elif self.builder == "matrix":
+            result = self._solve_matrix(log_path, threads, warm_start)
+        else:
+            if warm_start is not None:
+                for kind in VARIABLE_KINDS:
+                    variables = getattr(self, kind)
+                    for (t, p), variable in variables.items():
+                        variable.setInitialValue(float(warm_start[kind][t, p]))
+                shortfall = demand_shortfall(self.input_arrays, warm_start["output"])
+                for t, variable in self.shortfall.items():
+                    variable.setInitialValue(float(shortfall[t]))
+            self.model.solve(
+                pulp_solver(self.options, threads, log_path, warm_start is not None)
+            )
+            self.status = self.model.status
+            self.objective_value = value(self.model.objective)
+            if self.model.sol_status == LpSolutionIntegerFeasible:
+                # 制限で打ち切った最良解は、最適性が証明されていないため Not Solved
+                self.status = LpStatusNotSolved
+            elif self.model.sol_status != LpSolutionOptimal:
+                # 整数解がない場合の値は LP 緩和などの解で、目的関数値に意味がない
+                self.objective_value = None
+            if self.options.backend == "highs":
+                self._best_bound = highs_best_bound(self.model.solverModel)
+            result = self.model
+        self.solve_result = self._solve_result(log_path, time.perf_counter() - start)
+        return result
+
+    def _solve_result(self, log_path: str, runtime_seconds: float) -> SolveResult:
+        """目的関数値・下界・ギャップをまとめる。CBC の下界はログから読む"""
+        objective_value = self.objective_value if self.has_solution else None
+        best_bound = self._best_bound
+        if best_bound is None and self.options.backend == "cbc":
+            if os.path.exists(log_path):
+                best_bound = parse_cbc_log(log_path).best_bound
+        gap = None
+        if objective_value is not None and best_bound is not None:
+            gap = abs(objective_value - best_bound) / max(abs(objective_value), 1e-10)
+        return SolveResult(
+            backend=self.options.backend,
+            status=LpStatus[self.status],
+            objective_value=objective_value,
+            best_bound=best_bound,
+            gap=gap,
+            runtime_seconds=runtime_seconds,
+        )
+
+    def _solve_matrix(
+        self,
+        log_path: str,
+        threads: int | None,
+        warm_start: dict[str, npt.NDArray[np.float64]] | None,
+    ) -> MatrixModel:
+        if self.options.backend == "highs":
+            initial_values = None
+            if warm_start is not None:
+                initial_values = self._initial_values(warm_start)
+            self.status, self.objective_value, self._best_bound, values = solve_highs(
+                self.matrix_model, self.options, threads, log_path, initial_values
+            )
+            self._add_objective_offset()
+            self._variable_values = self.matrix_model.reshape_values(values)
+            return self.matrix_model
+        options = cbc_command_options(self.options, threads)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            mps_path = os.path.join(tmp_dir, "model.mps")
+            solution_path = os.path.join(tmp_dir, "model.sol")
+            write_mps(self.matrix_model, mps_path)
+            if warm_start is not None:
+                mip_start_path = os.path.join(tmp_dir, "model.mst")
+                write_cbc_mip_start(
+                    mip_start_path,
+                    self.matrix_model.variable_names(),
+                    self._initial_values(warm_start),
+                )
+                options += ["-mips", mip_start_path]
+            if self.on_progress is None and self.stop_when is None:
+                run_cbc(mps_path, solution_path, log_path, options)
+            else:
+                self._run_cbc_streaming(mps_path, solution_path, log_path, options)
+            self.status, self.objective_value, values = read_cbc_solution(
+                solution_path,
+                self.matrix_model.num_constraints,
+                self.matrix_model.num_variables,
+            )
+            if self.status not in (LpStatusOptimal, LpStatusNotSolved):
+                # 実行不可能などの場合に解ファイルに残る値は、実行可能解のコストではない
+                self.objective_value = None
+            if os.path.exists(log_path):
+                self._best_bound = parse_cbc_log(log_path).best_bound
+        self._add_objective_offset()
+        self._variable_values = self.matrix_model.reshape_values(values)
+        return self.matrix_model
+
+    def _run_cbc_streaming(
+        self, mps_path: str, solution_path: str, log_path: str, options: list[str]
+    ) -> None:
+        """CBC のログを読みながら on_progress を呼び、stop_when で打ち切る"""
+        start = time.perf_counter()
+        offset = self.matrix_model.objective_offset
+        # 同じ値を続けて通知しないよう、最後に通知した最良解・下界・ノード数を残す
+        reported: list[tuple[float | None, float | None, int | None]] = []
+
+        def on_poll(summary: CbcLogSummary, updated: bool) -> bool:
+            progress = log_progress(summary, time.perf_counter() - start, offset)
+            key = (progress.objective_value, progress.best_bound, progress.nodes)
+            if updated and self.on_progress is not None and reported[-1:] != [key]:
+                reported.append(key)
+                self.on_progress(progress)
+            return self.stop_when is not None and self.stop_when(progress)
+
+        summary = run_cbc_streaming(mps_path, solution_path, log_path, options, on_poll)
+        # 割り込みより先に探索が終わっていれば、打ち切りにはならない
+        self.stopped_early = summary.result is not None and (
+            summary.result.startswith("User ctrl-c")
+        )
+
+    def _initial_values(
+        self, warm_start: dict[str, npt.NDArray[np.float64]]
+    ) -> npt.NDArray[np.float64]:
+        """初期解 (変数種別ごとの (T, P) 配列) を行列形式のモデルの列の並びにする"""
+        values = [warm_start[kind].ravel() for kind in VARIABLE_KINDS]
+        if self.matrix_model.shortfall:
+            values.append(demand_shortfall(self.input_arrays, warm_start["output"]))
+        return self.matrix_model.compact_values(np.concatenate(values))
+
+    def _set_presolve_infeasible(self) -> LpProblem | MatrixModel:
+        """
+        presolve_commitment で上下限が矛盾したモデルは、ソルバーに渡さずに
+        実行不可能とする (矛盾した上下限の MPS は CBC が読み込めないため)
+        """
+        shape = (self.num_timeseries, self.num_units)
+        self._variable_values = {
+            kind: np.full(shape, np.nan) for kind in VARIABLE_KINDS
+        }
+        self.status = LpStatusInfeasible
+        self.objective_value = None
+        return self.matrix_model if self.builder == "matrix" else self.model
+
+    def _add_objective_offset(self) -> None:
+        """モデルから除いた固定変数の目的関数値を、目的関数値と下界に加える"""
+        offset = self.matrix_model.objective_offset
+        if self.objective_value is not None:
+            self.objective_value += offset
+        if self._best_bound is not None:
+            self._best_bound += offset
+
+    def set_solution(
+        self,
+        values: dict[str, npt.NDArray[np.float64]],
+        status: int,
+        objective_value: float | None,
+    ) -> None:
+        """モデルを解かずに、保存済みの解 (変数種別ごとの (T, P) 配列) を設定する"""
+        shape = (self.num_timeseries, self.num_units)
+        for kind in VARIABLE_KINDS:
+            if values[kind].shape != shape:
+                raise ValueError(
+                    f"{kind} の形状 {values[kind].shape} が {shape} と一致しません"
+                )
+        self._variable_values = {kind: values[kind] for kind in VARIABLE_KINDS}
+        self.status = status
+        self.objective_value = objective_value
+
+    @property
+    def has_solution(self) -> bool:
+        """
+        解があるか。最適解のほか、制限で打ち切った探索の最良解や近似解法の解
+        (status は Not Solved で objective_value がある) も含む
+        """
+        # objective_value は解くまで (set_solution するまで) 設定されない
+        return self.status == LpStatusOptimal or (
+            self.status == LpStatusNotSolved
+            and getattr(self, "objective_value", None) is not None
+        )
+
+    def get_variable_values(self) -> dict[str, npt.NDArray[np.float64]]:
+        """
+        解を変数種別ごとの (T, P) 配列で返す。
+        値が得られなかった変数は NaN になる。
+        """
+        if self._variable_values is None:
+            # 変数ごとの value() 呼び出しを避け、varValue をまとめて配列にする
+            # (None は NaN に変換される)
+            shape = (self.num_timeseries, self.num_units)
+            self._variable_values = {}
+            for kind in VARIABLE_KINDS:
+                variables = getattr(self, kind)
+                index = np.array(list(variables.keys()), dtype=np.int64)
+                array = np.full(shape, np.nan)
+                array[index[:, 0], index[:, 1]] = np.array(
+                    [variable.varValue for variable in variables.values()],
+                    dtype=np.float64,
+                )
+                self._variable_values[kind] = array
+        return self._variable_values
@@ -0,0 +1,398 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pulp import LpProblem, LpStatusNotSolved
+
+from src.logic.warm_start import complete_schedule
+from src.models.dispatch import (
+    build_dispatch_model,
+    commit_for_demand,
+    enforce_min_times,
+    output_envelope,
+    solve_dispatch,
+)
+from src.models.matrix_builder import VARIABLE_KINDS, MatrixModel, build_matrix_model
+from src.models.solver import Solver
+from src.schemas.data_schema import InputData, SolverOptions
+from src.schemas.input_arrays import InputArrays
+
+FloatArray = npt.NDArray[np.float64]
+
+METHODS = ("extensive", "progressive_hedging")
+
+
+def build_extensive_form(
+    input_arrays: InputArrays,
+    scenario_demands: FloatArray,
+    probabilities: FloatArray,
+    formulation: str = "basic",
+) -> MatrixModel:
+    """
+    全シナリオを1つの MILP にまとめた等価確定問題 (extensive form)。
+    - 稼働・起動・停止の変数は全シナリオで共通、出力はシナリオごとに持つ
+    - 出力を含む制約 (需要・出力の上下限・ランプ) はシナリオごとに複製し、
+      需要制約の右辺をそのシナリオの需要にする。稼働・起動・停止だけの制約は1本のまま
+    - 目的関数は 起動・停止コスト + 発生確率で重み付けした各シナリオの運転コスト
+    """
+    num_scenarios = len(scenario_demands)
+    base = build_matrix_model(
+        replace(input_arrays, demands=scenario_demands[0], _input_data=None),
+        formulation=formulation,
+    )
+    size = base.num_timeseries * base.num_units
+    output_start = VARIABLE_KINDS.index("output") * size
+    is_output = (base.cols >= output_start) & (base.cols < output_start + size)
+    scenario_rows = np.unique(base.rows[is_output])
+    in_scenario = np.isin(base.rows, scenario_rows)
+    positions = np.searchsorted(scenario_rows, base.rows[in_scenario])
+    cols = base.cols[in_scenario]
+    cols_output = (cols >= output_start) & (cols < output_start + size)
+    demand_positions = np.searchsorted(scenario_rows, base.demand_rows)
+
+    # 2番目以降のシナリオの行・列 (シナリオ s の出力は base の変数の後ろに並べる)
+    s = np.arange(1, num_scenarios)[:, None]
+    extra_rows = base.num_constraints + (s - 1) * len(scenario_rows) + positions
+    extra_cols = np.where(
+        cols_output, base.num_variables + (s - 1) * size + cols - output_start, cols
+    )
+    extra_rhs = np.tile(base.rhs[scenario_rows], (num_scenarios - 1, 1))
+    extra_rhs[:, demand_positions] = scenario_demands[1:]
+
+    output = slice(output_start, output_start + size)
+    objective = base.objective.copy()
+    objective[output] *= probabilities[0]
+    return replace(
+        base,
+        rows=np.concatenate([base.rows, extra_rows.ravel()]),
+        cols=np.concatenate([base.cols, extra_cols.ravel()]),
+        coefs=np.concatenate(
+            [base.coefs, np.tile(base.coefs[in_scenario], num_scenarios - 1)]
+        ),
+        senses=np.concatenate(
+            [base.senses, np.tile(base.senses[scenario_rows], num_scenarios - 1)]
+        ),
+        rhs=np.concatenate([base.rhs, extra_rhs.ravel()]),
+        objective=np.concatenate(
+            [objective, np.outer(probabilities[1:], base.objective[output]).ravel()]
+        ),
+        lower_bounds=np.concatenate(
+            [base.lower_bounds, np.tile(base.lower_bounds[output], num_scenarios - 1)]
+        ),
+        upper_bounds=np.concatenate(
+            [base.upper_bounds, np.tile(base.upper_bounds[output], num_scenarios - 1)]
+        ),
+        is_integer=np.concatenate(
+            [base.is_integer, np.zeros((num_scenarios - 1) * size, dtype=np.bool_)]
+        ),
+        num_scenarios=num_scenarios,
+    )
+
+
+def solve_scenario_subproblem(
+    scenario_arrays: InputArrays,
+    penalties: FloatArray,
+    formulation: str,
+    options: SolverOptions,
+    warm_start: dict[str, FloatArray] | None,
+) -> dict[str, FloatArray]:
+    """
+    1シナリオ分の部分問題を CBC で解き、変数種別ごとの (T, P) 配列を返す。
+    稼働の変数の係数に penalties (T, P) を加えた起動停止問題
+    (penalties は progressive hedging の乗数と近接項を線形化したもの)。
+    """
+    solver = Solver(
+        scenario_arrays, builder="matrix", formulation=formulation, options=options
+    )
+    solver.build_model()
+    objective = solver.matrix_model.objective.copy()
+    offset = VARIABLE_KINDS.index("operation") * penalties.size
+    objective[offset : offset + penalties.size] += penalties.ravel()
+    solver.matrix_model = replace(solver.matrix_model, objective=objective)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        solver.solve(tmp_dir, threads=1, warm_start=warm_start)
+    if not solver.has_solution:
+        raise ValueError("シナリオの部分問題が解けませんでした")
+    return solver.get_variable_values()
+
+
+def dispatch_scenario(
+    scenario_arrays: InputArrays, operation: FloatArray
+) -> dict[str, FloatArray] | None:
+    """稼働計画を固定して1シナリオ分の経済負荷配分を解く (solve_dispatch を参照)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        solver = solve_dispatch(scenario_arrays, operation, tmp_dir)
+        return None if solver is None else solver.get_variable_values()
+
+
+def schedule_cost(input_arrays: InputArrays, values: dict[str, FloatArray]) -> float:
+    """運転・起動・停止コストの合計"""
+    return float(
+        (input_arrays.cost_runs * values["output"]).sum()
+        + (input_arrays.cost_starts * values["start"]).sum()
+        + (input_arrays.cost_stops * values["stop"]).sum()
+    )
+
+
+class StochasticSolver(Solver):
+    """
+    需要の不確実性を考慮する2段階確率的計画のソルバー。
+    稼働・起動・停止 (here-and-now) を全シナリオで共有し、出力 (経済負荷配分) は
+    シナリオごとに決めて、発生確率で重み付けした期待コストを最小化する。
+    method:
+    - "extensive": 全シナリオを1つの MILP (build_extensive_form) にまとめて解く
+    - "progressive_hedging": シナリオごとの部分問題をプロセスプールで並列に解き、
+      稼働状態がシナリオ間で一致するよう乗数と近接項を更新する。
+      稼働状態の平均 (合意解) からの偏差が tolerance 以下になるか max_iterations 回に
+      達したら、合意解を丸めて全シナリオの需要を満たすよう修復した稼働計画で
+      各シナリオの経済負荷配分を解く
+    近接項の重みは発電機ごとに rho_scale × (起動コスト + 最小出力での運転コスト)
+    とする。稼働はバイナリのため近接項は線形になり、部分問題は MILP のまま解ける。
+    解いた後は scenario_values に各シナリオの解 (変数種別ごとの (T, P) 配列)、
+    scenario_costs にそのコストを残す。get_variable_values の出力は発生確率で
+    重み付けした平均、objective_value は期待コストになる。
+    lower_bound は期待コストの下界で、method によって求め方が異なる。
+    - extensive: MILP の最良下界 (best_bound)。最適まで解けば期待コストと一致する
+    - progressive_hedging: 完全情報 (シナリオごとに稼働計画を決める場合) の
+      期待コスト (wait-and-see)。稼働計画の共有を外すため、最適な期待コスト以下になる
+    gap は期待コストと lower_bound の相対差。
+    """
+
+    def __init__(
+        self,
+        input_data: InputData | InputArrays,
+        scenario_demands: FloatArray,
+        probabilities: FloatArray | None = None,
+        method: str = "extensive",
+        formulation: str = "basic",
+        options: SolverOptions | None = None,
+        rho_scale: float = 1.0,
+        max_iterations: int = 50,
+        tolerance: float = 1e-3,
+    ):
+        if method not in METHODS:
+            raise ValueError(f"method は {METHODS} のいずれかである必要があります")
+        if rho_scale <= 0:
+            raise ValueError("rho_scale は正の値である必要があります")
+        if max_iterations < 1:
+            raise ValueError("max_iterations は1以上である必要があります")
+        super().__init__(
+            input_data, builder="matrix", formulation=formulation, options=options
+        )
+        scenario_demands = np.atleast_2d(np.asarray(scenario_demands, np.float64))
+        num_scenarios = len(scenario_demands)
+        if num_scenarios == 0 or scenario_demands.shape[1] != self.num_timeseries:
+            raise ValueError(
+                "scenario_demands は (シナリオ数, 期間数) の配列である必要があります"
+            )
+        if probabilities is None:
+            probabilities = np.ones(num_scenarios)
+        probabilities = np.asarray(probabilities, np.float64)
+        if (
+            probabilities.shape != (num_scenarios,)
+            or (probabilities < 0).any()
+            or probabilities.sum() <= 0
+        ):
+            raise ValueError(
+                "probabilities はシナリオと同数の0以上の値 (合計が正) "
+                "である必要があります"
+            )
+        self.scenario_demands = scenario_demands
+        self.probabilities = probabilities / probabilities.sum()
+        self.num_scenarios = num_scenarios
+        self.method = method
+        self.rho_scale = rho_scale
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.lower_bound: float | None = None
+        self.gap: float | None = None
+
+    def scenario_arrays(self, s: int) -> InputArrays:
+        """シナリオ s の需要に差し替えた入力データ"""
+        return replace(
+            self.input_arrays, demands=self.scenario_demands[s], _input_data=None
+        )
+
+    def build_model(self) -> None:
+        # progressive hedging の部分問題のモデルは solve の中で構築する
+        if self.method == "extensive":
+            self.matrix_model = build_extensive_form(
+                self.input_arrays,
+                self.scenario_demands,
+                self.probabilities,
+                formulation=self.formulation,
+            )
+
+    def model_size(self) -> dict[str, int]:
+        if self.method == "extensive":
+            return {**super().model_size(), "num_scenarios": self.num_scenarios}
+        return {"num_scenarios": self.num_scenarios}
+
+    def solve(
+        self,
+        output_dir: str,
+        threads: int | None = None,
+        warm_start: dict[str, npt.NDArray[np.float64]] | None = None,
+    ) -> LpProblem | MatrixModel:
+        """
+        threads: extensive では CBC のスレッド数、progressive_hedging では
+        部分問題を並列に解くプロセス数 (None の場合は CPU 数)
+        warm_start: 使わない (シナリオごとに初期解が異なるため)
+        """
+        if self.method == "progressive_hedging":
+            return self._progressive_hedging(output_dir, threads)
+        result = super().solve(output_dir, threads)
+        values = self.get_variable_values()
+        scenario_output = values.pop("scenario_output", values["output"][None])
+        self.scenario_values = [
+            {**values, "output": scenario_output[s]} for s in range(self.num_scenarios)
+        ]
+        values["output"] = np.tensordot(self.probabilities, scenario_output, axes=1)
+        self._set_scenario_costs()
+        assert self.solve_result is not None
+        # extensive の下界は wait-and-see ではなく MILP の最良下界
+        self.lower_bound = self.solve_result.best_bound
+        self.gap = self.solve_result.gap
+        self.iterations = 1
+        return result
+
+    def _progressive_hedging(
+        self, output_dir: str, threads: int | None
+    ) -> LpProblem | MatrixModel:
+        scenarios = [self.scenario_arrays(s) for s in range(self.num_scenarios)]
+        shape = (self.num_timeseries, self.num_units)
+        rho = self.rho_scale * (
+            self.input_arrays.cost_starts
+            + self.input_arrays.cost_runs * self.input_arrays.pmins
+        )
+        rho = np.where(rho > 0, rho, self.rho_scale)
+        weights = np.zeros((self.num_scenarios, *shape))
+        consensus = np.zeros(shape)
+        results: list[dict[str, FloatArray]] | None = None
+        self.history: list[dict[str, Any]] = []
+        # 部分問題を少しずつまとめて渡し、プロセス間のやり取りを減らす
+        workers = threads if threads is not None else os.cpu_count() or 1
+        chunksize = max(1, self.num_scenarios // (4 * workers))
+
+        with ProcessPoolExecutor(max_workers=threads) as executor:
+            for k in range(self.max_iterations):
+                # 近接項 rho/2 (x - 合意解)^2 はバイナリの x では
+                # rho (1/2 - 合意解) x + 定数 になる
+                penalties = (
+                    np.zeros_like(weights)
+                    if k == 0
+                    else weights + rho * (0.5 - consensus)
+                )
+                results = list(
+                    executor.map(
+                        solve_scenario_subproblem,
+                        scenarios,
+                        list(penalties),
+                        [self.formulation] * self.num_scenarios,
+                        [self.options] * self.num_scenarios,
+                        results or [None] * self.num_scenarios,
+                        chunksize=chunksize,
+                    )
+                )
+                operations = np.stack([values["operation"] for values in results])
+                costs = np.array(
+                    [
+                        schedule_cost(scenario, values)
+                        for scenario, values in zip(scenarios, results, strict=True)
+                    ]
+                )
+                if k == 0:
+                    # 乗数0の部分問題はシナリオごとの最適化 (完全情報) になる
+                    lower_bound = float(self.probabilities @ costs)
+                consensus = np.tensordot(self.probabilities, operations, axes=1)
+                deviation = float(
+                    self.probabilities @ np.abs(operations - consensus).sum(axis=(1, 2))
+                ) / (self.num_timeseries * self.num_units)
+                weights += rho * (operations - consensus)
+                self.history.append(
+                    {
+                        "iteration": k,
+                        "deviation": deviation,
+                        "num_disagreements": int(
+                            (operations != operations[0]).any(axis=0).sum()
+                        ),
+                        "expected_cost": float(self.probabilities @ costs),
+                    }
+                )
+                if deviation <= self.tolerance:
+                    break
+
+            # 合意解を丸め、最も大きい需要のシナリオでも満たせるよう修復する
+            # (経済負荷配分では、どのシナリオでも稼働計画が変わらない)
+            worst = replace(
+                self.input_arrays,
+                demands=self.scenario_demands.max(axis=0),
+                _input_data=None,
+            )
+            operation = commit_for_demand(
+                worst, enforce_min_times(worst, np.rint(consensus))
+            )
+            dispatched = list(
+                executor.map(
+                    dispatch_scenario,
+                    scenarios,
+                    [operation] * self.num_scenarios,
+                    chunksize=chunksize,
+                )
+            )
+
+        history_dir = os.path.join(output_dir, "progressive_hedging")
+        os.makedirs(history_dir, exist_ok=True)
+        pd.DataFrame(self.history).to_csv(
+            os.path.join(history_dir, "history.csv"), index=False
+        )
+        if any(values is None for values in dispatched):
+            raise ValueError("合意した稼働計画で需要を満たせないシナリオがあります")
+        self.scenario_values = [values for values in dispatched if values is not None]
+        self.iterations = len(self.history)
+        self._set_scenario_costs()
+        schedule = complete_schedule(operation, np.zeros_like(operation))
+        schedule["output"] = np.tensordot(
+            self.probabilities,
+            np.stack([values["output"] for values in self.scenario_values]),
+            axes=1,
+        )
+        self._variable_values = schedule
+        self.status = LpStatusNotSolved
+        self.approximate = True
+        self.objective_value = self.expected_cost
+        self.lower_bound = lower_bound
+        self.gap = (self.expected_cost - lower_bound) / max(
+            abs(self.expected_cost), 1e-10
+        )
+        # 期待需要で稼働計画を固定した経済負荷配分のモデルを返す
+        expected = replace(worst, demands=self.probabilities @ self.scenario_demands)
+        self.matrix_model = build_dispatch_model(
+            expected, operation, output_envelope(expected, operation)
+        )
+        return self.matrix_model
+
+    def _set_scenario_costs(self) -> None:
+        self.scenario_costs = np.array(
+            [
+                schedule_cost(self.input_arrays, values)
+                for values in self.scenario_values
+            ]
+        )
+        self.expected_cost = float(self.probabilities @ self.scenario_costs)
+
+    def scenario_solver(self, s: int) -> Solver:
+        """シナリオ s の解を設定した Solver (run_postprocess でそのまま集計できる)"""
+        solver = Solver(
+            self.scenario_arrays(s), builder="matrix", formulation=self.formulation
+        )
+        solver.set_solution(
+            self.scenario_values[s], self.status, float(self.scenario_costs[s])
+        )
+        solver.approximate = self.approximate
+        return solver
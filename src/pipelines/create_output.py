@@ -1,6 +1,34 @@
-from src.logic.visualize import visualize_generations
+from src.logic.export import write_schedules, write_summary
 from src.schemas.data_schema import OverallOutput
+from src.schemas.schedule_result import ScheduleResult
+from src.utils.profiler import RunProfiler, stage
 
 
-def create_output(overall_output: OverallOutput, output_dir: str) -> None:
-    visualize_generations(overall_output, output_dir)
+def create_output(
+    overall_output: OverallOutput | ScheduleResult,
+    output_dir: str,
+    export_format: str = "auto",
+    dashboard_mode: str = "auto",
+    profiler: RunProfiler | None = None,
+) -> None:
+    """
+    結果を出力する。
+    - generation_dashboard.html: 発電量の可視化
+      (scalable の場合は発電機別のパネルを generation_units_*.html に分ける。
+      dashboard_mode が "none" の場合は出力せず、plotly も読み込まない)
+    - schedules.parquet / schedules.csv: 縦持ちのスケジュール
+    - summary.json: 集計値とソルバーの状態
+    """
+    if isinstance(overall_output, OverallOutput):
+        result = ScheduleResult.from_overall_output(overall_output)
+    else:
+        result = overall_output
+    if dashboard_mode != "none":
+        with stage(profiler, "visualize"):
+            # plotly の読み込みに時間がかかるため、可視化するときだけ読み込む
+            from src.logic.visualize import visualize_generations
+
+            visualize_generations(result, output_dir, mode=dashboard_mode)
+    with stage(profiler, "export"):
+        write_schedules(result, output_dir, export_format=export_format)
+        write_summary(result, output_dir)
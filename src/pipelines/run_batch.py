@@ -0,0 +1,124 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from pulp import LpStatus, LpStatusOptimal
+
+from src.logic.scenario import apply_scenario
+from src.pipelines.run_optimization import run_optimization
+from src.pipelines.run_postprocess import run_postprocess_arrays
+from src.pipelines.run_preprocess import run_preprocess_arrays
+from src.schemas.data_schema import Scenario
+from src.utils.profiler import RunProfiler
+
+
+def run_scenario(
+    scenario: Scenario,
+    timeseries_df: pd.DataFrame,
+    generator_parameters_df: pd.DataFrame,
+    output_dir: str,
+    threads: int,
+    builder: str,
+) -> dict[str, object]:
+    """1シナリオ分の 前処理 → 最適化 → 後処理 を実行し、集計結果を1行で返す"""
+    scenario_dir = os.path.join(output_dir, scenario.name)
+    os.makedirs(scenario_dir, exist_ok=True)
+    row: dict[str, object] = {"scenario": scenario.name}
+    profiler = RunProfiler(scenario_dir)
+    start = time.perf_counter()
+    try:
+        with profiler.stage("preprocess"):
+            scenario_timeseries_df, scenario_generator_parameters_df = apply_scenario(
+                timeseries_df, generator_parameters_df, scenario
+            )
+            input_data = run_preprocess_arrays(
+                scenario_timeseries_df, scenario_generator_parameters_df
+            )
+        with profiler.stage("optimization"):
+            model_output = run_optimization(
+                input_data,
+                scenario_dir,
+                builder=builder,
+                threads=threads,
+                profiler=profiler,
+            )
+        if model_output.status != LpStatusOptimal:
+            raise ValueError(
+                f"最適解が得られませんでした (status={LpStatus[model_output.status]})"
+            )
+        with profiler.stage("postprocess"):
+            overall_output = run_postprocess_arrays(model_output, input_data)
+    except Exception as e:
+        # 1シナリオの失敗でバッチ全体を止めない
+        row.update(status="failed", error=f"{type(e).__name__}: {e}")
+    else:
+        row.update(
+            status="ok",
+            overall_cost=overall_output.overall_cost,
+            overall_output=overall_output.overall_output,
+            overall_operation_days=overall_output.overall_operation_days,
+            overall_start_days=overall_output.overall_start_days,
+            overall_stop_days=overall_output.overall_stop_days,
+            error=None,
+        )
+    row["seconds"] = time.perf_counter() - start
+    profiler.write_report()
+    return row
+
+
+def run_batch(
+    scenarios: list[Scenario],
+    timeseries_df: pd.DataFrame,
+    generator_parameters_df: pd.DataFrame,
+    output_dir: str,
+    max_workers: int | None = None,
+    threads_per_worker: int = 1,
+    builder: str = "pulp",
+) -> pd.DataFrame:
+    """
+    シナリオをプロセスプールで並列に解き、結果を1つの集計表にまとめる。
+    CBCのスレッド数を threads_per_worker に制限し、
+    ワーカー数の既定値は CPU コア数 / threads_per_worker とする。
+    """
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 1) // threads_per_worker)
+    os.makedirs(output_dir, exist_ok=True)
+
+    rows: list[dict[str, object]] = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            scenario.name: executor.submit(
+                run_scenario,
+                scenario,
+                timeseries_df,
+                generator_parameters_df,
+                output_dir,
+                threads_per_worker,
+                builder,
+            )
+            for scenario in scenarios
+        }
+        for name, future in futures.items():
+            try:
+                rows.append(future.result())
+            except Exception as e:
+                # ワーカープロセス自体が異常終了した場合
+                rows.append({"scenario": name, "status": "failed", "error": f"{e!r}"})
+
+    summary = pd.DataFrame(
+        rows,
+        columns=[
+            "scenario",
+            "status",
+            "overall_cost",
+            "overall_output",
+            "overall_operation_days",
+            "overall_start_days",
+            "overall_stop_days",
+            "seconds",
+            "error",
+        ],
+    )
+    summary.to_csv(os.path.join(output_dir, "summary.csv"), index=False)
+    return summary
@@ -1,9 +1,262 @@
+import os
+
+import numpy as np
+import numpy.typing as npt
+from pulp import LpStatus, LpStatusOptimal
+
+from src.logic.feasibility import (
+    TOLERANCE,
+    check_feasibility,
+    demand_shortfall,
+    format_issues,
+)
+from src.logic.solve_cache import SolveCache, input_fingerprint
+from src.models.aggregated import AggregatedSolver
+from src.models.cbc import parse_cbc_log
+from src.models.grouped import GroupedSolver
+from src.models.heuristic import HeuristicSolver
+from src.models.lagrangian import LagrangianSolver
+from src.models.progress import ProgressCallback, StopPredicate
+from src.models.rolling_horizon import RollingHorizonSolver
 from src.models.solver import Solver
-from src.schemas.data_schema import InputData
+from src.schemas.data_schema import InputData, SolverOptions
+from src.schemas.input_arrays import InputArrays
+from src.utils.profiler import RunProfiler, stage
+
+METHODS = ("monolithic", "lagrangian", "heuristic")
+
 
+def run_optimization(
+    input_data: InputData | InputArrays,
+    output_dir: str,
+    builder: str = "pulp",
+    formulation: str = "basic",
+    method: str = "monolithic",
+    window: int | None = None,
+    lookahead: int = 0,
+    block_length: int | None = None,
+    group_units: bool = False,
+    fix_forced: bool = False,
+    shortfall_penalty: float | None = None,
+    on_progress: ProgressCallback | None = None,
+    stop_when: StopPredicate | None = None,
+    threads: int | None = None,
+    options: SolverOptions | None = None,
+    warm_start: dict[str, npt.NDArray[np.float64]] | None = None,
+    cache: SolveCache | None = None,
+    profiler: RunProfiler | None = None,
+) -> Solver:
+    """
+    最適化を実行する。
+    method:
+    - "monolithic": window を指定しなければ全期間を1つのモデルで、
+      指定すればローリングホライズンで解く
+    - "lagrangian": 需要制約をラグランジュ緩和し、発電機ごとに分解して解く
+      (threads は部分問題を並列に解くプロセス数になる)
+    - "heuristic": CBC を使わず、優先順位法で近似解を数ミリ秒で作る
+    block_length を指定した場合は、連続する block_length 期を1期にまとめた
+    縮約モデルで解き、全期間に展開する
+    (window・lagrangian・heuristic とは併用できない)。
+    group_units を指定した場合は、パラメータが同じ発電機をまとめて台数の整数変数で
+    解き、発電機ごとに割り当て直す (monolithic の一括求解でのみ使える)。
+    fix_forced を指定した場合は、需要・ランプ・最低稼働停止期間から稼働・停止が
+    確定する変数を構築前に固定する (monolithic の一括求解でのみ使える)。
+    構築前に check_feasibility で入力データを調べ、需要を満たせない期があれば
+    原因を並べた ValueError を投げる。shortfall_penalty を指定した場合は代わりに
+    需要の不足を許して解き、不足が残る期を solver_report に記録する
+    (monolithic の一括求解でのみ使える)。
+    on_progress・stop_when を指定した場合は、求解中の最良解・下界・ギャップを
+    on_progress に渡し、stop_when を満たした時点の最良解で打ち切る
+    (monolithic の一括求解で builder が matrix、backend が cbc の場合のみ)。
+    打ち切った解はキャッシュに保存しない。
+    options でソルバー・制限時間・MIPギャップなどを指定する
+    (lagrangian・heuristic では使わない)。
+    threads を指定した場合は options.threads より優先する。
+    cache を指定した場合、入力データと設定が同じ最適解があればモデルの構築・求解を
+    省略してそれを返し、新たに得た最適解はキャッシュに保存する。
+    threads と warm_start は解の探索方法にしか影響しないため、キーに含めない
+    (制限時間などで解が変わりうるため、options はスレッド数以外をキーに含める)。
+    profiler を指定した場合、build_model / solve の計測とモデル規模・
+    ソルバーの結果を記録する。
+    """
+    if method not in METHODS:
+        raise ValueError(f"method は {METHODS} のいずれかである必要があります")
+    if block_length is not None and (method != "monolithic" or window is not None):
+        raise ValueError(
+            "block_length は lagrangian・heuristic・window と併用できません"
+        )
+    if group_units and (
+        method != "monolithic" or window is not None or block_length is not None
+    ):
+        raise ValueError("group_units は monolithic の一括求解でのみ使えます")
+    if fix_forced and (
+        method != "monolithic"
+        or window is not None
+        or block_length is not None
+        or group_units
+    ):
+        raise ValueError("fix_forced は monolithic の一括求解でのみ使えます")
+    if shortfall_penalty is not None and (
+        method != "monolithic"
+        or window is not None
+        or block_length is not None
+        or group_units
+    ):
+        raise ValueError("shortfall_penalty は monolithic の一括求解でのみ使えます")
+    if (on_progress is not None or stop_when is not None) and (
+        method != "monolithic"
+        or window is not None
+        or block_length is not None
+        or group_units
+    ):
+        raise ValueError(
+            "on_progress・stop_when は monolithic の一括求解でのみ使えます"
+        )
+    if method == "heuristic":
+        if window is not None:
+            raise ValueError("heuristic では window を指定できません")
+        solver: Solver = HeuristicSolver(input_data)
+    elif method == "lagrangian":
+        if window is not None:
+            raise ValueError("lagrangian では window を指定できません")
+        solver = LagrangianSolver(input_data, formulation=formulation)
+    elif block_length is not None:
+        solver = AggregatedSolver(
+            input_data,
+            block_length,
+            builder=builder,
+            formulation=formulation,
+            options=options,
+        )
+    elif window is not None:
+        solver = RollingHorizonSolver(
+            input_data,
+            window,
+            lookahead,
+            builder=builder,
+            formulation=formulation,
+            options=options,
+        )
+    elif group_units:
+        solver = GroupedSolver(
+            input_data, builder=builder, formulation=formulation, options=options
+        )
+    else:
+        solver = Solver(
+            input_data,
+            builder=builder,
+            formulation=formulation,
+            options=options,
+            fix_forced=fix_forced,
+            shortfall_penalty=shortfall_penalty,
+            on_progress=on_progress,
+            stop_when=stop_when,
+        )
 
-def run_optimization(input_data: InputData, output_dir: str) -> Solver:
-    solver = Solver(input_data)
-    solver.build_model()
-    solver.solve(output_dir)
+    issues = check_feasibility(solver.input_arrays)
+    if profiler is not None:
+        profiler.record(
+            "feasibility", {"issues": [issue.model_dump() for issue in issues]}
+        )
+    if issues and shortfall_penalty is None:
+        raise ValueError(format_issues(issues))
+
+    if cache is not None:
+        key = input_fingerprint(
+            solver.input_arrays,
+            {
+                "builder": builder,
+                "formulation": formulation,
+                "method": method,
+                "window": window,
+                "lookahead": lookahead,
+                "block_length": block_length,
+                "group_units": group_units,
+                "fix_forced": fix_forced,
+                "shortfall_penalty": shortfall_penalty,
+                **solver.options.model_dump(exclude={"threads"}, exclude_defaults=True),
+            },
+        )
+        cached = cache.load(key)
+        if cached is not None:
+            solver.set_solution(cached.values, cached.status, cached.objective_value)
+            if profiler is not None:
+                profiler.record("solver", solver_report(solver, cache_hit=True))
+            return solver
+
+    with stage(profiler, "build_model"):
+        solver.build_model()
+    with stage(profiler, "solve"):
+        solver.solve(output_dir, threads, warm_start)
+    if profiler is not None:
+        profiler.record("model", solver.model_size())
+        # CBC 以外のログは形式が異なるため読まない
+        log_path = os.path.join(output_dir, "solver.log")
+        has_cbc_log = solver.options.backend == "cbc" and os.path.exists(log_path)
+        profiler.record(
+            "solver",
+            solver_report(solver, log_path=log_path if has_cbc_log else None),
+        )
+    if (
+        cache is not None
+        and solver.status == LpStatusOptimal
+        and not solver.stopped_early
+    ):
+        cache.store(
+            key, solver.get_variable_values(), solver.status, solver.objective_value
+        )
     return solver
+
+
+def solver_report(
+    solver: Solver, log_path: str | None = None, cache_hit: bool = False
+) -> dict[str, object]:
+    """
+    ソルバーの状態・目的関数値と、CBC のログから読み取ったギャップ・ノード数。
+    CBC 以外のバックエンドでは solve_result の下界・ギャップを使う
+    """
+    report: dict[str, object] = {
+        "status": LpStatus[solver.status],
+        "objective_value": solver.objective_value,
+        "backend": solver.options.backend,
+        "cache_hit": cache_hit,
+        "stopped_early": solver.stopped_early,
+        "approximate": solver.approximate,
+    }
+    if solver.solve_result is not None and not cache_hit:
+        report.update(
+            backend=solver.solve_result.backend,
+            best_bound=solver.solve_result.best_bound,
+            gap=solver.solve_result.gap,
+            runtime_seconds=solver.solve_result.runtime_seconds,
+        )
+    if log_path is not None:
+        summary = parse_cbc_log(log_path)
+        report.update(
+            root_gap=summary.root_gap, nodes=summary.nodes, result=summary.result
+        )
+        # 下界・ギャップは、モデルから除いた固定変数の分を加えた solve_result を優先する
+        report.setdefault("best_bound", summary.best_bound)
+        report.setdefault("gap", summary.gap)
+    if solver.shortfall_penalty is not None:
+        shortfall = demand_shortfall(
+            solver.input_arrays, solver.get_variable_values()["output"]
+        )
+        short = shortfall > TOLERANCE
+        report.update(
+            shortfall_periods=solver.input_arrays.date_indices[short].tolist(),
+            total_shortfall=float(shortfall[short].sum()),
+        )
+    if isinstance(solver, LagrangianSolver) and not cache_hit:
+        report.update(
+            lower_bound=solver.lower_bound,
+            gap=solver.gap,
+            iterations=solver.iterations,
+        )
+    if isinstance(solver, AggregatedSolver) and not cache_hit:
+        report.update(aggregated_objective=solver.aggregated_objective)
+    if isinstance(solver, GroupedSolver) and not cache_hit:
+        report.update(
+            num_groups=len(solver.groups), grouped_objective=solver.grouped_objective
+        )
+    return report
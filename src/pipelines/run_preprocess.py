@@ -2,9 +2,11 @@ import pandas as pd
 
 from src.logic.preprocess import (
     preprocess_generator_parameters,
+    preprocess_input_arrays,
     preprocess_timeseries_data,
 )
 from src.schemas.data_schema import InputData
+from src.schemas.input_arrays import InputArrays
 
 
 def run_preprocess(
@@ -16,3 +18,9 @@ def run_preprocess(
         timeseries=timeseries, generator_parameters=generator_parameters
     )
     return input_data
+
+
+def run_preprocess_arrays(
+    timeseries_df: pd.DataFrame, generator_parameters_df: pd.DataFrame
+) -> InputArrays:
+    return preprocess_input_arrays(timeseries_df, generator_parameters_df)
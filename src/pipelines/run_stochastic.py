@@ -0,0 +1,99 @@
+import os
+from dataclasses import replace
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from pulp import LpStatus
+
+from src.logic.feasibility import check_feasibility, format_issues
+from src.models.stochastic import StochasticSolver
+from src.pipelines.run_postprocess import run_postprocess_arrays
+from src.schemas.data_schema import InputData, SolverOptions
+from src.schemas.input_arrays import InputArrays, as_input_arrays
+from src.utils.profiler import RunProfiler, stage
+
+
+def run_stochastic(
+    input_data: InputData | InputArrays,
+    scenario_demands: npt.NDArray[np.float64],
+    output_dir: str,
+    probabilities: npt.NDArray[np.float64] | None = None,
+    names: list[str] | None = None,
+    method: str = "extensive",
+    formulation: str = "basic",
+    threads: int | None = None,
+    options: SolverOptions | None = None,
+    profiler: RunProfiler | None = None,
+) -> tuple[StochasticSolver, pd.DataFrame]:
+    """
+    需要シナリオ (S, T) に対して2段階確率的計画を解く (StochasticSolver を参照)。
+    稼働計画は全シナリオの需要を満たす必要があるため、シナリオごとの最大需要で
+    check_feasibility を行い、満たせない期があれば ValueError を投げる。
+    戻り値: (稼働計画と期待出力を持つソルバー, シナリオごとの集計表)。
+    集計表は output_dir の scenarios.csv にも書き出す。
+    """
+    input_arrays = as_input_arrays(input_data)
+    scenario_demands = np.atleast_2d(scenario_demands)
+    if names is None:
+        names = [f"scenario_{s}" for s in range(len(scenario_demands))]
+    if len(names) != len(scenario_demands):
+        raise ValueError("names はシナリオと同数である必要があります")
+    issues = check_feasibility(
+        replace(input_arrays, demands=scenario_demands.max(axis=0), _input_data=None)
+    )
+    if issues:
+        raise ValueError(format_issues(issues))
+
+    solver = StochasticSolver(
+        input_arrays,
+        scenario_demands,
+        probabilities=probabilities,
+        method=method,
+        formulation=formulation,
+        options=options,
+    )
+    with stage(profiler, "build_model"):
+        solver.build_model()
+    with stage(profiler, "solve"):
+        solver.solve(output_dir, threads)
+    if profiler is not None:
+        profiler.record("model", solver.model_size())
+        profiler.record(
+            "solver",
+            {
+                "status": LpStatus[solver.status],
+                "approximate": solver.approximate,
+                "method": method,
+                "objective_value": solver.objective_value,
+                "lower_bound": solver.lower_bound,
+                # 下界の求め方は method で異なる (StochasticSolver を参照)
+                "lower_bound_kind": "best_bound"
+                if method == "extensive"
+                else "wait_and_see",
+                "gap": solver.gap,
+                "iterations": solver.iterations,
+                "num_scenarios": solver.num_scenarios,
+            },
+        )
+
+    rows = []
+    for s, name in enumerate(names):
+        result = run_postprocess_arrays(
+            solver.scenario_solver(s), solver.scenario_arrays(s)
+        )
+        rows.append(
+            {
+                "scenario": name,
+                "probability": float(solver.probabilities[s]),
+                "overall_cost": result.overall_cost,
+                "overall_output": result.overall_output,
+                "overall_operation_days": result.overall_operation_days,
+                "overall_start_days": result.overall_start_days,
+                "overall_stop_days": result.overall_stop_days,
+            }
+        )
+    summary = pd.DataFrame(rows)
+    os.makedirs(output_dir, exist_ok=True)
+    summary.to_csv(os.path.join(output_dir, "scenarios.csv"), index=False)
+    return solver, summary
@@ -0,0 +1,334 @@
+import json
+import math
+import multiprocessing
+import multiprocessing.forkserver
+import os
+import queue
+import shutil
+import signal
+import socketserver
+import threading
+import uuid
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from pulp import LpStatus
+from pydantic import ValidationError
+
+from src.logic.solve_cache import SolveCache
+from src.pipelines.run_optimization import run_optimization, solver_report
+from src.pipelines.run_postprocess import run_postprocess_arrays
+from src.schemas.data_schema import SolveJobRequest, SolveJobStatus
+from src.schemas.input_arrays import as_input_arrays
+
+RESULT_FILE = "overall_output.json"
+SOLVER_FILE = "solver.json"
+ERROR_FILE = "error.txt"
+
+
+def run_job(request: SolveJobRequest, job_dir: str, cache_dir: str) -> None:
+    """
+    1ジョブ分の 最適化 → 後処理 を子プロセスで実行し、結果を job_dir に書き出す。
+    - 成功: OverallOutput を overall_output.json に、ソルバーの状態・下界・ギャップを
+      solver.json に書く。最適性の保証のない解 (近似解法の解・制限で打ち切った
+      探索の最良解) も返し、SolveJobStatus の solver_status・approximate で区別する
+    - 失敗: 理由を error.txt に書いて異常終了する
+    制限時間を超えた場合に CBC ごと止められるよう、新しいセッションで実行する。
+    """
+    os.setsid()
+    try:
+        input_arrays = as_input_arrays(request.input_data)
+        model_output = run_optimization(
+            input_arrays,
+            job_dir,
+            builder=request.builder,
+            formulation=request.formulation,
+            method=request.method,
+            threads=request.options.threads or 1,
+            options=request.options,
+            cache=SolveCache(cache_dir),
+        )
+        if not model_output.has_solution:
+            raise ValueError(
+                f"解が得られませんでした (status={LpStatus[model_output.status]})"
+            )
+        result = run_postprocess_arrays(model_output, input_arrays)
+        report = solver_report(model_output)
+        # ラグランジュ緩和の下界は solve_result ではなく lower_bound にある
+        solver_info = {
+            "solver_status": report["status"],
+            "approximate": report["approximate"],
+            "objective_value": report["objective_value"],
+            "best_bound": report.get("lower_bound", report.get("best_bound")),
+            "gap": report.get("gap"),
+        }
+        with open(os.path.join(job_dir, SOLVER_FILE), "w", encoding="utf-8") as f:
+            json.dump(solver_info, f)
+        tmp_path = os.path.join(job_dir, f"{RESULT_FILE}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(result.to_overall_output().model_dump_json())
+        os.replace(tmp_path, os.path.join(job_dir, RESULT_FILE))
+    except Exception as e:
+        with open(os.path.join(job_dir, ERROR_FILE), "w", encoding="utf-8") as f:
+            f.write(f"{type(e).__name__}: {e}")
+        raise SystemExit(1) from e
+
+
+class JobQueue:
+    """
+    求解ジョブの待ち行列。
+    - concurrency 個のワーカースレッドがジョブを受付順に取り出し、それぞれ子プロセスで解く
+    - 子プロセスは import 済みの forkserver から作るため、起動のたびの import は不要
+    - time_limit を超えたジョブは子プロセス (CBC を含む) ごと停止し timeout とする
+    - ジョブの結果は output_dir/<job_id>/ に、解のキャッシュは output_dir/cache に置く
+    - 終了したジョブが retain 件を超えたら、終了の古い順に状態と結果を削除する
+    """
+
+    def __init__(self, output_dir: str, concurrency: int = 1, retain: int = 1000):
+        if concurrency < 1:
+            raise ValueError("concurrency は1以上である必要があります")
+        if retain < 1:
+            raise ValueError("retain は1以上である必要があります")
+        self.output_dir = output_dir
+        self.retain = retain
+        self.cache_dir = os.path.join(output_dir, "cache")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._context = multiprocessing.get_context("forkserver")
+        self._context.set_forkserver_preload([__name__])
+        # 最初のジョブで import を待たないよう、forkserver を先に起動しておく
+        multiprocessing.forkserver.ensure_running()
+        self._lock = threading.Lock()
+        self._jobs: dict[str, SolveJobStatus] = {}
+        self._requests: dict[str, SolveJobRequest] = {}
+        self._finished: dict[str, threading.Event] = {}
+        self._pending: queue.Queue[str | None] = queue.Queue()
+        self._workers = [
+            threading.Thread(target=self._work, daemon=True) for _ in range(concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, request: SolveJobRequest) -> SolveJobStatus:
+        job_id = uuid.uuid4().hex
+        job = SolveJobStatus(job_id=job_id, status="queued", submitted_at=now())
+        with self._lock:
+            self._jobs[job_id] = job
+            self._requests[job_id] = request
+            self._finished[job_id] = threading.Event()
+        self._pending.put(job_id)
+        return job
+
+    def status(self, job_id: str) -> SolveJobStatus | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def statuses(self) -> list[SolveJobStatus]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def wait(self, job_id: str, timeout: float | None = None) -> SolveJobStatus | None:
+        """ジョブが終わるか timeout 秒経つまで待ち、その時点の状態を返す"""
+        finished = self._finished.get(job_id)
+        if finished is None:
+            return None
+        finished.wait(timeout)
+        return self.status(job_id)
+
+    def result_path(self, job_id: str) -> str:
+        return os.path.join(self.output_dir, job_id, RESULT_FILE)
+
+    def shutdown(self) -> None:
+        """受付済みのジョブを解き終えてからワーカーを止める"""
+        for _ in self._workers:
+            self._pending.put(None)
+        for worker in self._workers:
+            worker.join()
+
+    def _update(self, job_id: str, **fields: object) -> None:
+        with self._lock:
+            self._jobs[job_id] = self._jobs[job_id].model_copy(update=fields)
+
+    def _work(self) -> None:
+        while (job_id := self._pending.get()) is not None:
+            with self._lock:
+                request = self._requests.pop(job_id)
+            job_dir = os.path.join(self.output_dir, job_id)
+            os.makedirs(job_dir, exist_ok=True)
+            self._update(job_id, status="running", started_at=now())
+            process = self._context.Process(
+                target=run_job, args=(request, job_dir, self.cache_dir)
+            )
+            process.start()
+            process.join(request.time_limit)
+            if process.is_alive():
+                stop_process_group(process.pid)
+                process.join()
+                self._update(
+                    job_id,
+                    status="timeout",
+                    finished_at=now(),
+                    error=f"制限時間 {request.time_limit} 秒を超えました",
+                )
+            elif process.exitcode == 0:
+                with open(os.path.join(job_dir, SOLVER_FILE), encoding="utf-8") as f:
+                    solver_info = json.load(f)
+                self._update(job_id, status="done", finished_at=now(), **solver_info)
+            else:
+                error_path = os.path.join(job_dir, ERROR_FILE)
+                error = f"終了コード {process.exitcode}"
+                if os.path.exists(error_path):
+                    with open(error_path, encoding="utf-8") as f:
+                        error = f.read()
+                self._update(job_id, status="failed", finished_at=now(), error=error)
+            self._finished[job_id].set()
+            self._evict()
+
+    def _evict(self) -> None:
+        """終了したジョブのうち、新しい retain 件より古いものの状態と結果を削除する"""
+        with self._lock:
+            finished = sorted(
+                (job for job in self._jobs.values() if job.finished_at is not None),
+                key=lambda job: job.finished_at or job.submitted_at,
+            )
+            expired = [job.job_id for job in finished[: -self.retain]]
+            for job_id in expired:
+                del self._jobs[job_id]
+                del self._finished[job_id]
+        for job_id in expired:
+            shutil.rmtree(os.path.join(self.output_dir, job_id), ignore_errors=True)
+
+
+def now() -> datetime:
+    return datetime.now()
+
+
+def stop_process_group(pid: int | None) -> None:
+    """子プロセスと、そこから起動した CBC をまとめて止める"""
+    if pid is None:
+        return
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # setsid の前に止める場合はプロセスグループがまだない
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def parse_wait(value: str) -> float | None:
+    """クエリの wait (秒) を読む。0以上の有限の数でなければ None"""
+    try:
+        wait = float(value)
+    except ValueError:
+        return None
+    return wait if math.isfinite(wait) and wait >= 0 else None
+
+
+def make_handler(jobs: JobQueue) -> type[BaseHTTPRequestHandler]:
+    """
+    JobQueue を操作する HTTP ハンドラ。
+    - POST /jobs: SolveJobRequest の JSON を受け付け、ジョブの状態を返す (202)
+    - GET /jobs: 全ジョブの状態
+    - GET /jobs/<job_id>: ジョブの状態
+    - GET /jobs/<job_id>/result?wait=<秒>: 終了まで最大 wait 秒待ち、
+      成功していれば OverallOutput の JSON をそのまま流す。
+      未終了なら 202、失敗・打ち切りなら 409 で状態を返す
+      (wait が0以上の有限の秒数でなければ 400)
+    """
+
+    class SolveJobHandler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            if urlparse(self.path).path != "/jobs":
+                self.send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+                return
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            try:
+                request = SolveJobRequest.model_validate_json(body)
+            except ValidationError as e:
+                self.send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+                return
+            job = jobs.submit(request)
+            self.send_json(HTTPStatus.ACCEPTED, job.model_dump(mode="json"))
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            parts = url.path.strip("/").split("/")
+            if parts == ["jobs"]:
+                self.send_json(
+                    HTTPStatus.OK,
+                    [job.model_dump(mode="json") for job in jobs.statuses()],
+                )
+                return
+            if parts[0] != "jobs" or len(parts) not in (2, 3):
+                self.send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+                return
+            job_id = parts[1]
+            if len(parts) == 2:
+                job = jobs.status(job_id)
+            elif parts[2] == "result":
+                wait = parse_wait(parse_qs(url.query).get("wait", ["0"])[0])
+                if wait is None:
+                    self.send_json(
+                        HTTPStatus.BAD_REQUEST,
+                        {"error": "wait は0以上の秒数である必要があります"},
+                    )
+                    return
+                job = jobs.wait(job_id, wait)
+            else:
+                job = None
+            if job is None:
+                self.send_json(HTTPStatus.NOT_FOUND, {"error": "not found"})
+            elif len(parts) == 2:
+                self.send_json(HTTPStatus.OK, job.model_dump(mode="json"))
+            elif job.status == "done":
+                self.send_file(jobs.result_path(job_id))
+            elif job.status in ("queued", "running"):
+                self.send_json(HTTPStatus.ACCEPTED, job.model_dump(mode="json"))
+            else:
+                self.send_json(HTTPStatus.CONFLICT, job.model_dump(mode="json"))
+
+        def send_json(self, status: HTTPStatus, body: object) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def send_file(self, path: str) -> None:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(os.path.getsize(path)))
+            self.end_headers()
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, self.wfile)
+
+        def log_message(self, format: str, *args: object) -> None:
+            # アクセスログは出さない (Unix ソケットでは接続元アドレスもない)
+            pass
+
+    return SolveJobHandler
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix ソケットで待ち受ける HTTP サーバー"""
+
+    daemon_threads = True
+
+
+def create_server(
+    jobs: JobQueue,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    socket_path: str | None = None,
+) -> socketserver.BaseServer:
+    """socket_path を指定した場合は Unix ソケット、しなければ host:port で待ち受ける"""
+    handler = make_handler(jobs)
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        return UnixHTTPServer(socket_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
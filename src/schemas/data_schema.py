@@ -1,7 +1,17 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field, field_validator
 
+# GeneratorParameters の非負制約とそのエラーメッセージ
+NON_NEGATIVE_MESSAGES = {
+    "pmin": "最小出力は0以上である必要があります",
+    "pmax": "最大出力は0以上である必要があります",
+    "cost_run": "運転コストは0以上である必要があります",
+    "cost_start": "起動コストは0以上である必要があります",
+    "cost_stop": "停止コストは0以上である必要があります",
+}
+
 
 class InputTimeSeriesData(BaseModel):
     date: datetime = Field(..., description="日付 (YYYY-MM-DD)")
@@ -25,35 +35,35 @@ class GeneratorParameters(BaseModel):
     @classmethod
     def validate_pmin(cls, v: float) -> float:
         if v < 0:
-            raise ValueError("最小出力は0以上である必要があります")
+            raise ValueError(NON_NEGATIVE_MESSAGES["pmin"])
         return v
 
     @field_validator("pmax")
     @classmethod
     def validate_pmax(cls, v: float) -> float:
         if v < 0:
-            raise ValueError("最大出力は0以上である必要があります")
+            raise ValueError(NON_NEGATIVE_MESSAGES["pmax"])
         return v
 
     @field_validator("cost_run")
     @classmethod
     def validate_cost_run(cls, v: float) -> float:
         if v < 0:
-            raise ValueError("運転コストは0以上である必要があります")
+            raise ValueError(NON_NEGATIVE_MESSAGES["cost_run"])
         return v
 
     @field_validator("cost_start")
     @classmethod
     def validate_cost_start(cls, v: float) -> float:
         if v < 0:
-            raise ValueError("起動コストは0以上である必要があります")
+            raise ValueError(NON_NEGATIVE_MESSAGES["cost_start"])
         return v
 
     @field_validator("cost_stop")
     @classmethod
     def validate_cost_stop(cls, v: float) -> float:
         if v < 0:
-            raise ValueError("停止コストは0以上である必要があります")
+            raise ValueError(NON_NEGATIVE_MESSAGES["cost_stop"])
         return v
 
 
@@ -64,6 +74,150 @@ class InputData(BaseModel):
     )
 
 
+class UnitInitialState(BaseModel):
+    operation: int = Field(..., description="直前期の稼働状態 (0: 停止, 1: 稼働)")
+    duration: int = Field(..., description="直前期までの連続稼働/停止期間")
+    output: float = Field(..., description="直前期の出力 (MW)")
+
+
+class Scenario(BaseModel):
+    name: str = Field(..., description="シナリオ名")
+    demand_scale: float = Field(1.0, description="需要の倍率")
+    cost_run_scale: float = Field(1.0, description="全発電機の運転コストの倍率")
+    cost_run_scales: dict[str, float] = Field(
+        default_factory=dict, description="発電機IDごとの運転コストの倍率"
+    )
+    outages: list[str] = Field(
+        default_factory=list, description="計画外停止とする発電機IDのリスト"
+    )
+    probability: float = Field(
+        1.0,
+        description="確率的計画で使う発生確率の重み (全シナリオの合計で正規化する)",
+    )
+
+    @field_validator("demand_scale", "cost_run_scale")
+    @classmethod
+    def validate_scale(cls, v: float) -> float:
+        if v < 0:
+            raise ValueError("倍率は0以上である必要があります")
+        return v
+
+    @field_validator("probability")
+    @classmethod
+    def validate_probability(cls, v: float) -> float:
+        if v < 0:
+            raise ValueError("発生確率は0以上である必要があります")
+        return v
+
+
+class SolverOptions(BaseModel):
+    backend: str = Field(
+        "cbc", description="ソルバー (cbc / highs / PuLP のソルバー名)"
+    )
+    time_limit: float | None = Field(None, description="求解の制限時間 (秒)")
+    mip_gap: float | None = Field(
+        None, description="この相対ギャップ以下になったら探索を打ち切る"
+    )
+    threads: int | None = Field(None, description="ソルバーのスレッド数")
+    presolve: bool = Field(True, description="前処理 (presolve) を行うか")
+    node_limit: int | None = Field(None, description="探索ノード数の上限")
+
+    @field_validator("time_limit", "mip_gap")
+    @classmethod
+    def validate_non_negative(cls, v: float | None) -> float | None:
+        if v is not None and v < 0:
+            raise ValueError("0以上である必要があります")
+        return v
+
+    @field_validator("threads", "node_limit")
+    @classmethod
+    def validate_positive(cls, v: int | None) -> int | None:
+        if v is not None and v < 1:
+            raise ValueError("1以上である必要があります")
+        return v
+
+
+class SolveResult(BaseModel):
+    backend: str = Field(..., description="使用したソルバー")
+    status: str = Field(
+        ...,
+        description="ソルバーの状態 (PuLP の LpStatus)。"
+        "制限で打ち切った場合は最良解があっても Not Solved",
+    )
+    objective_value: float | None = Field(
+        None, description="目的関数値 (円)。打ち切った場合は最良解の値"
+    )
+    best_bound: float | None = Field(None, description="目的関数値の下界 (円)")
+    gap: float | None = Field(None, description="目的関数値と下界の相対ギャップ")
+    runtime_seconds: float = Field(..., description="求解時間 (秒)")
+
+
+class SolveProgress(BaseModel):
+    objective_value: float | None = Field(
+        None, description="これまでの最良解の目的関数値 (円)"
+    )
+    best_bound: float | None = Field(None, description="目的関数値の下界 (円)")
+    gap: float | None = Field(None, description="最良解と下界の相対ギャップ")
+    nodes: int | None = Field(None, description="探索したノード数")
+    elapsed_seconds: float = Field(..., description="求解開始からの経過時間 (秒)")
+
+
+class FeasibilityIssue(BaseModel):
+    kind: Literal["capacity", "ramp", "min_up_down"] = Field(
+        ..., description="原因 (供給力 / ランプ制約 / 最低稼働・停止期間)"
+    )
+    date_index: int = Field(..., description="実行不可能な期の日付インデックス")
+    generator_id: str | None = Field(
+        None, description="原因の発電機ID (期全体の供給力不足の場合は None)"
+    )
+    required: float = Field(..., description="必要な出力 (MW)")
+    available: float = Field(..., description="出せる出力の上限 (MW)")
+    message: str = Field(..., description="内容")
+
+
+class SolveJobRequest(BaseModel):
+    input_data: InputData = Field(..., description="入力データ")
+    builder: str = Field("pulp", description="モデルの構築方法 (pulp / matrix)")
+    formulation: str = Field("basic", description="定式化 (basic / tight)")
+    method: str = Field(
+        "monolithic", description="解法 (monolithic / lagrangian / heuristic)"
+    )
+    options: SolverOptions = Field(
+        default_factory=SolverOptions, description="ソルバーの設定"
+    )
+    time_limit: float | None = Field(
+        None, description="ジョブの制限時間 (秒)。超えた場合は打ち切る"
+    )
+
+    @field_validator("time_limit")
+    @classmethod
+    def validate_time_limit(cls, v: float | None) -> float | None:
+        if v is not None and v <= 0:
+            raise ValueError("制限時間は0より大きい必要があります")
+        return v
+
+
+class SolveJobStatus(BaseModel):
+    job_id: str = Field(..., description="ジョブID")
+    status: Literal["queued", "running", "done", "failed", "timeout"] = Field(
+        ..., description="ジョブの状態"
+    )
+    submitted_at: datetime = Field(..., description="受付日時")
+    started_at: datetime | None = Field(None, description="求解の開始日時")
+    finished_at: datetime | None = Field(None, description="求解の終了日時")
+    error: str | None = Field(None, description="失敗・打ち切りの理由")
+    solver_status: str | None = Field(
+        None,
+        description="ソルバーの状態 (PuLP の LpStatus)。Optimal 以外は最適性の保証がない",
+    )
+    approximate: bool | None = Field(
+        None, description="近似解法 (heuristic / lagrangian など) の解か"
+    )
+    objective_value: float | None = Field(None, description="目的関数値 (円)")
+    best_bound: float | None = Field(None, description="目的関数値の下界 (円)")
+    gap: float | None = Field(None, description="目的関数値と下界の相対ギャップ")
+
+
 class DailySchedule(BaseModel):
     date: datetime = Field(..., description="日付 (YYYY-MM-DD)")
     start: int = Field(..., description="起動状態 (0: 停止, 1: 起動)")
@@ -98,3 +252,59 @@ class OverallOutput(BaseModel):
     overall_operation_days: int = Field(..., description="合計稼働日数")
     overall_start_days: int = Field(..., description="合計起動日数")
     overall_stop_days: int = Field(..., description="合計停止日数")
+
+
+class RollingHorizonReport(BaseModel):
+    window: int = Field(..., description="各ウィンドウで確定する期間数")
+    lookahead: int = Field(..., description="先読み期間数")
+    rolling_cost: float = Field(
+        ..., description="ローリングホライズンの合計コスト (円)"
+    )
+    monolithic_cost: float = Field(..., description="一括求解の合計コスト (円)")
+    cost_gap: float = Field(..., description="一括求解に対するコスト差の比率")
+    rolling_seconds: float = Field(
+        ..., description="ローリングホライズンの求解時間 (秒)"
+    )
+    monolithic_seconds: float = Field(..., description="一括求解の求解時間 (秒)")
+
+
+class AggregationReport(BaseModel):
+    block_length: int = Field(..., description="1期にまとめた期間数")
+    num_blocks: int = Field(..., description="縮約モデルの期間数")
+    reduced_cost: float = Field(..., description="縮約モデルの目的関数値 (円)")
+    aggregated_cost: float = Field(
+        ..., description="縮約モデルの解を全期間に展開した合計コスト (円)"
+    )
+    full_cost: float = Field(..., description="全期間のモデルの合計コスト (円)")
+    cost_gap: float = Field(..., description="全期間のモデルに対するコスト差の比率")
+    demand_error: float = Field(
+        ..., description="ブロック平均の需要と元の需要の絶対誤差の、総需要に対する比率"
+    )
+    operation_mismatch: float = Field(
+        ..., description="全期間のモデルと稼働状態が異なる (期, 発電機) の割合"
+    )
+    aggregated_seconds: float = Field(..., description="縮約モデルの求解時間 (秒)")
+    full_seconds: float = Field(..., description="全期間のモデルの求解時間 (秒)")
+
+
+class GroupingReport(BaseModel):
+    num_units: int = Field(..., description="発電機の台数")
+    num_groups: int = Field(..., description="同一パラメータの発電機のグループ数")
+    grouped_objective: float = Field(
+        ..., description="台数のモデルの目的関数値 (円)。最適値の下界"
+    )
+    grouped_cost: float = Field(
+        ..., description="台数のモデルの解を発電機ごとに割り当てた合計コスト (円)"
+    )
+    full_cost: float = Field(..., description="発電機ごとのモデルの合計コスト (円)")
+    cost_gap: float = Field(..., description="発電機ごとのモデルに対するコスト差の比率")
+    grouped_seconds: float = Field(..., description="台数のモデルの求解時間 (秒)")
+    full_seconds: float = Field(..., description="発電機ごとのモデルの求解時間 (秒)")
+
+
+class HeuristicReport(BaseModel):
+    heuristic_cost: float = Field(..., description="優先順位法の合計コスト (円)")
+    milp_cost: float = Field(..., description="MILP の合計コスト (円)")
+    cost_gap: float = Field(..., description="MILP に対するコスト差の比率")
+    heuristic_seconds: float = Field(..., description="優先順位法の求解時間 (秒)")
+    milp_seconds: float = Field(..., description="MILP の求解時間 (秒)")
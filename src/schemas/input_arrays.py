@@ -0,0 +1,146 @@
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from src.schemas.data_schema import GeneratorParameters, InputData, InputTimeSeriesData
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+# GeneratorParameters のフィールド名 → InputArrays の属性名
+PARAMETER_ATTRIBUTES = {
+    "pmin": "pmins",
+    "pmax": "pmaxs",
+    "cost_run": "cost_runs",
+    "cost_start": "cost_starts",
+    "cost_stop": "cost_stops",
+    "min_operation_time": "min_operation_times",
+    "min_down_time": "min_down_times",
+    "ramp_up": "ramp_ups",
+    "ramp_down": "ramp_downs",
+}
+
+
+@dataclass
+class InputArrays:
+    """
+    InputData と同じ内容を列ごとの NumPy 配列で保持する入力データ。
+    - 時系列: dates / date_indices / demands は長さ T
+    - 発電機パラメータ: generator_ids 以降は長さ P
+    pydantic のリスト形式が必要な場合は to_input_data で変換する。
+    """
+
+    dates: npt.NDArray[np.datetime64]
+    date_indices: IntArray
+    demands: FloatArray
+    generator_ids: list[str]
+    pmins: FloatArray
+    pmaxs: FloatArray
+    cost_runs: FloatArray
+    cost_starts: FloatArray
+    cost_stops: FloatArray
+    min_operation_times: IntArray
+    min_down_times: IntArray
+    ramp_ups: FloatArray
+    ramp_downs: FloatArray
+    _input_data: InputData | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def num_timeseries(self) -> int:
+        return len(self.demands)
+
+    @property
+    def num_units(self) -> int:
+        return len(self.generator_ids)
+
+    def date_list(self) -> list[datetime]:
+        return list(pd.DatetimeIndex(self.dates).to_pydatetime())
+
+    def slice_periods(self, head: int, tail: int) -> "InputArrays":
+        """head 期から tail - 1 期までの時系列を切り出す"""
+        return replace(
+            self,
+            dates=self.dates[head:tail],
+            date_indices=self.date_indices[head:tail],
+            demands=self.demands[head:tail],
+            _input_data=None,
+        )
+
+    def select_units(self, indices: list[int]) -> "InputArrays":
+        """indices の発電機だけを取り出す"""
+        return replace(
+            self,
+            generator_ids=[self.generator_ids[p] for p in indices],
+            **{
+                attribute: getattr(self, attribute)[indices]
+                for attribute in PARAMETER_ATTRIBUTES.values()
+            },
+            _input_data=None,
+        )
+
+    def to_input_data(self) -> InputData:
+        """pydantic の InputData に変換する (結果はキャッシュする)"""
+        if self._input_data is None:
+            timeseries = [
+                InputTimeSeriesData(date=date, date_index=date_index, demand=demand)
+                for date, date_index, demand in zip(
+                    self.date_list(),
+                    self.date_indices.tolist(),
+                    self.demands.tolist(),
+                    strict=True,
+                )
+            ]
+            columns = {
+                name: getattr(self, attribute).tolist()
+                for name, attribute in PARAMETER_ATTRIBUTES.items()
+            }
+            generator_parameters = [
+                GeneratorParameters(
+                    generator_id=generator_id,
+                    **{name: values[p] for name, values in columns.items()},
+                )
+                for p, generator_id in enumerate(self.generator_ids)
+            ]
+            self._input_data = InputData(
+                timeseries=timeseries, generator_parameters=generator_parameters
+            )
+        return self._input_data
+
+    @classmethod
+    def from_input_data(cls, input_data: InputData) -> "InputArrays":
+        timeseries = input_data.timeseries
+        parameters = input_data.generator_parameters
+
+        def floats(name: str) -> FloatArray:
+            return np.array([getattr(p, name) for p in parameters], dtype=np.float64)
+
+        def ints(name: str) -> IntArray:
+            return np.array([getattr(p, name) for p in parameters], dtype=np.int64)
+
+        return cls(
+            dates=np.array([data.date for data in timeseries], dtype="datetime64[ns]"),
+            date_indices=np.array(
+                [data.date_index for data in timeseries], dtype=np.int64
+            ),
+            demands=np.array([data.demand for data in timeseries], dtype=np.float64),
+            generator_ids=[p.generator_id for p in parameters],
+            pmins=floats("pmin"),
+            pmaxs=floats("pmax"),
+            cost_runs=floats("cost_run"),
+            cost_starts=floats("cost_start"),
+            cost_stops=floats("cost_stop"),
+            min_operation_times=ints("min_operation_time"),
+            min_down_times=ints("min_down_time"),
+            ramp_ups=floats("ramp_up"),
+            ramp_downs=floats("ramp_down"),
+            _input_data=input_data,
+        )
+
+
+def as_input_arrays(input_data: InputData | InputArrays) -> InputArrays:
+    if isinstance(input_data, InputArrays):
+        return input_data
+    return InputArrays.from_input_data(input_data)
@@ -0,0 +1,149 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from src.schemas.data_schema import DailySchedule, GeneratorOutput, OverallOutput
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+
+@dataclass
+class ScheduleResult:
+    """
+    最適化結果を (T, P) の NumPy 配列で保持する出力データ。
+    集計値は配列演算で求め、入れ子の OverallOutput は to_overall_output で
+    必要になったときにだけ作る。
+    """
+
+    dates: npt.NDArray[np.datetime64]
+    generator_ids: list[str]
+    operation: IntArray
+    start: IntArray
+    stop: IntArray
+    output: FloatArray
+    cost: FloatArray
+    status: int | None = None
+    approximate: bool = False
+    objective_value: float | None = None
+    _overall_output: OverallOutput | None = field(
+        default=None, repr=False, compare=False
+    )
+
+    @property
+    def num_timeseries(self) -> int:
+        return len(self.dates)
+
+    @property
+    def num_units(self) -> int:
+        return len(self.generator_ids)
+
+    @property
+    def generator_costs(self) -> FloatArray:
+        return self.cost.sum(axis=0)
+
+    @property
+    def generator_outputs(self) -> FloatArray:
+        return self.output.sum(axis=0)
+
+    @property
+    def generator_operation_days(self) -> IntArray:
+        return self.operation.sum(axis=0)
+
+    @property
+    def generator_start_days(self) -> IntArray:
+        return self.start.sum(axis=0)
+
+    @property
+    def generator_stop_days(self) -> IntArray:
+        return self.stop.sum(axis=0)
+
+    @property
+    def overall_cost(self) -> float:
+        return float(self.cost.sum())
+
+    @property
+    def overall_output(self) -> float:
+        return float(self.output.sum())
+
+    @property
+    def overall_operation_days(self) -> int:
+        return int(self.operation.sum())
+
+    @property
+    def overall_start_days(self) -> int:
+        return int(self.start.sum())
+
+    @property
+    def overall_stop_days(self) -> int:
+        return int(self.stop.sum())
+
+    def date_list(self) -> list[datetime]:
+        return list(pd.DatetimeIndex(self.dates).to_pydatetime())
+
+    def to_overall_output(self) -> OverallOutput:
+        """入れ子の OverallOutput を作る (結果はキャッシュする)"""
+        if self._overall_output is None:
+            dates = self.date_list()
+            columns = {
+                "start": self.start.T.tolist(),
+                "stop": self.stop.T.tolist(),
+                "operation": self.operation.T.tolist(),
+                "output": self.output.T.tolist(),
+                "cost": self.cost.T.tolist(),
+            }
+            generator_outputs = []
+            for p, generator_id in enumerate(self.generator_ids):
+                schedules = [
+                    DailySchedule(
+                        date=date,
+                        **{name: values[p][t] for name, values in columns.items()},
+                    )
+                    for t, date in enumerate(dates)
+                ]
+                generator_outputs.append(
+                    GeneratorOutput(
+                        generator_id=generator_id,
+                        schedules=schedules,
+                        generator_cost=float(self.generator_costs[p]),
+                        generator_output=float(self.generator_outputs[p]),
+                        generator_operation_days=int(self.generator_operation_days[p]),
+                        generator_start_days=int(self.generator_start_days[p]),
+                        generator_stop_days=int(self.generator_stop_days[p]),
+                    )
+                )
+            self._overall_output = OverallOutput(
+                generator_outputs=generator_outputs,
+                overall_cost=self.overall_cost,
+                overall_output=self.overall_output,
+                overall_operation_days=self.overall_operation_days,
+                overall_start_days=self.overall_start_days,
+                overall_stop_days=self.overall_stop_days,
+            )
+        return self._overall_output
+
+    @classmethod
+    def from_overall_output(cls, overall_output: OverallOutput) -> "ScheduleResult":
+        generator_outputs = overall_output.generator_outputs
+        dates = [schedule.date for schedule in generator_outputs[0].schedules]
+
+        def column(name: str) -> list[list[float]]:
+            return [
+                [getattr(schedule, name) for schedule in generator_output.schedules]
+                for generator_output in generator_outputs
+            ]
+
+        return cls(
+            dates=np.array(dates, dtype="datetime64[ns]"),
+            generator_ids=[output.generator_id for output in generator_outputs],
+            operation=np.array(column("operation"), dtype=np.int64).T,
+            start=np.array(column("start"), dtype=np.int64).T,
+            stop=np.array(column("stop"), dtype=np.int64).T,
+            output=np.array(column("output"), dtype=np.float64).T,
+            cost=np.array(column("cost"), dtype=np.float64).T,
+            objective_value=overall_output.overall_cost,
+            _overall_output=overall_output,
+        )
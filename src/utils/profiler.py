@@ -0,0 +1,130 @@
+import cProfile
+import json
+import os
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+try:
+    import resource
+except ImportError:
+    # Windows には resource がないため、子プロセスの CPU 時間とピークRSSは記録しない
+    resource = None  # type: ignore[assignment]
+
+
+def peak_rss_mb(children: bool = False) -> float | None:
+    """
+    ピークRSS (MB)。ru_maxrss は Linux では KB、macOS では byte 単位。
+    resource がない環境では None
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    maxrss = resource.getrusage(who).ru_maxrss
+    return maxrss / 1024**2 if sys.platform == "darwin" else maxrss / 1024
+
+
+def child_cpu_seconds() -> float | None:
+    """終了済みの子プロセスの CPU 時間。resource がない環境では None"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+@dataclass
+class StageRecord:
+    """
+    1ステージ分の計測結果。
+    - child_*: CBC など子プロセスの分 (終了済みのものだけが計上される)
+    - peak_rss_mb: ステージ終了時点までのプロセス全体のピークRSS
+    - resource がない環境 (Windows) では child_* と peak_rss_mb は None
+    """
+
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    child_cpu_seconds: float | None
+    peak_rss_mb: float | None
+    child_peak_rss_mb: float | None
+
+
+@dataclass
+class RunProfiler:
+    """
+    パイプラインの各ステージの実行時間・CPU時間・ピークRSSを記録し、
+    モデル規模やソルバーの結果とあわせて run_report.json に書き出す。
+    profile_stage に指定したステージは cProfile で計測し、
+    profile_<stage>.prof として保存する (入れ子のステージは "/" でつないだ名前)。
+    """
+
+    output_dir: str
+    profile_stage: str | None = None
+    stages: list[StageRecord] = field(default_factory=list)
+    sections: dict[str, dict[str, Any]] = field(default_factory=dict)
+    _stack: list[str] = field(default_factory=list, repr=False)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self._stack.append(name)
+        full_name = "/".join(self._stack)
+        profiler = cProfile.Profile() if full_name == self.profile_stage else None
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        child_cpu = child_cpu_seconds()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                os.makedirs(self.output_dir, exist_ok=True)
+                profiler.dump_stats(
+                    os.path.join(
+                        self.output_dir, f"profile_{full_name.replace('/', '_')}.prof"
+                    )
+                )
+            child_cpu_end = child_cpu_seconds()
+            self.stages.append(
+                StageRecord(
+                    name=full_name,
+                    wall_seconds=time.perf_counter() - wall,
+                    cpu_seconds=time.process_time() - cpu,
+                    child_cpu_seconds=(
+                        None
+                        if child_cpu is None or child_cpu_end is None
+                        else child_cpu_end - child_cpu
+                    ),
+                    peak_rss_mb=peak_rss_mb(),
+                    child_peak_rss_mb=peak_rss_mb(children=True),
+                )
+            )
+            self._stack.pop()
+
+    def record(self, section: str, values: dict[str, Any]) -> None:
+        """モデル規模やソルバーの結果など、ステージ以外の情報を追加する"""
+        self.sections.setdefault(section, {}).update(values)
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "stages": [asdict(stage) for stage in self.stages],
+            **self.sections,
+        }
+
+    def write_report(self, filename: str = "run_report.json") -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, filename)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+def stage(profiler: RunProfiler | None, name: str) -> AbstractContextManager[None]:
+    """profiler が None の場合は何も計測しない"""
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(name)
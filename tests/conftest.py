@@ -0,0 +1,22 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from dev.generatoe_input import generate_input_data
+from src.schemas.input_arrays import InputArrays, as_input_arrays
+
+
+@pytest.fixture(scope="session")
+def input_arrays() -> InputArrays:
+    """
+    数秒以内に最適解が得られる小さな生成インスタンス。
+    起動・停止が起きるよう、需要を週2日だけ高くする
+    """
+    input_arrays = as_input_arrays(generate_input_data(8, 42, seed=3))
+    peaks = np.isin(np.arange(input_arrays.num_timeseries) % 7, (2, 3))
+    return replace(
+        input_arrays,
+        demands=input_arrays.demands * np.where(peaks, 1.3, 0.7),
+        _input_data=None,
+    )
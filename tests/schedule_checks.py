@@ -0,0 +1,46 @@
+import numpy as np
+import numpy.typing as npt
+
+from src.schemas.input_arrays import InputArrays
+
+TOLERANCE = 1e-6
+
+
+def schedule_violations(
+    input_arrays: InputArrays, values: dict[str, npt.NDArray[np.float64]]
+) -> list[str]:
+    """
+    解 (変数種別ごとの (T, P) 配列) が Solver の basic 定式化の制約を満たすか調べ、
+    満たさない制約の説明を返す。
+    - 需要・出力の上下限・ランプ
+    - 最低稼働・停止期間 (Solver と同じく、窓が期間内に収まる期からのみ課す)
+    """
+    operation = np.rint(values["operation"])
+    output = values["output"]
+    violations = []
+    short = np.flatnonzero(output.sum(axis=1) < input_arrays.demands - TOLERANCE)
+    if len(short):
+        violations.append(f"需要を満たさない期: {short.tolist()}")
+    if (output < input_arrays.pmins * operation - TOLERANCE).any():
+        violations.append("最小出力を下回る出力がある")
+    if (output > input_arrays.pmaxs * operation + TOLERANCE).any():
+        violations.append("最大出力 (停止中は0) を超える出力がある")
+    change = np.diff(output, axis=0)
+    if (change > input_arrays.ramp_ups + TOLERANCE).any():
+        violations.append("ランプアップを超える出力の増加がある")
+    if (-change > input_arrays.ramp_downs + TOLERANCE).any():
+        violations.append("ランプダウンを超える出力の減少がある")
+
+    switch = np.diff(operation, axis=0, prepend=operation[:1])
+    for p in range(operation.shape[1]):
+        for starts, length, state, label in (
+            (switch[:, p] > 0, int(input_arrays.min_operation_times[p]), 1, "稼働"),
+            (switch[:, p] < 0, int(input_arrays.min_down_times[p]), 0, "停止"),
+        ):
+            for t in range(length, len(operation)):
+                if starts[t - length : t].any() and operation[t, p] != state:
+                    violations.append(
+                        f"{input_arrays.generator_ids[p]} の最低{label}期間を"
+                        f" {t} 期で満たさない"
+                    )
+    return violations
@@ -0,0 +1,26 @@
+from pathlib import Path
+
+from pulp import LpStatusNotSolved, LpStatusOptimal
+
+from src.models.heuristic import HeuristicSolver
+from src.models.solver import Solver
+from src.schemas.input_arrays import InputArrays
+from tests.schedule_checks import schedule_violations
+
+
+def test_heuristic_schedule_is_feasible(
+    input_arrays: InputArrays, tmp_path: Path
+) -> None:
+    heuristic = HeuristicSolver(input_arrays)
+    heuristic.build_model()
+    heuristic.solve(str(tmp_path))
+    assert heuristic.status == LpStatusNotSolved
+    assert heuristic.approximate
+    assert heuristic.has_solution
+    assert schedule_violations(input_arrays, heuristic.get_variable_values()) == []
+
+    solver = Solver(input_arrays)
+    solver.build_model()
+    solver.solve(str(tmp_path))
+    assert solver.status == LpStatusOptimal
+    assert heuristic.objective_value >= solver.objective_value * (1 - 1e-6)
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import pytest
+from pulp import LpStatusNotSolved
+
+from src.models.lagrangian import LagrangianSolver
+from src.models.solver import FORMULATIONS
+from src.schemas.input_arrays import InputArrays
+from tests.schedule_checks import schedule_violations
+
+
+@pytest.mark.parametrize("formulation", FORMULATIONS)
+def test_lagrangian_schedule_is_feasible(
+    input_arrays: InputArrays, tmp_path: Path, formulation: str
+) -> None:
+    solver = LagrangianSolver(input_arrays, max_iterations=10, formulation=formulation)
+    solver.build_model()
+    solver.solve(str(tmp_path), threads=2)
+    assert solver.status == LpStatusNotSolved
+    assert solver.approximate
+    assert schedule_violations(input_arrays, solver.get_variable_values()) == []
+    assert solver.lower_bound <= solver.objective_value * (1 + 1e-6)
+    assert 1 <= solver.iterations <= 10
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+from pulp import LpStatusOptimal
+
+from src.logic.presolve import presolve_commitment
+from src.models.solver import Solver
+from src.schemas.input_arrays import InputArrays
+from tests.schedule_checks import schedule_violations
+
+
+def test_presolve_finds_forced_commitments(input_arrays: InputArrays) -> None:
+    result = presolve_commitment(input_arrays)
+    assert result.forced_on.any()
+    assert not (result.forced_on & result.forced_off).any()
+
+
+@pytest.mark.parametrize("builder", ["pulp", "matrix"])
+def test_fix_forced_keeps_objective(
+    input_arrays: InputArrays, tmp_path: Path, builder: str
+) -> None:
+    objectives = {}
+    for fix_forced in (False, True):
+        solver = Solver(input_arrays, builder=builder, fix_forced=fix_forced)
+        solver.build_model()
+        solver.solve(str(tmp_path))
+        assert solver.status == LpStatusOptimal
+        assert schedule_violations(input_arrays, solver.get_variable_values()) == []
+        objectives[fix_forced] = solver.objective_value
+    assert objectives[True] == pytest.approx(objectives[False], rel=1e-6)
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.models.rolling_horizon import RollingHorizonSolver, carry_over_states
+from src.schemas.data_schema import UnitInitialState
+from src.schemas.input_arrays import InputArrays
+from tests.schedule_checks import schedule_violations
+
+OPERATION = np.array([[1.0, 0.0], [1.0, 0.0], [1.0, 1.0]])
+VALUES = {"operation": OPERATION, "output": OPERATION * 10.0}
+PREVIOUS = [
+    UnitInitialState(operation=1, duration=5, output=10.0),
+    UnitInitialState(operation=0, duration=4, output=0.0),
+]
+
+
+@pytest.mark.parametrize(
+    ("commit", "previous", "expected"),
+    [
+        # 発電機0は先頭から稼働し続けているため previous の5期を加える
+        (3, PREVIOUS, [(1, 8, 10.0), (1, 1, 10.0)]),
+        (2, PREVIOUS, [(1, 7, 10.0), (0, 6, 0.0)]),
+        (2, None, [(1, 2, 10.0), (0, 2, 0.0)]),
+    ],
+)
+def test_carry_over_states(
+    commit: int,
+    previous: list[UnitInitialState] | None,
+    expected: list[tuple[int, int, float]],
+) -> None:
+    states = carry_over_states(VALUES, commit, previous)
+    assert [(s.operation, s.duration, s.output) for s in states] == expected
+
+
+def test_rolling_horizon_schedule_is_feasible(
+    input_arrays: InputArrays, tmp_path: Path
+) -> None:
+    solver = RollingHorizonSolver(input_arrays, window=7, lookahead=7)
+    solver.build_model()
+    solver.solve(str(tmp_path))
+    assert solver.has_solution
+    assert schedule_violations(input_arrays, solver.get_variable_values()) == []
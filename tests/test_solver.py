@@ -0,0 +1,42 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from pulp import LpStatusInfeasible, LpStatusOptimal
+
+from src.models.solver import FORMULATIONS, Solver
+from src.schemas.input_arrays import InputArrays
+from tests.schedule_checks import schedule_violations
+
+
+@pytest.mark.parametrize("formulation", FORMULATIONS)
+def test_builders_give_same_objective(
+    input_arrays: InputArrays, tmp_path: Path, formulation: str
+) -> None:
+    objectives = {}
+    for builder in ("pulp", "matrix"):
+        solver = Solver(input_arrays, builder=builder, formulation=formulation)
+        solver.build_model()
+        solver.solve(str(tmp_path))
+        assert solver.status == LpStatusOptimal
+        assert schedule_violations(input_arrays, solver.get_variable_values()) == []
+        objectives[builder] = solver.objective_value
+    assert objectives["matrix"] == pytest.approx(objectives["pulp"], rel=1e-6)
+
+
+@pytest.mark.parametrize("builder", ["pulp", "matrix"])
+def test_infeasible_solve_has_no_objective(
+    input_arrays: InputArrays, tmp_path: Path, builder: str
+) -> None:
+    demands = input_arrays.demands.copy()
+    demands[3] = 10 * input_arrays.pmaxs.sum()
+    solver = Solver(
+        replace(input_arrays, demands=demands, _input_data=None), builder=builder
+    )
+    solver.build_model()
+    solver.solve(str(tmp_path))
+    assert solver.status == LpStatusInfeasible
+    assert solver.objective_value is None
+    assert solver.solve_result is not None
+    assert solver.solve_result.objective_value is None
+    assert not solver.has_solution